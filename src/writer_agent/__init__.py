@@ -1,11 +1,27 @@
 """Writer Agent.
 
 This module defines a custom content creation workflow with multi-agent collaboration.
+
+Importing the package is cheap: the workflow graph (and with it LangGraph and
+LangChain) is only loaded and compiled when `graph`, `content_workflow_graph`
+or `get_graph` is first accessed. If the `writer_agent.content_workflow_graph`
+submodule is imported directly first, the package attribute of that name is
+the submodule until `graph` or `get_graph` is accessed, so prefer those two.
 """
 
-from writer_agent.content_workflow_graph import content_workflow_graph
+import types
+from typing import Any
+
+__all__ = ["content_workflow_graph", "get_graph", "graph"]
+
 
-# Alias for backward compatibility
-graph = content_workflow_graph
+def __getattr__(name: str) -> Any:
+    if name in ("graph", "content_workflow_graph", "get_graph"):
+        from writer_agent.content_workflow_graph import get_graph
 
-__all__ = ["content_workflow_graph", "graph"]
+        # Importing the submodule binds it here under its own name; drop that
+        # binding so `content_workflow_graph` keeps resolving to the graph.
+        if isinstance(globals().get("content_workflow_graph"), types.ModuleType):
+            del globals()["content_workflow_graph"]
+        return get_graph if name == "get_graph" else get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,73 @@
+"""Reuse previously saved articles as a research source.
+
+Before going to web search, the research queries (and the user's request) are
+embedded and matched against the article vector store. Queries that get at
+least one saved section above the coverage threshold into the token budget are
+answered from our own past sections; only the uncovered sub-topics are sent to
+the search providers.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from writer_agent.context import Context
+from writer_agent.utils import estimate_tokens
+from writer_agent.vector_store import VectorMatch, get_embeddings, get_vector_store
+
+_MAX_SECTION_CHARS = 1200
+
+
+def _format_match(match: VectorMatch) -> str:
+    metadata = match["metadata"]
+    source = " / ".join(
+        p for p in (metadata.get("title"), metadata.get("step_title")) if p
+    )
+    text = " ".join(str(metadata.get("text", "")).split())[:_MAX_SECTION_CHARS]
+    return f"- {source} (similarity {match['score']:.2f}): {text}"
+
+
+async def retrieve_past_sections(
+    user_input: str,
+    queries: Sequence[str],
+    context: Context,
+) -> tuple[list[str], list[str]]:
+    """Look up saved sections for the request and each research query.
+
+    Returns (uncovered_queries, blocks): the queries still needing a web
+    search, and digest-style blocks of relevant saved sections that fit in
+    `retrieval_token_budget`.
+    """
+    store = get_vector_store(context) if context.retrieval_enabled else None
+    if store is None:
+        return list(queries), []
+
+    texts = [user_input, *queries]
+    vectors = await get_embeddings(context).aembed_documents(texts)
+
+    uncovered: list[str] = []
+    blocks: list[str] = []
+    seen: set[str] = set()
+    used = 0
+    for i, (text, vector) in enumerate(zip(texts, vectors)):
+        matches = [
+            m
+            for m in await store.query(vector, context.retrieval_top_k)
+            if m["score"] >= context.retrieval_min_score
+        ]
+        lines = [f"### From saved articles: {text}"]
+        for match in matches:
+            line = _format_match(match)
+            if (
+                match["id"] in seen
+                or used + estimate_tokens(line) > context.retrieval_token_budget
+            ):
+                continue
+            seen.add(match["id"])
+            lines.append(line)
+            used += estimate_tokens(line)
+        if len(lines) > 1:
+            blocks.append("\n".join(lines))
+        elif i > 0:
+            uncovered.append(text)
+    return uncovered, blocks
@@ -0,0 +1,258 @@
+"""Headless batch runner for producing many articles concurrently.
+
+Reads a JSONL file of requests, runs the content workflow for each one with
+bounded concurrency, answers every interrupt() through a review policy instead
+of a person, and streams one JSON result per finished item to the output file.
+Items already present in the output are skipped, and items with a checkpoint
+are resumed where they stopped (use a persistent checkpointer for that).
+
+Input lines look like ``{"id": "a1", "user_input": "Write a guide on ...",
+"context": {"model": "openai/gpt-4o-mini"}}``; only ``user_input`` is required.
+
+Usage::
+
+    python -m writer_agent.batch requests.jsonl -o results.jsonl --concurrency 8
+    python -m writer_agent.batch requests.jsonl --policy critic-gated --checkpoint-db batch.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Mapping
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from writer_agent.checkpointer import CompactSqliteSaver
+from writer_agent.content_workflow_graph import builder
+from writer_agent.context import Context
+from writer_agent.instrumentation import INSTRUMENTATION
+
+ReviewPolicy = Callable[[Mapping[str, Any]], str]
+
+# Guard against review loops that never converge (e.g. a critic that never approves).
+MAX_RESUMES = 500
+
+
+def auto_approve(payload: Mapping[str, Any]) -> str:
+    """Approve every checkpoint."""
+    return "approve"
+
+
+def critic_gated(max_revisions: int = 2) -> ReviewPolicy:
+    """Approve steps the critic approved; otherwise request up to `max_revisions` rewrites."""
+
+    def policy(payload: Mapping[str, Any]) -> str:
+        critic = str(payload.get("critic_feedback", "")).lower()
+        if "step_draft" not in payload:
+            return "approve"
+        if ("approve" in critic and "needs revision" not in critic) or payload.get(
+            "iteration", 1
+        ) > max_revisions:
+            return "approve"
+        # Must not contain "approve": the review node treats that as approval.
+        return "Revise this section to address the critic's suggestions."
+
+    return policy
+
+
+class StageTimer:
+    """Collect per-node wall time across items."""
+
+    def __init__(self) -> None:
+        """Create an empty timer."""
+        self.samples: defaultdict[str, list[float]] = defaultdict(list)
+
+    def add(self, node: str, seconds: float) -> None:
+        """Record one node execution."""
+        self.samples[node].append(seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return count, p50 and p95 seconds per node."""
+        result = {}
+        for node, values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            result[node] = {
+                "count": len(ordered),
+                "p50_s": round(statistics.median(ordered), 3),
+                "p95_s": round(
+                    ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3
+                ),
+            }
+        return result
+
+
+async def run_item(
+    graph: Any,
+    item: Mapping[str, Any],
+    policy: ReviewPolicy,
+    timer: StageTimer,
+) -> dict[str, Any]:
+    """Run (or resume) one request to completion and return its result record."""
+    config = {"configurable": {"thread_id": f"batch-{item['id']}"}}
+    context = Context(**item.get("context", {}))
+    started = time.perf_counter()
+    stages: defaultdict[str, float] = defaultdict(float)
+
+    snapshot = await graph.aget_state(config)
+    if snapshot.next:
+        pending = [i.value for t in snapshot.tasks for i in t.interrupts]
+        next_input: Any = Command(resume=policy(pending[0])) if pending else None
+    else:
+        next_input = {
+            "messages": [("user", item["user_input"])],
+            "user_input": item["user_input"],
+        }
+
+    for _ in range(MAX_RESUMES):
+        interrupts: list[Any] = []
+        last = time.perf_counter()
+        async for update in graph.astream(
+            next_input, config, context=context, stream_mode="updates"
+        ):
+            now = time.perf_counter()
+            for node, value in update.items():
+                if node == "__interrupt__":
+                    interrupts.extend(i.value for i in value)
+                else:
+                    stages[node] += now - last
+                    timer.add(node, now - last)
+            last = now
+        if not interrupts:
+            break
+        next_input = Command(resume=policy(interrupts[0]))
+    else:
+        raise RuntimeError(f"Item did not finish within {MAX_RESUMES} review rounds")
+
+    state = (await graph.aget_state(config)).values
+    return {
+        "id": item["id"],
+        "status": "done",
+        "final_content": state.get("final_content", ""),
+        "steps": len(state.get("plan_steps", [])),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "stages_s": {k: round(v, 3) for k, v in stages.items()},
+        "usage": INSTRUMENTATION.summary(config["configurable"]["thread_id"])["total"],
+    }
+
+
+def _load_items(path: str) -> list[dict[str, Any]]:
+    items = []
+    with open(path) as f:
+        for n, line in enumerate(f):
+            if line.strip():
+                item = json.loads(line)
+                item.setdefault("id", str(n))
+                items.append(item)
+    return items
+
+
+def _finished_ids(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {
+            str(r["id"])
+            for r in map(json.loads, filter(str.strip, f))
+            if r.get("status") == "done"
+        }
+
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    *,
+    concurrency: int = 4,
+    policy: ReviewPolicy = auto_approve,
+    checkpointer: BaseCheckpointSaver[str] | None = None,
+) -> dict[str, Any]:
+    """Run every unfinished request in `input_path`; return a throughput report."""
+    graph = builder.compile(checkpointer=checkpointer or InMemorySaver())
+    done = _finished_ids(output_path)
+    items = [i for i in _load_items(input_path) if str(i["id"]) not in done]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    write_lock = asyncio.Lock()
+    timer = StageTimer()
+    counts: defaultdict[str, int] = defaultdict(int)
+    started = time.perf_counter()
+
+    async def worker(item: dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                record = await run_item(graph, item, policy, timer)
+            except Exception as e:
+                record = {
+                    "id": item["id"],
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                }
+        counts[record["status"]] += 1
+        async with write_lock:
+            with open(output_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    await asyncio.gather(*(worker(item) for item in items))
+    elapsed = time.perf_counter() - started
+    return {
+        "items": len(items),
+        "skipped": len(done),
+        "done": counts["done"],
+        "errors": counts["error"],
+        "elapsed_s": round(elapsed, 3),
+        "articles_per_hour": round(counts["done"] / elapsed * 3600, 1)
+        if elapsed
+        else 0.0,
+        "stages": timer.summary(),
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    policy = (
+        auto_approve
+        if args.policy == "auto-approve"
+        else critic_gated(args.max_revisions)
+    )
+    async with AsyncExitStack() as stack:
+        checkpointer = None
+        if args.checkpoint_db:
+            checkpointer = stack.enter_context(CompactSqliteSaver(args.checkpoint_db))
+        return await run_batch(
+            args.input,
+            args.output,
+            concurrency=args.concurrency,
+            policy=policy,
+            checkpointer=checkpointer,
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JSONL file of requests")
+    parser.add_argument(
+        "-o", "--output", default="batch_results.jsonl", help="JSONL results file"
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--policy", choices=("auto-approve", "critic-gated"), default="auto-approve"
+    )
+    parser.add_argument("--max-revisions", type=int, default=2)
+    parser.add_argument(
+        "--checkpoint-db",
+        help="SQLite checkpoint file so interrupted items can resume",
+    )
+    report = asyncio.run(_main(parser.parse_args(argv)))
+    print(json.dumps(report, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
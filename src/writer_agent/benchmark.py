@@ -0,0 +1,412 @@
+"""Offline benchmark of the workflow's own overhead.
+
+Runs the full graph end to end against `writer_agent.fakes` (no network, no API
+keys) for plans of several sizes and reports, per scenario:
+
+- wall time and per-node wall time,
+- checkpoint count and stored checkpoint bytes, bytes written per plan step
+  and write amplification (bytes written / size of the final state), for
+  LangGraph's in-memory saver or the bundled `CompactSqliteSaver`,
+- prompt tokens sent to the model, and how many hit the prefix cache, per node,
+- peak Python heap allocation (tracemalloc).
+
+It also measures cold start in fresh interpreters: how long `import
+writer_agent` and importing plus compiling the graph take, and whether either
+loads a dependency that should be deferred to first use (model providers,
+search client, numpy, ...). A deferred module loaded at import is reported as
+a failure even without a baseline.
+
+Interrupts are answered by a script (e.g. request one revision per step) and
+then approved. Results are written as JSON tagged with the git commit, and can
+be compared against a saved baseline to catch regressions::
+
+    python -m writer_agent.benchmark --steps 3 10 50 -o bench.json
+    python -m writer_agent.benchmark --baseline bench.json
+    python -m writer_agent.benchmark --steps 10 50 --checkpointer memory compact
+
+Token counts are deterministic and checkpoint bytes nearly so (ids and timings
+vary slightly); wall time and memory vary by machine, so compare those against a
+baseline recorded on the same host.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Mapping, Sequence
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from writer_agent.batch import ReviewPolicy, StageTimer, run_item
+from writer_agent.checkpointer import CompactSqliteSaver
+from writer_agent.content_workflow_graph import builder
+from writer_agent.fakes import FakeChatModel, fake_search_provider, offline
+
+# Metrics compared against a baseline; all are "lower is better".
+COMPARED_METRICS = (
+    "wall_s",
+    "checkpoint_bytes",
+    "write_amplification",
+    "prompt_tokens",
+    "peak_memory_bytes",
+)
+
+CHECKPOINTERS = ("memory", "compact")
+
+# Modules that importing each entry point must not load: they are imported on
+# first use so that `import writer_agent` and loading the graph stay fast.
+DEFERRED_IMPORTS = {
+    "writer_agent": (
+        "langgraph",
+        "langchain_core",
+        "langchain",
+        "langchain_tavily",
+        "httpx",
+        "pinecone",
+        "numpy",
+    ),
+    "writer_agent.content_workflow_graph": (
+        "langchain",
+        "langchain_tavily",
+        "langchain_openai",
+        "langchain_anthropic",
+        "pinecone",
+        "numpy",
+    ),
+}
+
+# Startup metrics compared against a baseline; all are "lower is better".
+STARTUP_METRICS = ("import_s", "compile_s")
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+module = __import__({module!r}, fromlist=["_"])
+imported = time.perf_counter()
+loaded = sorted({{name.split(".")[0] for name in sys.modules}} & set({deferred!r}))
+module.get_graph()
+print(json.dumps({{
+    "import_s": imported - start,
+    "compile_s": time.perf_counter() - imported,
+    "loaded": loaded,
+}}))
+"""
+
+# Context used for every scenario: no persistent caches, no network.
+BENCHMARK_CONTEXT: dict[str, Any] = {
+    "search_cache_path": "",
+    "llm_cache_nodes": "",
+    "retrieval_enabled": False,
+    "vector_backend": "memory",
+    "embedding_model": "fake/64",
+}
+
+
+def scripted(responses: Sequence[str]) -> ReviewPolicy:
+    """Answer interrupts with `responses` in order, then approve everything."""
+    queue = list(responses)
+
+    def policy(payload: Mapping[str, Any]) -> str:
+        return queue.pop(0) if queue else "approve"
+
+    return policy
+
+
+def revise_each_step(revisions: int) -> ReviewPolicy:
+    """Request `revisions` rewrites of every plan step before approving it."""
+    seen: dict[str, int] = {}
+
+    def policy(payload: Mapping[str, Any]) -> str:
+        question = str(payload.get("question", ""))
+        if "step_draft" not in payload or seen.get(question, 0) >= revisions:
+            return "approve"
+        seen[question] = seen.get(question, 0) + 1
+        return "Please tighten this section."
+
+    return policy
+
+
+def checkpoint_bytes(saver: InMemorySaver) -> tuple[int, int]:
+    """Return (checkpoint count, serialized bytes) held by an in-memory saver."""
+    count = size = 0
+    for namespaces in saver.storage.values():
+        for checkpoints in namespaces.values():
+            for (_, checkpoint), (_, metadata), _parent in checkpoints.values():
+                count += 1
+                size += len(checkpoint) + len(metadata)
+    size += sum(len(blob) for _, blob in saver.blobs.values())
+    for writes in saver.writes.values():
+        size += sum(len(value[2][1]) for value in writes.values())
+    return count, size
+
+
+async def run_scenario(
+    steps: int,
+    *,
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    output_tokens: int = 200,
+    search_results: int = 5,
+    policy: ReviewPolicy | None = None,
+    context: Mapping[str, Any] | None = None,
+    checkpointer: str = "memory",
+) -> dict[str, Any]:
+    """Run one article with a `steps`-step plan and return its metrics.
+
+    `checkpointer` is "memory" (LangGraph's InMemorySaver, which stores what a
+    generic saver writes) or "compact" (`CompactSqliteSaver` in a temporary file).
+    """
+    model = FakeChatModel(
+        latency=llm_latency, output_tokens=output_tokens, plan_steps=steps
+    )
+    search = fake_search_provider(latency=search_latency, results=search_results)
+    tmp = tempfile.TemporaryDirectory()
+    saver: InMemorySaver | CompactSqliteSaver = (
+        CompactSqliteSaver(os.path.join(tmp.name, "checkpoints.sqlite"))
+        if checkpointer == "compact"
+        else InMemorySaver()
+    )
+    graph = builder.compile(checkpointer=saver)
+    timer = StageTimer()
+    item = {
+        "id": f"bench-{steps}",
+        "user_input": "Write a comprehensive guide on benchmarking Python services",
+        "context": {**BENCHMARK_CONTEXT, **(context or {})},
+    }
+
+    try:
+        with offline(model, search):
+            tracemalloc.start()
+            try:
+                started = time.perf_counter()
+                result = await run_item(graph, item, policy or scripted([]), timer)
+                wall = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        state = await graph.aget_state(
+            {"configurable": {"thread_id": f"batch-{item['id']}"}}
+        )
+        state_size = sum(
+            len(saver.serde.dumps_typed(v)[1]) for v in state.values.values()
+        )
+        if isinstance(saver, CompactSqliteSaver):
+            count, size = saver.footprint()
+            written = saver.stats["bytes_written"]
+            saver.close()
+        else:
+            count, size = checkpoint_bytes(saver)
+            written = size
+    finally:
+        tmp.cleanup()
+
+    return {
+        "steps": steps,
+        "checkpointer": checkpointer,
+        "wall_s": round(wall, 4),
+        "nodes": {
+            node: {"calls": len(samples), "total_s": round(sum(samples), 4)}
+            for node, samples in sorted(timer.samples.items())
+        },
+        "checkpoints": count,
+        "checkpoint_bytes": size,
+        "checkpoint_bytes_written": written,
+        "checkpoint_bytes_written_per_step": round(written / steps),
+        "write_amplification": round(written / max(1, state_size), 2),
+        "prompt_tokens": sum(model.prompt_tokens.values()),
+        "prompt_tokens_by_node": dict(sorted(model.prompt_tokens.items())),
+        "cached_prompt_tokens": sum(model.cached_tokens.values()),
+        "cached_prompt_tokens_by_node": dict(sorted(model.cached_tokens.items())),
+        "llm_calls": sum(model.calls.values()),
+        "peak_memory_bytes": peak,
+        "final_content_chars": len(result["final_content"]),
+    }
+
+
+def measure_startup(module: str, runs: int = 3) -> dict[str, Any]:
+    """Import `module` in fresh interpreters and report its cold-start cost.
+
+    Times are the best of `runs`. `compile_s` is the time from the import to a
+    compiled graph (`module.get_graph()`, including whatever the import
+    deferred), and `loaded` lists the modules from `DEFERRED_IMPORTS` the
+    import itself pulled in.
+    """
+    deferred = DEFERRED_IMPORTS.get(module, ())
+    script = _STARTUP_SCRIPT.format(module=module, deferred=deferred)
+    results = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return {
+        "module": module,
+        "import_s": min(r["import_s"] for r in results),
+        "compile_s": min(r["compile_s"] for r in results),
+        "loaded": results[0]["loaded"],
+    }
+
+
+def startup_violations(report: Mapping[str, Any]) -> list[str]:
+    """Return a description of every deferred module loaded at import in `report`."""
+    return [
+        f"import {entry['module']} loads {name}"
+        for entry in report.get("startup", [])
+        for name in entry["loaded"]
+    ]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(
+    current: Mapping[str, Any], baseline: Mapping[str, Any], threshold: float
+) -> list[str]:
+    """Return a description of every metric that regressed by more than `threshold`."""
+
+    def key(scenario: Mapping[str, Any]) -> tuple[int, str]:
+        return scenario["steps"], scenario.get("checkpointer", "memory")
+
+    previous = {key(s): s for s in baseline.get("scenarios", [])}
+    regressions = []
+    for scenario in current.get("scenarios", []):
+        old = previous.get(key(scenario))
+        if old is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = old.get(metric), scenario.get(metric)
+            if before and after is not None and after > before * (1 + threshold):
+                regressions.append(
+                    f"steps={scenario['steps']} ({key(scenario)[1]}) {metric}: {before} -> {after} "
+                    f"(+{(after / before - 1) * 100:.1f}%)"
+                )
+    previous_startup = {s["module"]: s for s in baseline.get("startup", [])}
+    for entry in current.get("startup", []):
+        old = previous_startup.get(entry["module"])
+        if old is None:
+            continue
+        for metric in STARTUP_METRICS:
+            before, after = old.get(metric), entry.get(metric)
+            if before and after is not None and after > before * (1 + threshold):
+                regressions.append(
+                    f"import {entry['module']} {metric}: {before:.3f} -> {after:.3f} "
+                    f"(+{(after / before - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+async def run_benchmark(
+    step_counts: Sequence[int],
+    *,
+    revisions: int = 0,
+    checkpointers: Sequence[str] = ("memory",),
+    **options: Any,
+) -> dict[str, Any]:
+    """Run one scenario per plan size and checkpointer and return the full report.
+
+    The report also holds the cold-start measurements of `DEFERRED_IMPORTS`.
+    """
+    scenarios = []
+    for checkpointer in checkpointers:
+        for steps in step_counts:
+            scenarios.append(
+                await run_scenario(
+                    steps,
+                    policy=revise_each_step(revisions),
+                    checkpointer=checkpointer,
+                    **options,
+                )
+            )
+    return {
+        "commit": _git_commit(),
+        "options": {"revisions": revisions, **options},
+        "scenarios": scenarios,
+        "startup": [measure_startup(module) for module in DEFERRED_IMPORTS],
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point; exits non-zero when a regression is found.
+
+    A deferred module loaded at import counts as a regression even without a baseline.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[3, 10, 50])
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="seconds per model call"
+    )
+    parser.add_argument(
+        "--search-latency", type=float, default=0.0, help="seconds per search"
+    )
+    parser.add_argument(
+        "--output-tokens", type=int, default=200, help="tokens per drafted section"
+    )
+    parser.add_argument("--search-results", type=int, default=5)
+    parser.add_argument(
+        "--revisions", type=int, default=0, help="revisions requested per step"
+    )
+    parser.add_argument(
+        "--checkpointer",
+        nargs="+",
+        choices=CHECKPOINTERS,
+        default=["memory"],
+        help="checkpointers to compare (write amplification per step)",
+    )
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed relative increase"
+    )
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_benchmark(
+            args.steps,
+            revisions=args.revisions,
+            checkpointers=args.checkpointer,
+            llm_latency=args.llm_latency,
+            search_latency=args.search_latency,
+            output_tokens=args.output_tokens,
+            search_results=args.search_results,
+        )
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    regressions = startup_violations(report)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions += compare(report, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
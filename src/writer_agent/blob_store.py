@@ -0,0 +1,129 @@
+"""Content-addressed blob store for large State fields.
+
+Checkpoints are written after every node, and the workflow's State carries the
+research digest, plan, completed sections and polished sections as inline
+strings, so each checkpoint re-serializes the growing article. When enabled,
+large strings are written once to a local content-addressed store and State
+holds only a short reference (``blob:sha256:<hex>``); identical text is stored
+once no matter how many checkpoints refer to it. Blob reads and writes run in
+a worker thread.
+
+Only State fields the nodes resolve themselves are offloaded. Message bodies
+are out of scope and stay inline, because `messages` are returned to API
+clients as they are stored; `CompactSqliteSaver` instead stores that channel
+as deltas, so each response is written once rather than at every checkpoint.
+
+Blobs are never deleted: the store does not know which checkpoints still
+refer to them. Remove the directory only together with the checkpoints that
+were written while it was in use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Sequence
+
+from writer_agent.context import Context
+
+REF_PREFIX = "blob:sha256:"
+
+
+def is_ref(value: object) -> bool:
+    """Return True if `value` is a blob reference."""
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+class BlobStore:
+    """Filesystem store of UTF-8 text blobs addressed by their SHA-256."""
+
+    def __init__(self, root: str, memo_size: int = 128) -> None:
+        """Use (or create) the directory `root` for blobs."""
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._memo: OrderedDict[str, str] = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def put(self, text: str) -> str:
+        """Store `text` (if not already present) and return its reference."""
+        data = text.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write atomically so concurrent writers never expose partial blobs.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._remember(digest, text)
+        return REF_PREFIX + digest
+
+    def get(self, ref: str) -> str:
+        """Load the text behind a reference."""
+        digest = ref[len(REF_PREFIX) :]
+        with self._lock:
+            if digest in self._memo:
+                self._memo.move_to_end(digest)
+                return self._memo[digest]
+        with open(self._path(digest), "rb") as f:
+            text = f.read().decode()
+        self._remember(digest, text)
+        return text
+
+    def _remember(self, digest: str, text: str) -> None:
+        with self._lock:
+            self._memo[digest] = text
+            self._memo.move_to_end(digest)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+
+
+_STORES: dict[str, BlobStore] = {}
+
+
+def get_blob_store(context: Context) -> BlobStore | None:
+    """Return the blob store configured in `context`, or None if disabled."""
+    if not context.blob_store_path:
+        return None
+    if context.blob_store_path not in _STORES:
+        _STORES[context.blob_store_path] = BlobStore(context.blob_store_path)
+    return _STORES[context.blob_store_path]
+
+
+async def offload(text: str, context: Context) -> str:
+    """Return a reference for large `text` when offloading is enabled, else `text`."""
+    store = get_blob_store(context)
+    if store is None or is_ref(text) or len(text) < context.blob_inline_threshold:
+        return text
+    return await asyncio.to_thread(store.put, text)
+
+
+async def resolve(value: str, context: Context) -> str:
+    """Return the text behind `value` if it is a reference, else `value` itself."""
+    if not is_ref(value):
+        return value
+    store = get_blob_store(context)
+    if store is None:
+        raise ValueError(
+            f"State holds blob reference {value} but blob_store_path is not set"
+        )
+    return await asyncio.to_thread(store.get, value)
+
+
+async def offload_all(texts: Sequence[str], context: Context) -> list[str]:
+    """Offload each text in a list."""
+    return [await offload(t, context) for t in texts]
+
+
+async def resolve_all(values: Sequence[str], context: Context) -> list[str]:
+    """Resolve each value in a list."""
+    return [await resolve(v, context) for v in values]
@@ -0,0 +1,720 @@
+"""Compact SQLite checkpointer for the content workflow.
+
+Every interrupt() in the workflow (research review, plan approval, step
+review, final review) resumes from a checkpoint, and the graph checkpoints
+after every node. Generic savers store the full value of each changed channel
+at every checkpoint, so the lists that only ever grow (`messages`,
+`completed_steps`, `collected_information`) are rewritten in full each time
+and checkpoint storage grows quadratically with the number of plan steps.
+
+`CompactSqliteSaver` keeps checkpoints in one SQLite file in WAL mode, and:
+
+- stores append-only channels as deltas: the items appended since the
+  channel's previous version plus a reference to it, with a full snapshot
+  every `snapshot_every` versions to bound the chain walked on reads;
+- zlib-compresses every channel value, checkpoint and pending write;
+- buffers writes and commits them in batches. The buffer is flushed before
+  every read and as soon as the graph finishes, interrupts or fails, so a
+  finished, paused or crashed run resumes from its latest checkpoint; call
+  `flush()` (or use the saver as a context manager) before shutting down;
+- prunes checkpoints beyond the newest `keep_last` per thread, together with
+  their pending writes and the channel values no remaining checkpoint needs.
+
+The last stored value of each append-only channel is kept in memory to
+compute the next delta. It is dropped when a run finishes, and at most
+`max_tracked_threads` threads are tracked; an untracked thread's next write
+is simply a full snapshot.
+
+`stats` counts what was written, for measuring write amplification
+(`python -m writer_agent.benchmark --checkpointer memory compact`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from types import TracebackType
+from typing import Any, AsyncIterator, Iterator, NamedTuple, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+# Write channels after which a run stops, so their writes are flushed at once.
+# LangGraph keeps its own constants for these private.
+ERROR = "__error__"
+INTERRUPT = "__interrupt__"
+
+# Channels that trigger nodes start with these (also LangGraph internals); a
+# loop checkpoint that updates none of them is the last one of its run.
+TRIGGER_PREFIXES = ("branch:to:", "join:", "__pregel_tasks")
+
+# State channels that only ever grow by appending.
+DELTA_CHANNELS = ("messages", "completed_steps", "collected_information")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_id TEXT,
+    checkpoint BLOB NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    base_version TEXT,
+    data BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    data BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class _LastValue(NamedTuple):
+    """The most recently stored version of an append-only channel."""
+
+    version: str
+    items: list[Any]
+    depth: int  # deltas since the last full snapshot
+
+
+def _extends(previous: list[Any], value: list[Any]) -> bool:
+    """Return True if `value` starts with every item of `previous`."""
+    return len(value) >= len(previous) and all(
+        a is b or a == b for a, b in zip(previous, value)
+    )
+
+
+class CompactSqliteSaver(BaseCheckpointSaver[str]):
+    """SQLite (WAL) checkpoint saver with delta-encoded, compressed, batched writes."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        keep_last: int | None = 10,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+        snapshot_every: int = 16,
+        compression_level: int = 6,
+        delta_channels: Sequence[str] = DELTA_CHANNELS,
+        max_tracked_threads: int = 256,
+        serde: SerializerProtocol | None = None,
+    ) -> None:
+        """Open (or create) the checkpoint database at `path`.
+
+        Args:
+            path: SQLite file; ":memory:" keeps everything in memory.
+            keep_last: Checkpoints kept per thread and namespace (None keeps all).
+            batch_size: Buffered rows that trigger a flush.
+            flush_interval: Seconds after which the next write flushes the buffer.
+            snapshot_every: Store an append-only channel in full after this many deltas.
+            compression_level: zlib level for stored values.
+            delta_channels: Channels stored as deltas when they only grew.
+            max_tracked_threads: Threads whose last channel values are kept
+                in memory for delta encoding (least recently written evicted).
+            serde: Serializer for channel values, checkpoints and writes.
+        """
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_last = keep_last
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.compression_level = compression_level
+        self.delta_channels = frozenset(delta_channels)
+        self.max_tracked_threads = max_tracked_threads
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # _lock guards the write buffer and delta state; _db_lock the connection.
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._pending: list[tuple[str, tuple[Any, ...]]] = []
+        self._touched: set[tuple[str, str]] = set()
+        # (thread_id, checkpoint_ns) -> channel -> last stored value, in LRU order.
+        self._last: OrderedDict[tuple[str, str], dict[str, _LastValue]] = OrderedDict()
+        self._last_flush = time.monotonic()
+        self.stats: Counter[str] = Counter()
+
+    # -- Encoding ------------------------------------------------------------
+
+    def _pack(self, value: Any) -> bytes:
+        kind, data = self.serde.dumps_typed(value)
+        return kind.encode() + b"\0" + zlib.compress(data, self.compression_level)
+
+    def _unpack(self, packed: bytes) -> Any:
+        kind, _, data = packed.partition(b"\0")
+        return self.serde.loads_typed((kind.decode(), zlib.decompress(data)))
+
+    def _blob_row(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+        values: dict[str, Any],
+    ) -> tuple[Any, ...]:
+        """Encode one channel value, as a delta against its last version if it only grew."""
+        tracked_values = self._last.setdefault((thread_id, checkpoint_ns), {})
+        if channel not in values:
+            tracked_values.pop(channel, None)
+            return (thread_id, checkpoint_ns, channel, version, None, b"")
+        value = values[channel]
+        last = tracked_values.get(channel)
+        tracked = channel in self.delta_channels and isinstance(value, list)
+        if (
+            tracked
+            and last is not None
+            and last.depth < self.snapshot_every
+            and _extends(last.items, value)
+        ):
+            base, data, depth = (
+                last.version,
+                self._pack(value[len(last.items) :]),
+                last.depth + 1,
+            )
+            self.stats["delta_blobs"] += 1
+        else:
+            base, data, depth = None, self._pack(value), 0
+        if tracked:
+            tracked_values[channel] = _LastValue(version, list(value), depth)
+        else:
+            tracked_values.pop(channel, None)
+        return (thread_id, checkpoint_ns, channel, version, base, data)
+
+    def _live_versions(self) -> dict[tuple[str, str, str], str]:
+        """Return the tracked versions that upcoming deltas may build on."""
+        return {
+            (thread_id, checkpoint_ns, channel): last.version
+            for (thread_id, checkpoint_ns), tracked in self._last.items()
+            for channel, last in tracked.items()
+        }
+
+    # -- Buffered writes -----------------------------------------------------
+
+    def _buffer(self, sql: str, rows: Sequence[tuple[Any, ...]]) -> None:
+        for row in rows:
+            self._pending.append((sql, row))
+            self.stats["rows_written"] += 1
+            self.stats["bytes_written"] += sum(
+                len(v) for v in row if isinstance(v, bytes)
+            )
+
+    def _should_flush(self) -> bool:
+        return (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self) -> None:
+        """Commit buffered writes in one transaction, then prune touched threads."""
+        with self._db_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                touched, self._touched = self._touched, set()
+                self._last_flush = time.monotonic()
+                live = self._live_versions()
+            if not pending:
+                return
+            self._conn.execute("BEGIN")
+            try:
+                for sql, row in pending:
+                    self._conn.execute(sql, row)
+                if self.keep_last is not None:
+                    for thread_id, checkpoint_ns in touched:
+                        self._prune(thread_id, checkpoint_ns, self.keep_last, live)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stats["flushes"] += 1
+
+    def _put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> tuple[RunnableConfig, bool]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        saved = {k: v for k, v in checkpoint.items() if k != "channel_values"}
+        values = checkpoint["channel_values"]
+        with self._lock:
+            blobs = [
+                self._blob_row(thread_id, checkpoint_ns, channel, str(version), values)
+                for channel, version in new_versions.items()
+            ]
+            self._buffer(
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blobs
+            )
+            self._buffer(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id"),
+                        self._pack(saved),
+                        self._pack(get_checkpoint_metadata(config, metadata)),
+                    )
+                ],
+            )
+            self._touched.add((thread_id, checkpoint_ns))
+            self.stats["checkpoints_written"] += 1
+            updated = checkpoint.get("updated_channels")
+            finished = (
+                metadata.get("source") == "loop"
+                and updated is not None
+                and not any(c.startswith(TRIGGER_PREFIXES) for c in updated)
+            )
+            if finished:
+                # Nothing runs after this checkpoint: no further deltas follow.
+                self._last.pop((thread_id, checkpoint_ns), None)
+            elif (thread_id, checkpoint_ns) in self._last:
+                self._last.move_to_end((thread_id, checkpoint_ns))
+                while len(self._last) > self.max_tracked_threads:
+                    self._last.popitem(last=False)
+            flush = finished or self._should_flush()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }, flush
+
+    def _put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> bool:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self._lock:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Regular writes are kept on retry; special ones (errors, interrupts) replaced.
+                verb = "INSERT OR REPLACE" if write_idx < 0 else "INSERT OR IGNORE"
+                self._buffer(
+                    f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            thread_id,
+                            checkpoint_ns,
+                            checkpoint_id,
+                            task_id,
+                            write_idx,
+                            channel,
+                            self._pack(value),
+                            task_path,
+                        )
+                    ],
+                )
+            return self._should_flush() or any(
+                c in (INTERRUPT, ERROR) for c, _ in writes
+            )
+
+    # -- Reads ---------------------------------------------------------------
+
+    def _load_value(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str
+    ) -> tuple[bool, Any]:
+        """Rebuild a channel value by following its delta chain to a snapshot."""
+        tails = []
+        while True:
+            row = self._conn.execute(
+                "SELECT base_version, data FROM blobs WHERE thread_id = ? "
+                "AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None or not row[1]:
+                return False, None
+            if row[0] is None:
+                break
+            tails.append(self._unpack(row[1]))
+            version = row[0]
+        value = self._unpack(row[1])
+        for tail in reversed(tails):
+            value = value + tail
+        return True, value
+
+    def _tuple(
+        self, thread_id: str, checkpoint_ns: str, row: tuple[Any, ...]
+    ) -> CheckpointTuple:
+        checkpoint_id, parent_id, packed, packed_metadata = row
+        checkpoint: Checkpoint = self._unpack(packed)
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            found, value = self._load_value(
+                thread_id, checkpoint_ns, channel, str(version)
+            )
+            if found:
+                values[channel] = value
+        writes = self._conn.execute(
+            "SELECT task_id, idx, channel, data, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        writes.sort(key=lambda w: writes_sort_key(w[4], w[0], w[1]))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self._unpack(packed_metadata),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._unpack(data))
+                for task_id, _, channel, data, _ in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Return the requested checkpoint, or the thread's latest one."""
+        self.flush()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = (
+            "SELECT checkpoint_id, parent_id, checkpoint, metadata FROM checkpoints"
+        )
+        with self._db_lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    f"{columns} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"{columns} WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._tuple(thread_id, checkpoint_ns, row) if row else None
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first, matching the config, metadata filter and bounds."""
+        self.flush()
+        clauses, params = [], []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (
+                checkpoint_ns := config["configurable"].get("checkpoint_ns")
+            ) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_id, checkpoint, metadata "
+                f"FROM checkpoints{where} ORDER BY checkpoint_id DESC",
+                params,
+            ).fetchall()
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self._unpack(row[3])
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            with self._db_lock:
+                result = self._tuple(thread_id, checkpoint_ns, tuple(row))
+            if limit is not None:
+                limit -= 1
+            yield result
+
+    # -- Pruning -------------------------------------------------------------
+
+    def _prune(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        keep: int,
+        live: dict[tuple[str, str, str], str],
+    ) -> None:
+        """Drop all but the newest `keep` checkpoints and the values only they needed."""
+        stale = [
+            r[0]
+            for r in self._conn.execute(
+                "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+                (thread_id, checkpoint_ns, keep),
+            )
+        ]
+        if not stale:
+            return
+        for table in ("checkpoints", "writes"):
+            self._conn.executemany(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND checkpoint_id = ?",
+                [(thread_id, checkpoint_ns, c) for c in stale],
+            )
+        self.stats["checkpoints_pruned"] += len(stale)
+
+        # Keep every value a remaining checkpoint references, and the delta bases they build on.
+        needed = {
+            (channel, version)
+            for (t, ns, channel), version in live.items()
+            if (t, ns) == (thread_id, checkpoint_ns)
+        }
+        for (packed,) in self._conn.execute(
+            "SELECT checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ):
+            versions = self._unpack(packed)["channel_versions"]
+            needed |= {(channel, str(version)) for channel, version in versions.items()}
+        bases = {
+            (channel, version): base
+            for channel, version, base in self._conn.execute(
+                "SELECT channel, version, base_version FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            )
+        }
+        frontier = list(needed)
+        while frontier:
+            channel, version = frontier.pop()
+            base = bases.get((channel, version))
+            if base is not None and (channel, base) not in needed:
+                needed.add((channel, base))
+                frontier.append((channel, base))
+        self._conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND channel = ? AND version = ?",
+            [(thread_id, checkpoint_ns, *key) for key in bases if key not in needed],
+        )
+
+    def prune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        """Prune threads: "keep_latest" keeps only the newest checkpoint, "delete" everything."""
+        if strategy == "delete":
+            for thread_id in thread_ids:
+                self.delete_thread(thread_id)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"Unknown pruning strategy: {strategy}")
+        self.flush()
+        with self._db_lock:
+            with self._lock:
+                live = self._live_versions()
+            self._conn.execute("BEGIN")
+            try:
+                for thread_id in thread_ids:
+                    namespaces = self._conn.execute(
+                        "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?",
+                        (thread_id,),
+                    ).fetchall()
+                    for (checkpoint_ns,) in namespaces:
+                        self._prune(thread_id, checkpoint_ns, 1, live)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, write and value of a thread."""
+        self.flush()
+        with self._db_lock:
+            with self._lock:
+                for key in [k for k in self._last if k[0] == thread_id]:
+                    del self._last[key]
+            for table in ("checkpoints", "blobs", "writes"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)
+                )
+
+    # -- Saver interface -----------------------------------------------------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Buffer a checkpoint and the channel values that changed with it."""
+        saved, flush = self._put(config, checkpoint, metadata, new_versions)
+        if flush:
+            self.flush()
+        return saved
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Buffer a task's pending writes; interrupts and errors are flushed at once."""
+        if self._put_writes(config, writes, task_id, task_path):
+            self.flush()
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Async version of `get_tuple`, run in a worker thread."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async version of `list`, run in a worker thread."""
+        items = await asyncio.to_thread(
+            lambda: [*self.list(config, filter=filter, before=before, limit=limit)]
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async version of `put`; flushes run in a worker thread."""
+        saved, flush = self._put(config, checkpoint, metadata, new_versions)
+        if flush:
+            await asyncio.to_thread(self.flush)
+        return saved
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async version of `put_writes`; flushes run in a worker thread."""
+        if self._put_writes(config, writes, task_id, task_path):
+            await asyncio.to_thread(self.flush)
+
+    async def aprune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        """Async version of `prune`."""
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async version of `delete_thread`."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        """Return a monotonically increasing version with a random tiebreaker."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # -- Lifecycle -----------------------------------------------------------
+
+    def footprint(self) -> tuple[int, int]:
+        """Return (stored checkpoint count, stored bytes) after flushing."""
+        self.flush()
+        with self._db_lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            size = sum(
+                self._conn.execute(query).fetchone()[0]
+                for query in (
+                    "SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) "
+                    "FROM checkpoints",
+                    "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blobs",
+                    "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM writes",
+                )
+            )
+        return count, size
+
+    def close(self) -> None:
+        """Flush buffered writes and close the database."""
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    def __enter__(self) -> CompactSqliteSaver:
+        """Use the saver as a context manager that flushes and closes on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Flush and close."""
+        self.close()
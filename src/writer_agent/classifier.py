@@ -0,0 +1,165 @@
+"""Local fast-path classifier for the orchestrator's routing decision.
+
+Most requests are obviously either a quick question ("What is Python?") or a
+content-creation task ("Write a blog post about..."). Keyword/regex rules, and
+optionally a small linear model loaded from disk, decide those locally on the
+CPU; only ambiguous inputs fall back to an LLM round-trip. Decisions are cached
+per normalized input, and counters show how often the fast path fires.
+
+The optional model file is JSON of the form
+``{"bias": float, "weights": {"token": float, ...}}``; the logistic of the
+summed weights is the probability that the input is a general question.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+_COMPLEX_PATTERNS = [
+    re.compile(p)
+    for p in (
+        r"\b(write|draft|compose|create|produce|prepare|generate|craft)\b.{0,60}?"
+        r"\b(article|blog|post|guide|essay|report|tutorial|newsletter|whitepaper|"
+        r"content|piece|outline|copy|story)\b",
+        r"\bresearch\b.{0,40}?\b(and|then)\b.{0,20}?\b(write|draft|summari[sz]e)\b",
+        r"\b(comprehensive|in-depth|long-form|step-by-step)\b.{0,40}?"
+        r"\b(guide|article|tutorial|overview|report)\b",
+    )
+]
+_GENERAL_START = re.compile(
+    r"^(what|who|when|where|why|how|which|is|are|can|could|does|do|did|"
+    r"explain|define|describe|tell me)\b"
+)
+# Mentions of a deliverable or of depth: a question containing one ("What is the
+# best way to write a blog post?", "Explain X in a detailed article") is ambiguous.
+_CONTENT_SIGNAL = re.compile(
+    r"\b(write|draft|article|blog|post|guide|essay|report|tutorial|newsletter|"
+    r"whitepaper|outline|detailed|comprehensive|in-depth|long-form|step-by-step)\b"
+)
+_MAX_GENERAL_WORDS = 25
+
+
+def normalize_input(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(text.lower().split())
+
+
+def classify_by_rules(text: str) -> tuple[bool, float] | None:
+    """Classify with keyword rules.
+
+    Returns (is_general_question, confidence), or None if no rule applies or
+    the rules disagree. Only short questions ending in "?" without any
+    mention of a deliverable are confidently general; imperative openers
+    ("explain ...") score below the default threshold and go to the LLM.
+    """
+    complex_task = any(p.search(text) for p in _COMPLEX_PATTERNS)
+    general = (
+        bool(_GENERAL_START.search(text)) and len(text.split()) <= _MAX_GENERAL_WORDS
+    )
+    if complex_task and general:
+        return None
+    if complex_task:
+        return False, 0.95
+    if general:
+        if _CONTENT_SIGNAL.search(text):
+            return None
+        return True, 0.9 if text.endswith("?") else 0.7
+    return None
+
+
+@lru_cache(maxsize=4)
+def _load_model(path: str) -> tuple[float, dict[str, float]]:
+    with open(path) as f:
+        data = json.load(f)
+    return float(data.get("bias", 0.0)), {
+        k: float(v) for k, v in data["weights"].items()
+    }
+
+
+def classify_by_model(text: str, path: str) -> tuple[bool, float]:
+    """Classify with the linear model stored at `path`."""
+    bias, weights = _load_model(path)
+    score = bias + sum(weights.get(token, 0.0) for token in re.findall(r"\w+", text))
+    p_general = 1.0 / (1.0 + math.exp(-score))
+    return p_general >= 0.5, max(p_general, 1.0 - p_general)
+
+
+def parse_yes_no(content: str) -> bool:
+    """Interpret an LLM "yes"/"no" answer by its first word."""
+    words = re.findall(r"[a-z]+", content.lower())
+    return bool(words) and words[0] == "yes"
+
+
+class FastPathClassifier:
+    """Cached local routing decisions with fast-path metrics."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        """Create a classifier with an LRU decision cache of `max_entries`."""
+        self.max_entries = max_entries
+        self._decisions: OrderedDict[str, bool] = OrderedDict()
+        self._lock = threading.Lock()
+        self._unusable_models: set[str] = set()
+        self.counts: Counter[str] = Counter()
+
+    def decide(
+        self, text: str, *, min_confidence: float, model_path: str = ""
+    ) -> bool | None:
+        """Return True for a general question, False for a content task.
+
+        Returns None when no local method is confident enough, in which case
+        the caller should ask the LLM and `record` its answer.
+        """
+        key = normalize_input(text)
+        with self._lock:
+            if key in self._decisions:
+                self._decisions.move_to_end(key)
+                self.counts["cache"] += 1
+                return self._decisions[key]
+
+        source, result = "rules", classify_by_rules(key)
+        if (
+            (result is None or result[1] < min_confidence)
+            and model_path
+            and model_path not in self._unusable_models
+        ):
+            # The model is only loaded and run when the rules abstain.
+            try:
+                source, result = "model", classify_by_model(key, model_path)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                # The fast path is an optimization: fall through to the LLM.
+                logger.warning("Ignoring classifier model %s: %r", model_path, e)
+                self._unusable_models.add(model_path)
+        if result is not None and result[1] >= min_confidence:
+            self.counts[source] += 1
+            self.record(text, result[0])
+            return result[0]
+
+        self.counts["llm"] += 1
+        return None
+
+    def record(self, text: str, is_general: bool) -> None:
+        """Cache a decision for `text`."""
+        with self._lock:
+            self._decisions[normalize_input(text)] = is_general
+            self._decisions.move_to_end(normalize_input(text))
+            while len(self._decisions) > self.max_entries:
+                self._decisions.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """Return decision counts by source and the fast-path rate."""
+        total = sum(self.counts.values())
+        return {
+            **{k: self.counts[k] for k in ("cache", "rules", "model", "llm")},
+            "fast_path_rate": (total - self.counts["llm"]) / total if total else 0.0,
+        }
+
+
+FAST_PATH = FastPathClassifier()
@@ -1,8 +1,10 @@
 """Content Creation Workflow Graph with human-in-the-loop feedback."""
 
-from typing import Literal
+import functools
+from typing import Any, Literal
 
 from langgraph.graph import END, START, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
 from writer_agent.content_workflow_nodes import (
     analyzer_collector_node,
@@ -11,22 +13,28 @@ from writer_agent.content_workflow_nodes import (
     draft_writer_node,
     final_drafter_node,
     human_feedback_draft_node,
+    human_feedback_final_node,
     orchestrator_node,
     plan_writer_node,
     save_to_db_node,
 )
 from writer_agent.content_workflow_state import InputState, OutputState, State
 from writer_agent.context import Context
+from writer_agent.instrumentation import instrument_node
 
 
-def route_orchestrator(state: State) -> Literal["basic_llm_response", "analyzer_collector"]:
+def route_orchestrator(
+    state: State,
+) -> Literal["basic_llm_response", "analyzer_collector"]:
     """Route based on whether it's a general question or complex task."""
     if state.get("is_general_question", False):
         return "basic_llm_response"
     return "analyzer_collector"
 
 
-def route_critic_feedback(state: State) -> Literal["human_feedback_draft", "save_to_db"]:
+def route_critic_feedback(
+    state: State,
+) -> Literal["human_feedback_draft", "save_to_db"]:
     """Route based on critic's approval."""
     if state.get("critic_approved", False):
         return "save_to_db"
@@ -35,22 +43,40 @@ def route_critic_feedback(state: State) -> Literal["human_feedback_draft", "save
 
 # Build the graph
 builder = StateGraph(
-    State,
-    input_schema=InputState,
-    output_schema=OutputState,
-    context_schema=Context
+    State, input_schema=InputState, output_schema=OutputState, context_schema=Context
 )
 
-# Add all nodes
-builder.add_node("orchestrator", orchestrator_node)
-builder.add_node("basic_llm_response", basic_llm_response_node)
-builder.add_node("analyzer_collector", analyzer_collector_node)
-builder.add_node("plan_writer", plan_writer_node)
-builder.add_node("draft_writer", draft_writer_node)
-builder.add_node("critic_agent", critic_agent_node)
-builder.add_node("human_feedback_draft", human_feedback_draft_node)
-builder.add_node("save_to_db", save_to_db_node)
-builder.add_node("final_drafter", final_drafter_node)
+# Add all nodes (each execution is recorded as an instrumentation span)
+builder.add_node("orchestrator", instrument_node("orchestrator", orchestrator_node))
+builder.add_node(
+    "basic_llm_response", instrument_node("basic_llm_response", basic_llm_response_node)
+)
+# Nodes that route with Command declare their destinations instead of static edges,
+# so a Command goto is the only way out of them.
+builder.add_node(
+    "analyzer_collector",
+    instrument_node("analyzer_collector", analyzer_collector_node),
+    destinations=("analyzer_collector", "plan_writer"),
+)
+builder.add_node(
+    "plan_writer",
+    instrument_node("plan_writer", plan_writer_node),
+    destinations=("plan_writer", "draft_writer"),
+)
+builder.add_node("draft_writer", instrument_node("draft_writer", draft_writer_node))
+builder.add_node("critic_agent", instrument_node("critic_agent", critic_agent_node))
+builder.add_node(
+    "human_feedback_draft",
+    instrument_node("human_feedback_draft", human_feedback_draft_node),
+    destinations=("draft_writer", "save_to_db"),
+)
+builder.add_node("save_to_db", instrument_node("save_to_db", save_to_db_node))
+builder.add_node("final_drafter", instrument_node("final_drafter", final_drafter_node))
+builder.add_node(
+    "human_feedback_final",
+    instrument_node("human_feedback_final", human_feedback_final_node),
+    destinations=("final_drafter", END),
+)
 
 # Set entry point
 builder.add_edge(START, "orchestrator")
@@ -61,8 +87,8 @@ builder.add_conditional_edges(
     route_orchestrator,
     {
         "basic_llm_response": "basic_llm_response",
-        "analyzer_collector": "analyzer_collector"
-    }
+        "analyzer_collector": "analyzer_collector",
+    },
 )
 
 # Simple path: general questions go straight to end
@@ -76,10 +102,8 @@ builder.add_edge("basic_llm_response", END)
 #    - If approved: move to next step (back to draft_writer) or save_to_db
 #    - If revision: loop back to draft_writer for same step
 # 4. save_to_db: Only after ALL steps approved
-# 5. final_drafter: Polish final content
-
-builder.add_edge("analyzer_collector", "plan_writer")
-builder.add_edge("plan_writer", "draft_writer")
+# 5. final_drafter → human_feedback_final: Polish final content, then review it
+#    (requested changes loop back to final_drafter)
 
 # Step-by-step loop: draft → critic → human (repeats for each step)
 builder.add_edge("draft_writer", "critic_agent")
@@ -88,31 +112,21 @@ builder.add_edge("draft_writer", "critic_agent")
 # (Note: We actually want to always go to human_feedback_draft first)
 builder.add_edge("critic_agent", "human_feedback_draft")
 
-# human_feedback_draft returns Command - need explicit routing  
-# Add a pass-through path so LangGraph knows these nodes are reachable
-def route_human_feedback(state: State) -> str:
-    """Dummy router - actual routing done by Command in node.
-    This ensures save_to_db is recognized as reachable.
-    """
-    # This won't actually be called since node returns Command
-    return "save_to_db"
-
-builder.add_conditional_edges(
-    "human_feedback_draft",
-    route_human_feedback,
-    {
-        "draft_writer": "draft_writer",
-        "save_to_db": "save_to_db",
-        "__end__": END
-    }
-)
+# human_feedback_draft routes with Command: next step (draft_writer) or save_to_db
 
 # Post-approval flow
 builder.add_edge("save_to_db", "final_drafter")
-builder.add_edge("final_drafter", END)
+builder.add_edge("final_drafter", "human_feedback_final")
 
-# Compile the graph
-content_workflow_graph = builder.compile(
-    name="Content Creation Workflow",
-    interrupt_before=[]
-)
+
+@functools.cache
+def get_graph() -> CompiledStateGraph[State, Context, InputState, OutputState]:
+    """Compile the workflow graph on first use and return the same instance after."""
+    return builder.compile(name="Content Creation Workflow", interrupt_before=[])
+
+
+def __getattr__(name: str) -> Any:
+    # `content_workflow_graph` is compiled on first access rather than at import time.
+    if name == "content_workflow_graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
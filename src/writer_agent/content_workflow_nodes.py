@@ -1,29 +1,108 @@
 """Node implementations for the content creation workflow."""
 
+import logging
 from datetime import UTC, datetime
-from typing import Any, Dict, cast
+from typing import Any, Dict, List, Mapping, Tuple
 
 from langchain_core.messages import AIMessage
 from langgraph.runtime import Runtime
 from langgraph.types import Command, interrupt
 
+from writer_agent.article_retrieval import retrieve_past_sections
+from writer_agent.blob_store import (
+    offload,
+    offload_all,
+    resolve,
+    resolve_all,
+)
+from writer_agent.classifier import FAST_PATH, parse_yes_no
 from writer_agent.content_workflow_state import State
 from writer_agent.context import Context
-from writer_agent.tools import search, serper_search
-from writer_agent.utils import load_chat_model
+from writer_agent.context_builder import update_rolling_summary
+from writer_agent.draft_revisions import EDIT_FORMAT, apply_edits, parse_edits
+from writer_agent.final_polish import (
+    affected_sections,
+    polish_sections,
+    section_title,
+    smooth_seams,
+)
+from writer_agent.llm import invoke_model
+from writer_agent.prompt_layout import layout_prompt
+from writer_agent.research_digest import digest_results
+from writer_agent.search_cache import get_search_cache
+from writer_agent.search_executor import run_searches
+from writer_agent.speculation import SPECULATIVE_DRAFTS, critique_key, speculation_key
+from writer_agent.streaming import replay_response
+from writer_agent.tools import SEARCH_PROVIDERS
+from writer_agent.utils import current_run_id, get_message_text
+from writer_agent.vector_store import save_article
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_research(
+    queries: List[str], context: Context, user_input: str
+) -> List[str]:
+    """Research queries from saved articles first, then web search for the rest.
+
+    Returns compact blocks of relevant saved sections, followed by one block of
+    titles, snippets and URLs per web-searched query, fitted into the
+    configured token budgets.
+    """
+    try:
+        queries, past_sections = await retrieve_past_sections(
+            user_input, queries, context
+        )
+    except Exception:
+        # Retrieval is an optimization; fall back to searching everything
+        logger.exception(
+            "Retrieval from saved articles failed; searching the web instead"
+        )
+        past_sections = []
+    if not queries:
+        return past_sections
+
+    providers = [
+        SEARCH_PROVIDERS[name.strip()]
+        for name in context.search_providers.split(",")
+        if name.strip() in SEARCH_PROVIDERS
+    ]
+    results = await run_searches(
+        queries,
+        providers,
+        concurrency=context.search_concurrency,
+        hedge_delay=context.search_hedge_delay,
+        timeout=context.search_timeout,
+    )
+    return past_sections + digest_results(
+        queries, results, context.research_token_budget
+    )
 
 
-async def orchestrator_node(
-    state: State, runtime: Runtime[Context]
-) -> Dict[str, Any]:
+def _search_cache_stats(context: Context) -> Dict[str, Any]:
+    """Return this run's search-cache hit rates for display to the reviewer."""
+    cache = get_search_cache(context)
+    return cache.stats() if cache else {}
+
+
+async def orchestrator_node(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
     """Orchestrator: Decides if the query is general or requires deep research.
-    
+
     Routes to:
     - Basic LLM response for general questions
     - Complex workflow for content creation tasks
+
+    Clear-cut inputs are decided by the local fast-path classifier; only
+    ambiguous ones cost an LLM call.
     """
-    model = load_chat_model(runtime.context.model)
-    
+    is_general = FAST_PATH.decide(
+        state["user_input"],
+        min_confidence=runtime.context.classifier_min_confidence,
+        model_path=runtime.context.classifier_model_path,
+    )
+    if is_general is not None:
+        return {"is_general_question": is_general}
+
     system_prompt = """You are an orchestrator that determines if a user's request is:
 1. A general question that can be answered directly (yes)
 2. A complex content creation task requiring research and planning (no)
@@ -40,45 +119,41 @@ Examples of complex tasks:
 
 Respond with only "yes" for general questions or "no" for complex tasks."""
 
-    response = cast(
-        AIMessage,
-        await model.ainvoke([
+    response = await invoke_model(
+        [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": state["user_input"]}
-        ])
+            {"role": "user", "content": state["user_input"]},
+        ],
+        runtime.context,
+        node="orchestrator",
     )
-    
-    is_general = "yes" in response.content.lower()
-    
-    return {
-        "messages": [response],
-        "is_general_question": is_general
-    }
+
+    is_general = parse_yes_no(get_message_text(response))
+    FAST_PATH.record(state["user_input"], is_general)
+
+    return {"messages": [response], "is_general_question": is_general}
 
 
 async def basic_llm_response_node(
     state: State, runtime: Runtime[Context]
 ) -> Dict[str, Any]:
     """Provides a direct LLM response for general questions."""
-    model = load_chat_model(runtime.context.model)
-    
     system_prompt = f"""You are a helpful AI assistant.
 Answer the user's question clearly and concisely.
 
 System time: {datetime.now(tz=UTC).isoformat()}"""
 
-    response = cast(
-        AIMessage,
-        await model.ainvoke([
+    response = await invoke_model(
+        [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": state["user_input"]}
-        ])
+            {"role": "user", "content": state["user_input"]},
+        ],
+        runtime.context,
+        node="basic_llm_response",
+        stream=True,
     )
-    
-    return {
-        "messages": [response],
-        "final_content": response.content
-    }
+
+    return {"messages": [response], "final_content": response.content}
 
 
 async def analyzer_collector_node(
@@ -87,78 +162,95 @@ async def analyzer_collector_node(
     """Analyzer/Collector: Researches the topic and collects information.
     Includes human-in-the-loop for feedback.
     """
-    model = load_chat_model(runtime.context.model)
-    
     # If this is the first pass, do research
     if not state.get("research_data"):
         system_prompt = """You are a research analyst. Based on the user's request, 
 identify key topics to research and generate search queries.
 Provide 2-3 specific search queries."""
 
-        response = cast(
-            AIMessage,
-            await model.ainvoke([
+        response = await invoke_model(
+            [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": state["user_input"]}
-            ])
+                {"role": "user", "content": state["user_input"]},
+            ],
+            runtime.context,
+            node="analyzer_collector",
         )
-        
-        # Extract search queries and perform searches using Serper
-        search_queries = response.content.split("\n")[:3]
-        collected_info = []
-        
-        for query in search_queries:
-            if query.strip():
-                # Try Serper first, fallback to Tavily
-                search_result = await serper_search(query.strip())
-                if not search_result or "error" in search_result:
-                    search_result = await search(query.strip())
-                if search_result:
-                    collected_info.append(str(search_result))
-        
+
+        # Extract search queries and search them all concurrently
+        search_queries = [
+            q.strip() for q in response.content.split("\n")[:3] if q.strip()
+        ]
+        collected_info = await _run_research(
+            search_queries, runtime.context, state["user_input"]
+        )
+
         # Request human feedback
-        human_feedback = interrupt({
-            "question": "Review the collected research. Any specific areas to explore?",
-            "research_data": "\n\n".join(collected_info),
-            "action": "collect"
-        })
-        
+        human_feedback = interrupt(
+            {
+                "question": "Review the collected research. Any specific areas to explore?",
+                "research_data": "\n\n".join(collected_info),
+                "search_cache": _search_cache_stats(runtime.context),
+                "action": "collect",
+            }
+        )
+
         return Command(
             update={
-                "research_data": "\n\n".join(collected_info),
-                "collected_information": collected_info,
+                "research_data": await offload(
+                    "\n\n".join(collected_info), runtime.context
+                ),
+                "collected_information": await offload_all(
+                    collected_info, runtime.context
+                ),
                 "human_feedback": human_feedback if human_feedback else "Approved",
-                "messages": [response]
+                "messages": [response],
             },
-            goto="analyzer_collector" if human_feedback and "more" in human_feedback.lower() else "plan_writer"
+            goto="analyzer_collector"
+            if human_feedback and "more" in human_feedback.lower()
+            else "plan_writer",
         )
-    
+
     # If human wants more research
     else:
         additional_query = state.get("human_feedback", "")
         if additional_query and additional_query != "Approved":
-            # Use Serper for additional research
-            search_result = await serper_search(additional_query)
-            if not search_result or "error" in search_result:
-                search_result = await search(additional_query)
-            if search_result:
-                updated_info = state["collected_information"] + [str(search_result)]
-                
-                human_feedback = interrupt({
-                    "question": "Review the additional research. Continue or proceed?",
-                    "research_data": str(search_result),
-                    "action": "collect"
-                })
-                
+            digests = await _run_research(
+                [additional_query], runtime.context, state["user_input"]
+            )
+            if digests:
+                search_result = "\n\n".join(digests)
+                updated_info = state["collected_information"] + [
+                    await offload(search_result, runtime.context)
+                ]
+
+                human_feedback = interrupt(
+                    {
+                        "question": "Review the additional research. Continue or proceed?",
+                        "research_data": search_result,
+                        "search_cache": _search_cache_stats(runtime.context),
+                        "action": "collect",
+                    }
+                )
+
                 return Command(
                     update={
                         "collected_information": updated_info,
-                        "research_data": state["research_data"] + "\n\n" + str(search_result),
-                        "human_feedback": human_feedback if human_feedback else "Approved"
+                        "research_data": await offload(
+                            await resolve(state["research_data"], runtime.context)
+                            + "\n\n"
+                            + search_result,
+                            runtime.context,
+                        ),
+                        "human_feedback": human_feedback
+                        if human_feedback
+                        else "Approved",
                     },
-                    goto="analyzer_collector" if human_feedback and "more" in human_feedback.lower() else "plan_writer"
+                    goto="analyzer_collector"
+                    if human_feedback and "more" in human_feedback.lower()
+                    else "plan_writer",
                 )
-        
+
         return Command(goto="plan_writer")
 
 
@@ -168,8 +260,6 @@ async def plan_writer_node(
     """Plan Writer: Creates a structured content plan with numbered steps.
     Includes human-in-the-loop for plan approval.
     """
-    model = load_chat_model(runtime.context.model)
-    
     system_prompt = """You are a content strategist. Based on the research data, 
 create a detailed content plan with NUMBERED STEPS.
 
@@ -186,116 +276,161 @@ STEP 2: [Title/Topic]
 
 Make each step a clear, independent unit of work."""
 
-    response = cast(
-        AIMessage,
-        await model.ainvoke([
+    response = await invoke_model(
+        [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"User request: {state['user_input']}\n\nResearch data:\n{state['research_data']}"}
-        ])
+            {
+                "role": "user",
+                "content": f"User request: {state['user_input']}\n\nResearch data:\n{await resolve(state['research_data'], runtime.context)}",
+            },
+        ],
+        runtime.context,
+        node="plan_writer",
     )
-    
+
     # Extract steps from the plan
     plan_text = response.content
     steps = []
     for line in plan_text.split("\n"):
         if line.strip().startswith("STEP"):
             steps.append(line.strip())
-    
+
     # Request human approval
-    human_feedback = interrupt({
-        "question": "Review the content plan. Approve or provide feedback for revisions?",
-        "plan": response.content,
-        "steps_count": len(steps),
-        "action": "ask"
-    })
-    
+    human_feedback = interrupt(
+        {
+            "question": "Review the content plan. Approve or provide feedback for revisions?",
+            "plan": response.content,
+            "steps_count": len(steps),
+            "action": "ask",
+        }
+    )
+
     approved = not human_feedback or "approve" in human_feedback.lower()
-    
+
     return Command(
         update={
-            "content_plan": response.content,
+            "content_plan": await offload(get_message_text(response), runtime.context),
             "plan_steps": steps if steps else ["STEP 1: Complete content"],
             "current_step_index": 0,
             "completed_steps": [],
+            "completed_summary": "",
             "plan_approved": approved,
             "human_feedback": human_feedback if human_feedback else "Approved",
-            "messages": [response]
+            "messages": [response],
         },
-        goto="draft_writer" if approved else "plan_writer"
+        goto="draft_writer" if approved else "plan_writer",
     )
 
 
-async def draft_writer_node(
-    state: State, runtime: Runtime[Context]
-) -> Dict[str, Any]:
-    """Draft Writer: Creates draft for CURRENT STEP only.
-    Works step-by-step through the plan.
+async def _write_step_draft(
+    state: Mapping[str, Any], context: Context, stream: bool = True, feedback: str = ""
+) -> AIMessage:
+    """Draft the plan step at state["current_step_index"].
+
+    Tokens are streamed to the client unless `stream` is False (background use).
+    `feedback` on an earlier draft of the step is included when redrafting it.
     """
-    model = load_chat_model(runtime.context.model)
-    
     current_index = state.get("current_step_index", 0)
-    plan_steps = state.get("plan_steps", [])
-    
-    if current_index >= len(plan_steps):
-        # All steps completed, combine into final draft
-        return {
-            "draft_content": "\n\n".join(state.get("completed_steps", [])),
-            "current_step_draft": "All steps completed",
-            "messages": [AIMessage(content="All plan steps completed!")]
-        }
-    
-    current_step = plan_steps[current_index]
-    
-    system_prompt = f"""You are an expert content writer. 
-Write ONLY the content for the CURRENT STEP of the plan.
-Do not write other steps - focus on this specific section.
+    current_step = state["plan_steps"][current_index]
 
-Current Step: {current_step}
+    # The instructions, plan and research are identical for every step of the
+    # article; keeping them first lets providers serve them from the prompt cache.
+    instructions = """You are an expert content writer. 
+Write ONLY the content for the CURRENT STEP of the plan, given at the end.
+Do not write other steps - focus on this specific section.
 
 Make it engaging, well-structured, and informative."""
 
-    completed = "\n\n".join(state.get("completed_steps", []))
-    context = f"""User request: {state['user_input']}
+    shared_context = f"""User request: {state["user_input"]}
 
 Full Content Plan:
-{state['content_plan']}
+{await resolve(state["content_plan"], context)}
 
 Research Data:
-{state['research_data']}
+{await resolve(state["research_data"], context)}"""
+
+    completed = state.get("completed_steps", [])
+    step_context = f"""Summary of Earlier Sections:
+{state.get("completed_summary") or "None yet"}
 
-Already Completed Steps:
-{completed if completed else 'None yet'}
+Previous Section:
+{await resolve(completed[-1], context) if completed else "None yet"}
 
 NOW WRITE ONLY: {current_step}"""
-
-    response = cast(
-        AIMessage,
-        await model.ainvoke([
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": context}
-        ])
+    if feedback:
+        step_context += f"""
+
+Address this feedback on the previous draft of this step:
+{feedback}"""
+
+    return await invoke_model(
+        layout_prompt(instructions, shared_context, step_context),
+        context,
+        node="draft_writer",
+        step=current_index,
+        stream=stream,
     )
-    
-    return {
-        "current_step_draft": response.content,
-        "draft_iteration": state.get("draft_iteration", 0) + 1,
-        "messages": [response]
-    }
 
 
-async def critic_agent_node(
-    state: State, runtime: Runtime[Context]
-) -> Dict[str, Any]:
-    """Critic Agent: Reviews CURRENT STEP draft only."""
-    model = load_chat_model(runtime.context.model)
-    
+def _revision_feedback(state: Mapping[str, Any]) -> str:
+    """Combine the reviewer's and the critic's feedback on the current step draft."""
+    return f"""Reviewer Feedback:
+{state.get("human_feedback") or "None"}
+
+Critic Feedback:
+{state.get("critic_feedback") or "None"}"""
+
+
+async def _revise_step_draft(
+    state: Mapping[str, Any], context: Context
+) -> Tuple[str, AIMessage] | None:
+    """Revise the current step draft with targeted edits instead of redrafting it.
+
+    Returns the revised draft and the model's edit response, or None when no
+    edit could be applied (the caller then redrafts the step in full).
+    """
     current_index = state.get("current_step_index", 0)
-    plan_steps = state.get("plan_steps", [])
-    current_step = plan_steps[current_index] if current_index < len(plan_steps) else "Unknown"
-    
-    system_prompt = f"""You are a critical editor reviewing step-by-step content.
+    current_step = state["plan_steps"][current_index]
+    draft = await resolve(state["current_step_draft"], context)
 
-Current Step Being Reviewed: {current_step}
+    system_prompt = f"""You are an expert content writer revising one section of a longer piece.
+Address the feedback with targeted edits; do not rewrite text that needs no change.
+
+Reply ONLY with edit blocks in this format, one per change:
+
+{EDIT_FORMAT}
+
+Each SEARCH must copy a short, unique passage of the draft exactly."""
+
+    response = await invoke_model(
+        [
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": f"""Section: {current_step}
+
+Current Draft:
+{draft}
+
+{_revision_feedback(state)}""",
+            },
+        ],
+        context,
+        node="draft_writer",
+        step=current_index,
+    )
+    revised, applied = apply_edits(draft, parse_edits(str(response.content)))
+    if not applied:
+        return None
+    replay_response(AIMessage(content=revised), node="draft_writer", step=current_index)
+    return revised, response
+
+
+async def _critique_step_draft(
+    draft: str, current_step: str, context: Context, step: int | None = None
+) -> AIMessage:
+    """Review a single step draft."""
+    instructions = """You are a critical editor reviewing step-by-step content.
 
 Provide:
 1. Strengths of this section
@@ -303,24 +438,145 @@ Provide:
 3. Specific suggestions
 4. Quality assessment (Approve/Needs Revision)"""
 
-    response = cast(
-        AIMessage,
-        await model.ainvoke([
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"""Step Draft to Review:
+    return await invoke_model(
+        layout_prompt(
+            instructions,
+            "",
+            f"""Current Step Being Reviewed: {current_step}
 
-{state.get('current_step_draft', '')}
+Step Draft to Review:
 
-Step Context: {current_step}"""}
-        ])
+{draft}""",
+        ),
+        context,
+        node="critic_agent",
+        step=step,
     )
-    
-    approved = "approve" in response.content.lower() and "needs revision" not in response.content.lower()
-    
+
+
+async def _draft_and_critique(
+    state: Mapping[str, Any], context: Context
+) -> Tuple[AIMessage, AIMessage]:
+    """Draft and critique a step in one go, for speculative execution."""
+    draft = await _write_step_draft(state, context, stream=False)
+    current_step = state["plan_steps"][state["current_step_index"]]
+    critique = await _critique_step_draft(
+        get_message_text(draft), current_step, context, step=state["current_step_index"]
+    )
+    return draft, critique
+
+
+async def _advance_summary(state: State, context: Context) -> str:
+    """Return the rolling summary after the current step is approved.
+
+    The previous section leaves the verbatim window and is folded into the summary.
+    """
+    summary = state.get("completed_summary", "")
+    completed = state.get("completed_steps", [])
+    if completed:
+        summary = update_rolling_summary(
+            summary,
+            await resolve(completed[-1], context),
+            context.context_summary_token_budget,
+        )
+    return summary
+
+
+async def _speculate_next_step(state: State, context: Context) -> None:
+    """Start drafting the next step in the background, assuming approval."""
+    next_index = state.get("current_step_index", 0) + 1
+    completed = state.get("completed_steps", []) + [state.get("current_step_draft", "")]
+    next_state = {
+        **state,
+        "completed_steps": completed,
+        "completed_summary": await _advance_summary(state, context),
+        "current_step_index": next_index,
+    }
+    SPECULATIVE_DRAFTS.start(
+        speculation_key(current_run_id(), next_index, completed),
+        _draft_and_critique(next_state, context),
+    )
+
+
+async def draft_writer_node(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+    """Draft Writer: Creates draft for CURRENT STEP only.
+    Works step-by-step through the plan.
+    """
+    current_index = state.get("current_step_index", 0)
+    plan_steps = state.get("plan_steps", [])
+
+    if current_index >= len(plan_steps):
+        # All steps completed, combine into final draft
+        completed = await resolve_all(state.get("completed_steps", []), runtime.context)
+        return {
+            "draft_content": await offload("\n\n".join(completed), runtime.context),
+            "current_step_draft": "All steps completed",
+            "messages": [AIMessage(content="All plan steps completed!")],
+        }
+
+    # A rejected draft of this step is revised in place with targeted edits
+    if state.get("step_approved") is False and state.get("current_step_draft"):
+        revision = await _revise_step_draft(state, runtime.context)
+        if revision is None:
+            response = await _write_step_draft(
+                state, runtime.context, feedback=_revision_feedback(state)
+            )
+            draft = get_message_text(response)
+        else:
+            draft, response = revision
+        return {
+            "current_step_draft": await offload(draft, runtime.context),
+            "draft_iteration": state.get("draft_iteration", 0) + 1,
+            "messages": [response],
+        }
+
+    # Use a draft speculated during the previous step's review, if it matches
+    speculative = await SPECULATIVE_DRAFTS.take(
+        speculation_key(
+            current_run_id(), current_index, state.get("completed_steps", [])
+        )
+    )
+    if speculative is not None:
+        response, critique = speculative
+        SPECULATIVE_DRAFTS.put_critique(
+            critique_key(current_run_id(), get_message_text(response)), critique
+        )
+    else:
+        response = await _write_step_draft(state, runtime.context)
+
+    return {
+        "current_step_draft": await offload(
+            get_message_text(response), runtime.context
+        ),
+        "draft_iteration": 1,
+        "messages": [response],
+    }
+
+
+async def critic_agent_node(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+    """Critic Agent: Reviews CURRENT STEP draft only."""
+    current_index = state.get("current_step_index", 0)
+    plan_steps = state.get("plan_steps", [])
+    current_step = (
+        plan_steps[current_index] if current_index < len(plan_steps) else "Unknown"
+    )
+    draft = await resolve(state.get("current_step_draft", ""), runtime.context)
+
+    response = SPECULATIVE_DRAFTS.take_critique(critique_key(current_run_id(), draft))
+    if response is None:
+        response = await _critique_step_draft(
+            draft, current_step, runtime.context, step=current_index
+        )
+
+    approved = (
+        "approve" in response.content.lower()
+        and "needs revision" not in response.content.lower()
+    )
+
     return {
         "critic_feedback": response.content,
         "critic_approved": approved,
-        "messages": [response]
+        "messages": [response],
     }
 
 
@@ -333,170 +589,146 @@ async def human_feedback_draft_node(
     """
     current_index = state.get("current_step_index", 0)
     plan_steps = state.get("plan_steps", [])
-    current_step = plan_steps[current_index] if current_index < len(plan_steps) else "Final"
+    current_step = (
+        plan_steps[current_index] if current_index < len(plan_steps) else "Final"
+    )
     completed = state.get("completed_steps", [])
-    
+
+    if runtime.context.speculative_drafting and current_index + 1 < len(plan_steps):
+        await _speculate_next_step(state, runtime.context)
+
     # Request human decision for THIS STEP
-    human_decision = interrupt({
-        "question": f"Review STEP {current_index + 1}/{len(plan_steps)}: {current_step}",
-        "step_draft": state.get("current_step_draft", ""),
-        "critic_feedback": state.get("critic_feedback", ""),
-        "iteration": state.get("draft_iteration", 1),
-        "progress": f"Completed: {len(completed)}/{len(plan_steps)} steps",
-        "action": "feedback"
-    })
-    
+    step_draft = await resolve(state.get("current_step_draft", ""), runtime.context)
+    human_decision = interrupt(
+        {
+            "question": f"Review STEP {current_index + 1}/{len(plan_steps)}: {current_step}",
+            "step_draft": step_draft,
+            "critic_feedback": state.get("critic_feedback", ""),
+            "iteration": state.get("draft_iteration", 1),
+            "progress": f"Completed: {len(completed)}/{len(plan_steps)} steps",
+            "action": "feedback",
+        }
+    )
+
     if not human_decision or "approve" in human_decision.lower():
         # Approve this step - add to completed
         new_completed = completed + [state.get("current_step_draft", "")]
         new_index = current_index + 1
-        
+        summary = await _advance_summary(state, runtime.context)
+
         # Check if all steps are done
         if new_index >= len(plan_steps):
             # All steps completed! Combine and save
             return Command(
                 update={
                     "completed_steps": new_completed,
-                    "draft_content": "\n\n".join(new_completed),
+                    "completed_summary": summary,
+                    "draft_content": await offload(
+                        "\n\n".join(await resolve_all(new_completed, runtime.context)),
+                        runtime.context,
+                    ),
                     "human_feedback": "All steps approved",
-                    "step_approved": True
+                    "step_approved": True,
                 },
-                goto="save_to_db"
+                goto="save_to_db",
             )
         else:
             # Move to next step - loop back to draft_writer
             return Command(
                 update={
                     "completed_steps": new_completed,
+                    "completed_summary": summary,
                     "current_step_index": new_index,
                     "human_feedback": f"Step {current_index + 1} approved",
-                    "step_approved": True
+                    "step_approved": True,
                 },
-                goto="draft_writer"
+                goto="draft_writer",
             )
     else:
         # Revision requested - loop back to draft_writer for SAME step
+        SPECULATIVE_DRAFTS.discard(current_run_id())
         return Command(
-            update={
-                "human_feedback": human_decision,
-                "step_approved": False
-            },
-            goto="draft_writer"
+            update={"human_feedback": human_decision, "step_approved": False},
+            goto="draft_writer",
         )
 
 
-async def save_to_db_node(state: State) -> Dict[str, Any]:
-    """Save to DB: Saves completed content to Pinecone vector database."""
-    import os
-    from datetime import datetime
-    
+async def save_to_db_node(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+    """Save to DB: Embeds each completed step and upserts them to the vector store."""
     # Combine all completed steps into final draft
-    completed_steps = state.get("completed_steps", [])
+    completed_steps = await resolve_all(
+        state.get("completed_steps", []), runtime.context
+    )
     full_content = "\n\n".join(completed_steps)
-    
-    
-    # Try to save to Pinecone if API key is available
-    pinecone_api_key = os.getenv("PINECONE_API_KEY")
-    
-    if pinecone_api_key and pinecone_api_key != "your_pinecone_api_key_here":
-        try:
-            from pinecone import ServerlessSpec
-            from pinecone.grpc import PineconeGRPC as Pinecone
-            
-            # Initialize Pinecone
-            pc = Pinecone(api_key=pinecone_api_key)
-            
-            # Use or create index
-            index_name = "langgraph-content"
-            
-            # Check if index exists, create if not
-            existing_indexes = [idx.name for idx in pc.list_indexes()]
-            if index_name not in existing_indexes:
-                pc.create_index(
-                    name=index_name,
-                    dimension=1536,  # OpenAI embedding dimension
-                    metric="cosine",
-                    spec=ServerlessSpec(cloud="aws", region="us-east-1")
-                )
-            
-            pc.Index(index_name)
-            
-            # Generate embedding (using simple hash for now, should use OpenAI embeddings)
-            # TODO: Replace with actual OpenAI embeddings
-            import hashlib
-            hashlib.md5(full_content.encode()).hexdigest()
-            
-            # For now, store metadata without vector (simplified)
-            # In production, generate proper embeddings
-            {
-                "title": state["user_input"][:200],
-                "content": full_content[:1000],  # Truncate for metadata
-                "full_length": len(full_content),
-                "steps_count": len(completed_steps),
-                "timestamp": datetime.now().isoformat(),
-                "plan": state.get("content_plan", "")[:500]
-            }
-            
-            
-        except Exception:
-            pass
-    else:
-        pass
-    
+
+    # Persist one chunk per plan step in a single batched embed + upsert
+    try:
+        await save_article(
+            state["user_input"],
+            state.get("plan_steps", []),
+            completed_steps,
+            runtime.context,
+        )
+    except Exception:
+        # Persistence is best-effort; never block the final polish on it
+        logger.exception("Failed to save the article to the vector store")
+
     return {
-        "messages": [AIMessage(content=f"Content saved! {len(completed_steps)} steps completed.")],
-        "draft_content": full_content,
-        "final_content": full_content
+        "messages": [
+            AIMessage(content=f"Content saved! {len(completed_steps)} steps completed.")
+        ],
+        "draft_content": await offload(full_content, runtime.context),
+        "final_content": full_content,
+        "polished_sections": [],
     }
 
 
-async def final_drafter_node(
-    state: State, runtime: Runtime[Context]
-) -> Command[Dict[str, Any]]:
-    """Final Drafter: Polishes the approved draft into final content.
-    Includes human-in-the-loop for final review.
+async def final_drafter_node(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+    """Final Drafter: Polishes the approved steps in parallel into final content.
+    Back from a final review with requested changes, re-polishes only the
+    sections the feedback refers to. The result is stored in State before the
+    review interrupts, so resuming the review never repeats the polish.
     """
-    model = load_chat_model(runtime.context.model)
-    
-    system_prompt = """You are a final editor. Polish the approved draft:
-1. Fix any remaining issues
-2. Enhance clarity and flow
-3. Ensure professional formatting
-4. Add finishing touches"""
-
-    response = cast(
-        AIMessage,
-        await model.ainvoke([
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"""Approved draft to finalize:
+    context = runtime.context
+    titles = [section_title(step) for step in state.get("plan_steps", [])]
+    sections = await resolve_all(state.get("completed_steps", []), context) or [
+        await resolve(state["draft_content"], context)
+    ]
+    polished = await resolve_all(state.get("polished_sections", []), context)
+
+    if len(polished) == len(sections):
+        # Back from final review with requested changes
+        feedback = state.get("human_feedback", "")
+        polished = await polish_sections(
+            polished,
+            titles,
+            context,
+            affected_sections(feedback, titles[: len(polished)]),
+            feedback,
+        )
+    else:
+        polished = await polish_sections(sections, titles, context)
+    final_content = await smooth_seams(polished, context)
+
+    return {
+        "final_content": final_content,
+        "polished_sections": await offload_all(polished, context),
+        "messages": [AIMessage(content=final_content)],
+    }
 
-{state['draft_content']}
 
-Critic feedback incorporated:
-{state['critic_feedback']}"""}
-        ])
+async def human_feedback_final_node(
+    state: State, runtime: Runtime[Context]
+) -> Command[Dict[str, Any]]:
+    """Human Feedback (final): Approve the polished article or request changes."""
+    human_feedback = interrupt(
+        {
+            "question": "Review the final polished content. Any last changes?",
+            "final_content": state["final_content"],
+            "action": "feedback",
+        }
     )
-    
-    # Request final human approval
-    human_feedback = interrupt({
-        "question": "Review the final polished content. Any last changes?",
-        "final_content": response.content,
-        "action": "feedback"
-    })
-    
+
     if not human_feedback or "approve" in human_feedback.lower():
-        return Command(
-            update={
-                "final_content": response.content,
-                "messages": [response]
-            },
-            goto="__end__"
-        )
-    else:
-        return Command(
-            update={
-                "human_feedback": human_feedback,
-                "messages": [response]
-            },
-            goto="final_drafter"
-        )
+        return Command(goto="__end__")
+    return Command(update={"human_feedback": human_feedback}, goto="final_drafter")
@@ -9,40 +9,42 @@ from typing_extensions import TypedDict
 
 class State(TypedDict):
     """Main state for the content creation workflow."""
-    
+
     # Messages history
     messages: Annotated[List[BaseMessage], add_messages]
-    
+
     # User's original input
     user_input: str
-    
+
     # Orchestrator decision
     is_general_question: bool
-    
+
     # Analysis and research
     research_data: str
     collected_information: List[str]
-    
+
     # Planning
     content_plan: str
     plan_approved: bool
     plan_steps: List[str]  # Individual steps from the plan
     current_step_index: int  # Which step we're working on
     completed_steps: List[str]  # Steps that passed human validation
-    
+    completed_summary: str  # Rolling summary of all but the latest completed step
+
     # Drafting
     draft_content: str
     draft_iteration: int
     current_step_draft: str  # Draft for current step only
-    
+
     # Critic feedback
     critic_feedback: str
     critic_approved: bool
     step_approved: bool  # Human approval for current step
-    
+
     # Final output
+    polished_sections: List[str]  # Polished completed steps, before seam smoothing
     final_content: str
-    
+
     # Human feedback tracking
     human_feedback: str
     needs_human_input: bool
@@ -50,13 +52,13 @@ class State(TypedDict):
 
 class InputState(TypedDict):
     """Input state for the workflow."""
-    
+
     messages: List[BaseMessage]
     user_input: str
 
 
 class OutputState(TypedDict):
     """Output state for the workflow."""
-    
+
     messages: List[BaseMessage]
     final_content: str
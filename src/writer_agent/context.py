@@ -26,6 +26,370 @@ class Context:
         },
     )
 
+    search_providers: str = field(
+        default="serper,tavily",
+        metadata={
+            "description": "Comma-separated search providers in priority order. "
+            "Later providers are used as hedges for earlier ones."
+        },
+    )
+
+    search_concurrency: int = field(
+        default=4,
+        metadata={
+            "description": "The maximum number of search queries in flight at once."
+        },
+    )
+
+    search_hedge_delay: float = field(
+        default=1.5,
+        metadata={
+            "description": "Seconds to wait for a search provider before also "
+            "querying the next provider in the chain."
+        },
+    )
+
+    search_timeout: float = field(
+        default=20.0,
+        metadata={"description": "Per-query timeout in seconds across all providers."},
+    )
+
+    http_max_connections: int = field(
+        default=20,
+        metadata={
+            "description": "Maximum concurrent connections in the shared search HTTP pool."
+        },
+    )
+
+    http_max_keepalive_connections: int = field(
+        default=10,
+        metadata={
+            "description": "Maximum idle keep-alive connections kept in the search HTTP pool."
+        },
+    )
+
+    http_keepalive_expiry: float = field(
+        default=30.0,
+        metadata={"description": "Seconds an idle keep-alive connection is kept open."},
+    )
+
+    http2: bool = field(
+        default=True,
+        metadata={
+            "description": "Use HTTP/2 for search requests when the h2 package is installed."
+        },
+    )
+
+    search_cache_path: str = field(
+        default="",
+        metadata={
+            "description": "SQLite file for the persistent search-result cache "
+            "(e.g. '~/.cache/writer_agent/search_cache.sqlite'). Empty disables caching."
+        },
+    )
+
+    search_cache_ttls: str = field(
+        default="serper=86400,tavily=43200",
+        metadata={
+            "description": "Per-provider cache TTLs in seconds, as provider=seconds pairs. "
+            "A 'default' entry applies to unlisted providers."
+        },
+    )
+
+    search_cache_stale_ttl: float = field(
+        default=604800.0,
+        metadata={
+            "description": "Seconds past expiry during which a stale result is still served "
+            "while it is refreshed in the background."
+        },
+    )
+
+    search_cache_max_entries: int = field(
+        default=5000,
+        metadata={
+            "description": "Maximum cached search results; least recently used entries are evicted."
+        },
+    )
+
+    research_token_budget: int = field(
+        default=2000,
+        metadata={
+            "description": "Approximate token budget for the research digest passed to "
+            "the planning and drafting prompts."
+        },
+    )
+
+    context_summary_token_budget: int = field(
+        default=600,
+        metadata={
+            "description": "Approximate token budget for the rolling summary of earlier "
+            "sections given to the draft writer."
+        },
+    )
+
+    speculative_drafting: bool = field(
+        default=False,
+        metadata={
+            "description": "Draft and critique the next plan step in the background while "
+            "the current step is under human review."
+        },
+    )
+
+    polish_concurrency: int = field(
+        default=4,
+        metadata={
+            "description": "The maximum number of sections polished at once by the final drafter."
+        },
+    )
+
+    classifier_min_confidence: float = field(
+        default=0.8,
+        metadata={
+            "description": "Minimum confidence for the local routing classifier to decide "
+            "without calling the LLM."
+        },
+    )
+
+    classifier_model_path: str = field(
+        default="",
+        metadata={
+            "description": "Optional JSON file with a linear routing model used when the "
+            "keyword rules are not confident."
+        },
+    )
+
+    llm_cache_nodes: str = field(
+        default="",
+        metadata={
+            "description": "Comma-separated node names whose LLM responses are cached "
+            "(e.g. 'plan_writer,critic_agent'), or '*' for all nodes. Empty disables caching."
+        },
+    )
+
+    llm_cache_path: str = field(
+        default=".cache/writer_agent/llm_cache.sqlite",
+        metadata={"description": "SQLite file for the LLM response cache."},
+    )
+
+    llm_cache_max_bytes: int = field(
+        default=256 * 1024 * 1024,
+        metadata={
+            "description": "Maximum total size of cached responses before least recently "
+            "used entries are evicted."
+        },
+    )
+
+    blob_store_path: str = field(
+        default="",
+        metadata={
+            "description": "Directory of the content-addressed blob store for large State "
+            "fields (message bodies always stay inline). Empty keeps everything inline "
+            "in checkpoints. Blobs are never deleted automatically."
+        },
+    )
+
+    blob_inline_threshold: int = field(
+        default=2048,
+        metadata={
+            "description": "Strings shorter than this many characters stay inline in State "
+            "even when the blob store is enabled."
+        },
+    )
+
+    embedding_model: str = field(
+        default="openai/text-embedding-3-small",
+        metadata={
+            "description": "Embeddings model used to index saved articles, as provider/model. "
+            "'fake/<dimension>' gives deterministic offline embeddings."
+        },
+    )
+
+    vector_backend: str = field(
+        default="pinecone",
+        metadata={
+            "description": "Vector store for saved articles: 'pinecone', 'local' "
+            "(memory-mapped on-disk index) or 'memory'."
+        },
+    )
+
+    vector_index_name: str = field(
+        default="langgraph-content",
+        metadata={
+            "description": "Name of the vector index holding saved article chunks."
+        },
+    )
+
+    vector_upsert_batch_size: int = field(
+        default=100,
+        metadata={"description": "Maximum vectors per upsert request."},
+    )
+
+    local_index_path: str = field(
+        default=".cache/writer_agent/vector_index",
+        metadata={
+            "description": "Directory holding local vector indexes (one subdirectory per index name)."
+        },
+    )
+
+    local_index_mode: str = field(
+        default="exact",
+        metadata={
+            "description": "Local index search mode: 'exact' brute force or 'ivf' "
+            "approximate search for large corpora."
+        },
+    )
+
+    local_index_nlist: int = field(
+        default=256,
+        metadata={"description": "Number of IVF clusters for the local index."},
+    )
+
+    local_index_nprobe: int = field(
+        default=8,
+        metadata={
+            "description": "Number of IVF clusters scanned per local index query."
+        },
+    )
+
+    retrieval_enabled: bool = field(
+        default=True,
+        metadata={
+            "description": "Search previously saved articles before web search during research."
+        },
+    )
+
+    retrieval_min_score: float = field(
+        default=0.8,
+        metadata={
+            "description": "Minimum cosine similarity for a saved section to count as covering "
+            "a research query (covered queries skip web search)."
+        },
+    )
+
+    retrieval_top_k: int = field(
+        default=3,
+        metadata={"description": "Saved sections fetched per research query."},
+    )
+
+    retrieval_token_budget: int = field(
+        default=1500,
+        metadata={
+            "description": "Approximate token budget for saved sections added to the research data."
+        },
+    )
+
+    metrics_sinks: str = field(
+        default="",
+        metadata={
+            "description": "Comma-separated metrics sinks for node, LLM and search spans: "
+            "'json', 'prometheus' and/or 'otel'. Empty keeps in-process aggregates only."
+        },
+    )
+
+    metrics_log_path: str = field(
+        default="",
+        metadata={
+            "description": "File the 'json' metrics sink appends to. Empty logs to the "
+            "'writer_agent.metrics' logger."
+        },
+    )
+
+    model_prices: str = field(
+        default="",
+        metadata={
+            "description": "Extra or overriding model prices for cost estimates, as "
+            "provider/model=input:output[:cached] in USD per million tokens."
+        },
+    )
+
+    rate_limits: str = field(
+        default="",
+        metadata={
+            "description": "Per-provider or per-model LLM quotas shared by all threads, as "
+            "provider[/model]=rpm:tpm[:max_concurrency] (0 = unlimited), e.g. "
+            "'openai=500:200000,anthropic/claude-3-5-haiku-latest=50:40000:8'. "
+            "Empty disables rate limiting."
+        },
+    )
+
+    llm_priorities: str = field(
+        default="",
+        metadata={
+            "description": "Overrides of LLM scheduling priority per node, as node=priority "
+            "(lower is served first; defaults favor routing and direct answers over drafting)."
+        },
+    )
+
+    rate_limit_max_retries: int = field(
+        default=3,
+        metadata={
+            "description": "Retries after a provider rate-limit error for rate-limited models."
+        },
+    )
+
+    fast_model: str = field(
+        default="",
+        metadata={
+            "description": "Model for the 'fast' tier, as provider/model. Empty picks the "
+            "provider's small model for the main model's provider (e.g. gpt-4o-mini)."
+        },
+    )
+
+    node_models: str = field(
+        default="orchestrator=fast,analyzer_collector=fast,critic_agent=fast",
+        metadata={
+            "description": "Model per node, as node=tier or node=provider/model. Tiers are "
+            "'main' (the model setting) and 'fast' (fast_model); unlisted nodes use 'main'. "
+            "Set to empty to run every node on the main model."
+        },
+    )
+
+    node_settings: str = field(
+        default=(
+            "orchestrator.max_tokens=5,orchestrator.temperature=0,"
+            "analyzer_collector.max_tokens=200,"
+            "critic_agent.max_tokens=1000,critic_agent.temperature=0"
+        ),
+        metadata={
+            "description": "Generation settings per node, as node.setting=value pairs "
+            "(e.g. 'draft_writer.temperature=0.7,final_drafter.max_tokens=4000'). "
+            "Set to empty to use the provider's defaults for every node."
+        },
+    )
+
+    model_fallbacks: str = field(
+        default="",
+        metadata={
+            "description": "Backup models per node, tried in order when the primary errors or "
+            "is slow, as node=provider/a|provider/b; '*' applies to every other node. "
+            "Example: 'draft_writer=anthropic/claude-3-5-sonnet-latest,*=openai/gpt-4o-mini'."
+        },
+    )
+
+    llm_hedge_percentile: float = field(
+        default=95.0,
+        metadata={
+            "description": "Start the next model in a fallback chain once the current one has "
+            "been slower than this percentile of its recent latency for the node "
+            "(time to first token for streamed calls)."
+        },
+    )
+
+    llm_hedge_min_samples: int = field(
+        default=20,
+        metadata={
+            "description": "Latency samples needed before the percentile is used for hedging."
+        },
+    )
+
+    llm_hedge_delay: float = field(
+        default=0.0,
+        metadata={
+            "description": "Hedge delay in seconds used until enough samples exist. "
+            "0 falls back to the next model only on errors."
+        },
+    )
+
     def __post_init__(self) -> None:
         """Fetch env vars for attributes that were not passed as args."""
         for f in fields(self):
@@ -33,4 +397,15 @@ class Context:
                 continue
 
             if getattr(self, f.name) == f.default:
-                setattr(self, f.name, os.environ.get(f.name.upper(), f.default))
+                value = os.environ.get(f.name.upper())
+                if value is not None:
+                    setattr(self, f.name, _coerce(value, f.default))
+
+
+def _coerce(value: str, default: object) -> object:
+    """Convert an env var string to the type of the field's default."""
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, (int, float)):
+        return type(default)(value)
+    return value
@@ -0,0 +1,61 @@
+"""Incremental, token-bounded context for drafting later plan steps.
+
+Instead of pasting every completed section into each draft prompt (which makes
+total input grow quadratically with the number of steps), the workflow keeps a
+rolling extractive summary of earlier sections plus the immediately preceding
+section verbatim. The summary is updated once per approved step and never
+exceeds its token budget, so per-step prompt size stays flat.
+"""
+
+from __future__ import annotations
+
+import re
+
+from writer_agent.utils import estimate_tokens
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Separates an entry's heading from its gist. Headings such as "STEP 1: Topic"
+# contain ": " themselves, so the separator must not.
+_GIST_SEPARATOR = " — "
+
+
+def summarize_section(section: str, max_tokens: int) -> str:
+    """Return a one-line gist of a section: its heading plus leading sentences."""
+    lines = [
+        line.strip().lstrip("#").strip()
+        for line in section.splitlines()
+        if line.strip()
+    ]
+    if not lines:
+        return ""
+    heading, body = lines[0], " ".join(lines[1:])
+    gist = ""
+    for sentence in _SENTENCE_END.split(body):
+        candidate = f"{gist} {sentence}".strip()
+        if estimate_tokens(f"- {heading}{_GIST_SEPARATOR}{candidate}") > max_tokens:
+            break
+        gist = candidate
+    return f"- {heading}{_GIST_SEPARATOR}{gist}" if gist else f"- {heading}"
+
+
+def _heading_only(entry: str) -> str:
+    return entry.split(_GIST_SEPARATOR, 1)[0]
+
+
+def update_rolling_summary(summary: str, section: str, token_budget: int) -> str:
+    """Fold one more section into the rolling summary, staying within budget.
+
+    The newest entry gets the most detail. When the budget is exceeded, the
+    oldest entries are first reduced to their headings and then dropped.
+    """
+    entries = [e for e in summary.splitlines() if e.startswith("- ")]
+    entries.append(summarize_section(section, max(16, token_budget // 4)))
+
+    for i in range(len(entries) - 1):
+        if estimate_tokens("\n".join(entries)) <= token_budget:
+            break
+        entries[i] = _heading_only(entries[i])
+    while len(entries) > 1 and estimate_tokens("\n".join(entries)) > token_budget:
+        entries.pop(0)
+    return "\n".join(entries)
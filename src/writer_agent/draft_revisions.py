@@ -0,0 +1,59 @@
+"""Patch-based revisions of step drafts.
+
+When a reviewer asks for changes to a step, the model is sent the existing
+draft with the reviewer's and the critic's feedback and asked for targeted
+SEARCH/REPLACE edits instead of a fresh draft. The edits are applied here,
+so a revision costs output tokens in proportion to what changes rather than
+to the length of the section, and text the feedback does not touch is kept
+verbatim.
+"""
+
+from __future__ import annotations
+
+import re
+
+EDIT_FORMAT = """<<<<<<< SEARCH
+exact text copied from the draft
+=======
+replacement text
+>>>>>>> REPLACE"""
+
+_EDIT_BLOCK = re.compile(
+    r"<{5,}[ \t]*SEARCH[ \t]*\n(.*?)\n?={5,}[ \t]*\n(.*?)\n?>{5,}[ \t]*REPLACE",
+    re.DOTALL,
+)
+
+
+def parse_edits(text: str) -> list[tuple[str, str]]:
+    """Return the (search, replace) pairs of the SEARCH/REPLACE blocks in `text`."""
+    return [
+        (search, replace)
+        for search, replace in _EDIT_BLOCK.findall(text)
+        if search.strip()
+    ]
+
+
+def _find(text: str, search: str) -> tuple[int, int] | None:
+    """Locate `search` in `text`, exactly or else ignoring whitespace differences."""
+    start = text.find(search)
+    if start != -1:
+        return start, start + len(search)
+    pattern = r"\s+".join(re.escape(word) for word in search.split())
+    match = re.search(pattern, text)
+    return match.span() if match else None
+
+
+def apply_edits(draft: str, edits: list[tuple[str, str]]) -> tuple[str, int]:
+    """Apply `edits` in order to `draft`, each to its first match.
+
+    Returns the revised text and how many edits applied; edits whose search
+    text is not found are skipped.
+    """
+    applied = 0
+    for search, replace in edits:
+        span = _find(draft, search)
+        if span is None:
+            continue
+        draft = draft[: span[0]] + replace + draft[span[1] :]
+        applied += 1
+    return draft, applied
@@ -0,0 +1,178 @@
+"""Deterministic stand-ins for the chat model and search providers.
+
+Used by the benchmark suite and tests to run the full workflow offline. The fake
+model recognizes each node by its system prompt and returns well-formed output
+of a configurable size after a configurable delay; the fake search provider
+returns Serper-shaped results. `offline()` swaps both into the registries the
+nodes read from and restores the originals on exit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import Counter
+from contextlib import contextmanager
+from itertools import cycle, islice
+from typing import Any, Iterator
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from writer_agent import model_registry, tools
+from writer_agent.search_executor import SearchFn
+from writer_agent.utils import current_node, estimate_tokens, get_message_text
+
+# Simulated provider prefix cache: 128-token increments, 1024-token minimum.
+_PREFIX_CHUNK_CHARS = 512
+_MIN_CACHED_TOKENS = 1024
+
+_WORDS = (
+    "the workflow drafts each section from research notes and keeps the reader "
+    "focused on practical examples with clear structure and concise language"
+).split()
+
+
+def filler_text(tokens: int, seed: str = "") -> str:
+    """Return deterministic prose of roughly `tokens` tokens; `seed` varies the wording."""
+    words = islice(cycle(_WORDS), sum(map(ord, seed)) % len(_WORDS), None)
+    return " ".join(islice(words, max(1, tokens)))[: max(4, tokens * 4)]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers each workflow prompt with canned output.
+
+    Prompt tokens received and calls made are counted per calling node. Prompt
+    prefixes are cached the way OpenAI does automatically: once at least 1024
+    tokens match the start of an earlier prompt, the match (in 128-token
+    increments) is reported as cached input tokens.
+    """
+
+    latency: float = 0.0
+    output_tokens: int = 200
+    plan_steps: int = 3
+    critic_verdict: str = "Approve"
+    prompt_tokens: Counter[str] = Field(default_factory=Counter)
+    cached_tokens: Counter[str] = Field(default_factory=Counter)
+    calls: Counter[str] = Field(default_factory=Counter)
+    seen_prefixes: set[str] = Field(default_factory=set)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _cached_prefix_tokens(self, text: str) -> int:
+        """Return the tokens of `text` served from the simulated prefix cache."""
+        digest = hashlib.sha256()
+        cached_chars = 0
+        for start in range(0, len(text) - _PREFIX_CHUNK_CHARS + 1, _PREFIX_CHUNK_CHARS):
+            digest.update(text[start : start + _PREFIX_CHUNK_CHARS].encode())
+            key = digest.hexdigest()
+            if key in self.seen_prefixes:
+                cached_chars = start + _PREFIX_CHUNK_CHARS
+            self.seen_prefixes.add(key)
+        cached = cached_chars // 4
+        return cached if cached >= _MIN_CACHED_TOKENS else 0
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        node = current_node() or "unknown"
+        texts = [get_message_text(m) for m in messages]
+        prompt = sum(estimate_tokens(text) for text in texts)
+        cached = self._cached_prefix_tokens("\n".join(texts))
+        self.prompt_tokens[node] += prompt
+        self.cached_tokens[node] += cached
+        self.calls[node] += 1
+
+        system = texts[0]
+        last = texts[-1]
+        if "orchestrator" in system:
+            text = "no"
+        elif "research analyst" in system:
+            text = "\n".join(f"{last[:40]} aspect {i}" for i in range(1, 4))
+        elif "content strategist" in system:
+            text = "\n".join(
+                f"STEP {i}: Section {i}\n- Key points\n- Approach"
+                for i in range(1, self.plan_steps + 1)
+            )
+        elif "critical editor" in system:
+            text = f"1. Clear.\n2. Fine.\n3. None.\n4. {self.critic_verdict}"
+        elif "SEARCH" in system:
+            # Revision: rewrite the opening words of the draft as one targeted edit.
+            draft = last.partition("Current Draft:\n")[2]
+            search = " ".join(draft.split()[:6])
+            replace = filler_text(self.output_tokens // 10, seed=last)
+            text = (
+                f"<<<<<<< SEARCH\n{search}\n=======\n{replace}\n>>>>>>> REPLACE"
+                if search
+                else "NO EDITS"
+            )
+        else:
+            text = filler_text(self.output_tokens, seed=last)
+        output = estimate_tokens(text)
+        return AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": prompt,
+                "output_tokens": output,
+                "total_tokens": prompt + output,
+                "input_token_details": {"cache_read": cached},
+            },
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+
+def fake_search_provider(
+    latency: float = 0.0, results: int = 5, snippet_tokens: int = 50
+) -> SearchFn:
+    """Return a search function producing `results` Serper-style hits per query."""
+
+    async def search(query: str) -> dict[str, Any]:
+        if latency:
+            await asyncio.sleep(latency)
+        slug = "-".join(query.lower().split())
+        return {
+            "organic": [
+                {
+                    "title": f"{query} ({i})",
+                    "link": f"https://example.com/{slug}/{i}",
+                    "snippet": filler_text(snippet_tokens, seed=f"{query}{i}"),
+                }
+                for i in range(results)
+            ]
+        }
+
+    return search
+
+
+@contextmanager
+def offline(model: BaseChatModel, search: SearchFn) -> Iterator[None]:
+    """Serve every chat model and search provider from the given fakes."""
+    original_providers = dict(tools.SEARCH_PROVIDERS)
+    for name in original_providers:
+        tools.SEARCH_PROVIDERS[name] = search
+    try:
+        with model_registry.MODEL_REGISTRY.use_loader(lambda name, **kwargs: model):
+            yield
+    finally:
+        tools.SEARCH_PROVIDERS.update(original_providers)
@@ -0,0 +1,160 @@
+"""Section-parallel polishing of the approved draft.
+
+The final polish works per plan section instead of on the whole article in one
+call. Sections are polished concurrently, at most `Context.polish_concurrency`
+at a time, so wall time tracks the slowest section rather than the article's
+length and no single response risks hitting the output limit. A light seam
+pass then smooths the transitions between neighbouring sections with targeted
+edits. When the final review asks for changes, only the sections the feedback
+points at are polished again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Sequence
+
+from writer_agent.context import Context
+from writer_agent.draft_revisions import EDIT_FORMAT, apply_edits, parse_edits
+from writer_agent.instrumentation import set_queue_time
+from writer_agent.llm import invoke_model
+
+# Characters on each side of a section boundary shown to the seam pass.
+SEAM_CHARS = 400
+
+_SECTION_REFERENCE = re.compile(
+    r"\b(?:sections?|steps?|parts?)\s+((?:\d+\s*(?:,|and|&|or)?\s*)+)"
+)
+_STEP_PREFIX = re.compile(r"^\s*STEP\s+\d+\s*[:.-]?\s*", re.IGNORECASE)
+
+
+def section_title(plan_step: str) -> str:
+    """Return a plan step's title without its "STEP n:" prefix."""
+    return _STEP_PREFIX.sub("", plan_step).strip()
+
+
+def affected_sections(feedback: str, titles: Sequence[str]) -> list[int]:
+    """Return the indexes of the sections `feedback` refers to.
+
+    Sections are matched by number ("section 2", "steps 3 and 4"), by title,
+    or as the introduction/conclusion; feedback naming none of them applies to
+    every section.
+    """
+    lowered = feedback.lower()
+    count = len(titles)
+    indexes = {
+        int(n) - 1
+        for refs in _SECTION_REFERENCE.findall(lowered)
+        for n in re.findall(r"\d+", refs)
+    }
+    indexes |= {
+        i for i, title in enumerate(titles) if title and title.lower() in lowered
+    }
+    if re.search(r"\b(intro|introduction|opening)\b", lowered):
+        indexes.add(0)
+    if re.search(r"\b(conclusion|ending|closing|outro)\b", lowered):
+        indexes.add(count - 1)
+    matched = sorted(i for i in indexes if 0 <= i < count)
+    return matched or list(range(count))
+
+
+async def polish_section(
+    text: str, title: str, index: int, count: int, context: Context, feedback: str = ""
+) -> str:
+    """Polish one section, streaming it to the client under its step index."""
+    system_prompt = """You are a final editor. Polish one section of an approved article:
+1. Fix any remaining issues
+2. Enhance clarity and flow
+3. Ensure professional formatting
+4. Add finishing touches
+
+Return only the polished section."""
+
+    user_prompt = f"""Section {index + 1} of {count}: {title}
+
+Approved section to finalize:
+
+{text}"""
+    if feedback:
+        user_prompt += f"""
+
+Reviewer feedback to address:
+{feedback}"""
+
+    response = await invoke_model(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        context,
+        node="final_drafter",
+        step=index,
+        stream=True,
+    )
+    return str(response.content)
+
+
+async def polish_sections(
+    sections: Sequence[str],
+    titles: Sequence[str],
+    context: Context,
+    indexes: Sequence[int] | None = None,
+    feedback: str = "",
+) -> list[str]:
+    """Polish the sections at `indexes` (default: all) concurrently.
+
+    Returns every section, with the polished ones replaced.
+    """
+    indexes = range(len(sections)) if indexes is None else indexes
+    semaphore = asyncio.Semaphore(max(1, context.polish_concurrency))
+
+    async def polish(index: int) -> str:
+        queued = time.perf_counter()
+        async with semaphore:
+            set_queue_time((time.perf_counter() - queued) * 1000)
+            title = titles[index] if index < len(titles) else f"Section {index + 1}"
+            return await polish_section(
+                sections[index], title, index, len(sections), context, feedback
+            )
+
+    polished = list(sections)
+    results = await asyncio.gather(*(polish(i) for i in indexes))
+    for index, text in zip(indexes, results):
+        polished[index] = text
+    return polished
+
+
+async def smooth_seams(sections: Sequence[str], context: Context) -> str:
+    """Join polished sections, smoothing the transitions between them with small edits."""
+    article = "\n\n".join(sections)
+    if len(sections) < 2:
+        return article
+
+    seams = "\n\n".join(
+        f"Seam {i} (end of section {i}, then start of section {i + 1}):\n"
+        f"...{sections[i - 1][-SEAM_CHARS:]}\n\n{sections[i][:SEAM_CHARS]}..."
+        for i in range(1, len(sections))
+    )
+    system_prompt = f"""You are a final editor. The sections of an article were polished separately.
+Check each seam between consecutive sections for abrupt transitions, repeated
+introductions or inconsistent terminology, and fix them with minimal edits.
+
+Reply ONLY with edit blocks in this format, one per change:
+
+{EDIT_FORMAT}
+
+Each SEARCH must copy a short, unique passage of a seam exactly. If every seam
+reads well, reply with NO EDITS."""
+
+    response = await invoke_model(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": seams},
+        ],
+        context,
+        node="final_drafter",
+    )
+    smoothed, _ = apply_edits(article, parse_edits(str(response.content)))
+    return smoothed
@@ -0,0 +1,119 @@
+"""Shared, long-lived HTTP clients for the search tools.
+
+Search calls reuse one `httpx.AsyncClient` with keep-alive (and HTTP/2 when the
+`h2` package is installed) instead of opening a new client per query, so DNS,
+TCP and TLS setup are paid once per connection rather than once per search. Pool
+limits come from `Context`; contexts with different limits get their own client,
+so no client is closed while another run may still be using it. In-flight usage
+is tracked so the pool can be sized from `stats()`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Tuple
+
+from writer_agent.context import Context
+
+if TYPE_CHECKING:
+    import httpx
+
+# Client settings taken from Context: limits, keep-alive, HTTP/2 and timeout.
+_ClientKey = Tuple[int, int, float, bool, float]
+
+
+class SearchClientPool:
+    """Lifecycle manager for the shared search HTTP clients."""
+
+    def __init__(self) -> None:
+        """Create an empty pool; clients are built on first use."""
+        self._clients: dict[_ClientKey, httpx.AsyncClient] = {}
+        self._limits: httpx.Limits | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.saturated_requests = 0
+
+    async def get_client(self, context: Context) -> httpx.AsyncClient:
+        """Return the shared client for the pool settings in `context`."""
+        import httpx
+
+        key = (
+            context.http_max_connections,
+            context.http_max_keepalive_connections,
+            context.http_keepalive_expiry,
+            context.http2,
+            context.search_timeout,
+        )
+        limits = httpx.Limits(
+            max_connections=context.http_max_connections,
+            max_keepalive_connections=context.http_max_keepalive_connections,
+            keepalive_expiry=context.http_keepalive_expiry,
+        )
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Clients are bound to the loop that created them.
+            self._clients, self._loop = {}, loop
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._clients[key] = httpx.AsyncClient(
+                http2=context.http2 and importlib.util.find_spec("h2") is not None,
+                limits=limits,
+                timeout=httpx.Timeout(context.search_timeout),
+            )
+        self._limits = limits
+        return client
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Track one request against the pool for saturation reporting."""
+        self.requests += 1
+        if self._limits is not None and self.in_flight >= (
+            self._limits.max_connections or 0
+        ):
+            self.saturated_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Return pool usage counters.
+
+        `saturated_requests` counts requests issued while every connection was
+        already busy, i.e. requests that had to queue for a connection.
+        """
+        max_connections = self._limits.max_connections if self._limits else None
+        return {
+            "max_connections": max_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "requests": self.requests,
+            "saturated_requests": self.saturated_requests,
+            "peak_utilization": (
+                self.peak_in_flight / max_connections if max_connections else None
+            ),
+        }
+
+    async def aclose(self) -> None:
+        """Close the shared clients and their connections."""
+        clients, self._clients, self._limits = list(self._clients.values()), {}, None
+        for client in clients:
+            await client.aclose()
+
+
+SEARCH_CLIENTS = SearchClientPool()
+
+
+@asynccontextmanager
+async def lifespan(app: object) -> AsyncIterator[None]:
+    """ASGI lifespan that closes the shared search client on server shutdown."""
+    try:
+        yield
+    finally:
+        await SEARCH_CLIENTS.aclose()
@@ -0,0 +1,428 @@
+"""Latency, token and cost instrumentation for nodes, LLM calls and searches.
+
+Every node execution, model call and search-provider call produces a `Span`
+with its wall time, queue time, token usage (including provider-side cached
+tokens), estimated cost, retries and search-cache outcome. Spans are
+aggregated per thread, per plan step and per node (see
+`Instrumentation.summary`) and exported to the sinks named in
+`Context.metrics_sinks`:
+
+- ``json``: one JSON object per span, to `Context.metrics_log_path` or the
+  ``writer_agent.metrics`` logger.
+- ``prometheus``: counters rendered in the Prometheus text format, served by
+  the ``/metrics`` route of the web app.
+- ``otel``: OpenTelemetry spans via the globally configured tracer provider
+  (requires the 'otel' extra).
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, defaultdict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, TypedDict
+
+from langgraph.errors import GraphInterrupt
+
+from writer_agent.context import Context
+from writer_agent.utils import current_run_id
+
+logger = logging.getLogger("writer_agent.metrics")
+
+# USD per million tokens: (input, cached input, output).
+DEFAULT_PRICES: dict[str, tuple[float, float, float]] = {
+    "openai/gpt-4o": (2.50, 1.25, 10.00),
+    "openai/gpt-4o-mini": (0.15, 0.075, 0.60),
+    "openai/gpt-4.1": (2.00, 0.50, 8.00),
+    "openai/gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "anthropic/claude-3-5-sonnet-latest": (3.00, 0.30, 15.00),
+    "anthropic/claude-3-5-haiku-latest": (0.80, 0.08, 4.00),
+}
+
+
+class Span(TypedDict, total=False):
+    """One timed unit of work."""
+
+    kind: str  # "node", "llm" or "search"
+    name: str  # node name, model name or search provider
+    node: str | None
+    thread_id: str
+    step: int | None
+    model: str | None
+    status: str  # "ok", "error", "interrupted" or "cancelled"
+    wall_ms: float
+    queue_ms: float
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    cost_usd: float
+    retries: int
+    hedges: int  # backup models started (see model_fallback)
+    cache: str | None  # search/LLM cache outcome: "hit", "stale", "miss"
+    ended_at: float
+
+
+# Time the current task spent waiting for a concurrency slot before its call.
+# The variable holds a mutable cell rather than the value: tasks spawned after
+# `set_queue_time` (e.g. a hedged request to a second provider) copy the
+# context and share the cell, so the wait is taken, and counted, only once.
+_QUEUE_MS: ContextVar[list[float] | None] = ContextVar(
+    "writer_agent_queue_ms", default=None
+)
+
+
+def set_queue_time(ms: float) -> None:
+    """Record how long the current task waited before making its call."""
+    _QUEUE_MS.set([ms])
+
+
+def take_queue_time() -> float:
+    """Return and reset the queue time recorded for the current task.
+
+    Only the first call after `set_queue_time`, in this task or any task it
+    spawned since, gets the recorded time; later calls get 0.
+    """
+    cell = _QUEUE_MS.get()
+    if cell is None:
+        return 0.0
+    ms, cell[0] = cell[0], 0.0
+    return ms
+
+
+def parse_prices(spec: str) -> dict[str, tuple[float, float, float]]:
+    """Parse "provider/model=input:output[:cached],..." prices (USD per 1M tokens)."""
+    prices = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, values = item.split("=", 1)
+            parts = [float(v) for v in values.split(":")]
+            cached = parts[2] if len(parts) > 2 else parts[0]
+            prices[name.strip()] = (parts[0], cached, parts[1])
+    return prices
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int,
+    context: Context,
+) -> float:
+    """Estimate the USD cost of one call; unknown models cost 0."""
+    prices = {**DEFAULT_PRICES, **parse_prices(context.model_prices)}
+    if model not in prices:
+        return 0.0
+    input_price, cached_price, output_price = prices[model]
+    uncached = max(0, input_tokens - cached_tokens)
+    return (
+        uncached * input_price
+        + cached_tokens * cached_price
+        + output_tokens * output_price
+    ) / 1_000_000
+
+
+def usage_from_message(message: Any) -> tuple[int, int, int]:
+    """Return (input, output, cached input) tokens reported on an AIMessage."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return (
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        details.get("cache_read", 0) or 0,
+    )
+
+
+# -- Sinks -------------------------------------------------------------------
+
+
+class MetricsSink(ABC):
+    """Destination for finished spans."""
+
+    @abstractmethod
+    def emit(self, span: Span) -> None:
+        """Export one span."""
+
+
+class JsonLogSink(MetricsSink):
+    """Write each span as a JSON line to a file, or to the metrics logger."""
+
+    def __init__(self, path: str = "") -> None:
+        """Log to `path`, or to the ``writer_agent.metrics`` logger if empty."""
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        """Write the span as one JSON line."""
+        line = json.dumps(span, default=str)
+        if not self.path:
+            logger.info(line)
+            return
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class PrometheusSink(MetricsSink):
+    """Accumulate counters and render them in the Prometheus text format."""
+
+    _HELP = {
+        "writer_agent_calls_total": "Completed nodes, LLM calls and searches.",
+        "writer_agent_wall_seconds_total": "Wall time spent in nodes, LLM calls and searches.",
+        "writer_agent_queue_seconds_total": "Time spent waiting for a concurrency slot.",
+        "writer_agent_tokens_total": "LLM tokens by type (input, output, cached).",
+        "writer_agent_cost_usd_total": "Estimated LLM cost in USD.",
+        "writer_agent_retries_total": "Retried calls.",
+        "writer_agent_cache_total": "Search and LLM cache lookups by outcome.",
+    }
+
+    def __init__(self) -> None:
+        """Create an empty set of counters."""
+        self._values: defaultdict[tuple[str, tuple[tuple[str, str], ...]], float] = (
+            defaultdict(float)
+        )
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        """Add the span to the counters."""
+        labels = {
+            "kind": span["kind"],
+            "name": span["name"],
+            "node": span.get("node") or "",
+        }
+        updates: list[tuple[str, dict[str, str], float]] = [
+            (
+                "writer_agent_calls_total",
+                {**labels, "status": span.get("status", "ok")},
+                1,
+            ),
+            (
+                "writer_agent_wall_seconds_total",
+                labels,
+                span.get("wall_ms", 0.0) / 1000,
+            ),
+            (
+                "writer_agent_queue_seconds_total",
+                labels,
+                span.get("queue_ms", 0.0) / 1000,
+            ),
+            ("writer_agent_cost_usd_total", labels, span.get("cost_usd", 0.0)),
+            ("writer_agent_retries_total", labels, span.get("retries", 0)),
+        ]
+        for token_type, count in (
+            ("input", span.get("input_tokens", 0)),
+            ("output", span.get("output_tokens", 0)),
+            ("cached", span.get("cached_tokens", 0)),
+        ):
+            if count:
+                updates.append(
+                    ("writer_agent_tokens_total", {**labels, "type": token_type}, count)
+                )
+        if span.get("cache"):
+            updates.append(
+                ("writer_agent_cache_total", {**labels, "result": span["cache"]}, 1)
+            )
+        with self._lock:
+            for metric, metric_labels, value in updates:
+                self._values[(metric, tuple(sorted(metric_labels.items())))] += value
+
+    def render(self) -> str:
+        """Return all counters in the Prometheus exposition format."""
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = []
+        current = None
+        for (metric, labels), value in items:
+            if metric != current:
+                lines += [
+                    f"# HELP {metric} {self._HELP[metric]}",
+                    f"# TYPE {metric} counter",
+                ]
+                current = metric
+            rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            lines.append(f"{metric}{{{rendered}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class OpenTelemetrySink(MetricsSink):
+    """Export spans to the globally configured OpenTelemetry tracer provider."""
+
+    def __init__(self) -> None:
+        """Create a tracer (requires opentelemetry-api, the 'otel' extra)."""
+        from opentelemetry import trace
+
+        self._tracer = trace.get_tracer("writer_agent")
+
+    def emit(self, span: Span) -> None:
+        """Record the span with its original start and end times."""
+        end = int(span.get("ended_at", time.time()) * 1e9)
+        start = end - int(span.get("wall_ms", 0.0) * 1e6)
+        attributes = {
+            f"writer_agent.{k}": v
+            for k, v in span.items()
+            if isinstance(v, (str, int, float, bool)) and k != "ended_at"
+        }
+        otel_span = self._tracer.start_span(
+            f"{span['kind']} {span['name']}", start_time=start, attributes=attributes
+        )
+        otel_span.end(end_time=end)
+
+
+PROMETHEUS = PrometheusSink()
+
+METRICS_SINKS: dict[str, Callable[[Context], MetricsSink]] = {
+    "json": lambda context: JsonLogSink(context.metrics_log_path),
+    "prometheus": lambda context: PROMETHEUS,
+    "otel": lambda context: OpenTelemetrySink(),
+}
+
+_SINKS: dict[tuple[str, str], list[MetricsSink]] = {}
+
+
+def get_sinks(context: Context) -> list[MetricsSink]:
+    """Return the sinks configured in `context`, building them once."""
+    key = (context.metrics_sinks, context.metrics_log_path)
+    if key not in _SINKS:
+        names = [n.strip() for n in context.metrics_sinks.split(",") if n.strip()]
+        _SINKS[key] = [METRICS_SINKS[name](context) for name in names]
+    return _SINKS[key]
+
+
+# -- Aggregation -------------------------------------------------------------
+
+
+def _totals(span: Span) -> Counter[str]:
+    """Flatten a span into additive totals, prefixing time and call counts by kind."""
+    kind = span["kind"]
+    totals: Counter[str] = Counter(
+        {
+            f"{kind}_calls": 1,
+            f"{kind}_wall_ms": span.get("wall_ms", 0.0),
+            f"{kind}_queue_ms": span.get("queue_ms", 0.0),
+            "input_tokens": span.get("input_tokens", 0),
+            "output_tokens": span.get("output_tokens", 0),
+            "cached_tokens": span.get("cached_tokens", 0),
+            "cost_usd": span.get("cost_usd", 0.0),
+            "retries": span.get("retries", 0),
+            "hedges": span.get("hedges", 0),
+        }
+    )
+    if span.get("cache"):
+        totals[f"{kind}_cache_{span['cache']}"] += 1
+    if span.get("status", "ok") == "error":
+        totals[f"{kind}_errors"] += 1
+    return totals
+
+
+class Instrumentation:
+    """Collects spans, aggregates them per thread, and forwards them to sinks."""
+
+    def __init__(self, max_threads: int = 1000) -> None:
+        """Keep aggregates for at most `max_threads` recently active threads."""
+        self.max_threads = max_threads
+        self._threads: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, span: Span, context: Context | None = None) -> None:
+        """Aggregate a finished span and export it to the configured sinks."""
+        span.setdefault("thread_id", current_run_id())
+        span.setdefault("ended_at", time.time())
+        totals = _totals(span)
+        with self._lock:
+            thread = self._threads.get(span["thread_id"])
+            if thread is None:
+                thread = {"total": Counter(), "steps": {}, "nodes": {}, "models": {}}
+                self._threads[span["thread_id"]] = thread
+                while len(self._threads) > self.max_threads:
+                    self._threads.popitem(last=False)
+            self._threads.move_to_end(span["thread_id"])
+            thread["total"].update(totals)
+            if span.get("step") is not None:
+                thread["steps"].setdefault(span["step"], Counter()).update(totals)
+            if span.get("node"):
+                thread["nodes"].setdefault(span["node"], Counter()).update(totals)
+            if span.get("model"):
+                thread["models"].setdefault(span["model"], Counter()).update(totals)
+        if context is not None:
+            for sink in get_sinks(context):
+                try:
+                    sink.emit(span)
+                except Exception:
+                    logger.exception("Metrics sink %s failed", type(sink).__name__)
+
+    def summary(self, thread_id: str | None = None) -> dict[str, Any]:
+        """Return totals for a thread (or the current one), with per-step, per-node and per-model breakdowns."""
+        with self._lock:
+            thread = self._threads.get(thread_id or current_run_id())
+            if thread is None:
+                return {"total": {}, "steps": {}, "nodes": {}, "models": {}}
+            return {
+                "total": _rounded(thread["total"]),
+                "steps": {s: _rounded(c) for s, c in sorted(thread["steps"].items())},
+                "nodes": {n: _rounded(c) for n, c in sorted(thread["nodes"].items())},
+                "models": {m: _rounded(c) for m, c in sorted(thread["models"].items())},
+            }
+
+    def clear(self) -> None:
+        """Drop all aggregates."""
+        with self._lock:
+            self._threads.clear()
+
+
+def _rounded(totals: Counter[str]) -> dict[str, float | int]:
+    return {
+        k: round(v, 6)
+        if k == "cost_usd"
+        else round(v, 1)
+        if isinstance(v, float)
+        else v
+        for k, v in sorted(totals.items())
+    }
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+def instrument_node(
+    name: str, node: Callable[..., Awaitable[Any]]
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a graph node so each execution is recorded as a "node" span.
+
+    Executions that stop at an interrupt() are recorded as "interrupted".
+    """
+
+    @functools.wraps(node)
+    async def wrapper(state: Any, runtime: Any) -> Any:
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            return await node(state, runtime)
+        except GraphInterrupt:
+            status = "interrupted"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            INSTRUMENTATION.record(
+                Span(
+                    kind="node",
+                    name=name,
+                    node=name,
+                    step=state.get("current_step_index")
+                    if state.get("plan_steps")
+                    else None,
+                    status=status,
+                    wall_ms=(time.perf_counter() - start) * 1000,
+                ),
+                runtime.context,
+            )
+
+    return wrapper
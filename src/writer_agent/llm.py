@@ -0,0 +1,255 @@
+"""Single entry point for LLM calls made by the workflow nodes.
+
+Nodes describe *what* to ask (messages, node name, plan step); this module
+decides *how*: which model and generation settings the node is assigned,
+which shared model client to use, whether the response can be
+served from the response cache, when the provider quota allows the call, which
+model in the node's fallback chain serves it, how the prompt's cache
+breakpoints are expressed for that model's provider, and whether tokens are
+streamed to the client. Every call is recorded as an "llm" span with its
+latency, tokens (including provider-cached input tokens) and cost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Sequence, cast
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+
+from writer_agent.context import Context
+from writer_agent.instrumentation import (
+    INSTRUMENTATION,
+    Span,
+    estimate_cost,
+    take_queue_time,
+    usage_from_message,
+)
+from writer_agent.llm_cache import cache_key, get_llm_cache
+from writer_agent.model_fallback import (
+    LATENCIES,
+    Claim,
+    hedge_delay,
+    hedged_call,
+    model_chain,
+)
+from writer_agent.model_registry import get_chat_model
+from writer_agent.model_tiers import node_model
+from writer_agent.prompt_layout import content_text, for_provider
+from writer_agent.rate_limiter import (
+    GOVERNOR,
+    RateLimiter,
+    error_headers,
+    is_rate_limit_error,
+    priority_for,
+)
+from writer_agent.streaming import replay_response, stream_response
+from writer_agent.utils import estimate_tokens
+
+# Output tokens reserved against a tokens-per-minute quota before the real usage is
+# known, for nodes without a max_tokens setting.
+OUTPUT_TOKEN_RESERVE = 512
+
+
+async def invoke_model(
+    messages: Sequence[Any],
+    context: Context,
+    *,
+    node: str,
+    step: int | None = None,
+    stream: bool = False,
+) -> AIMessage:
+    """Call the configured chat model for `node` and return its response.
+
+    Args:
+        messages: The prompt, as message dicts, tuples or message objects.
+        context: The run context holding model and cache settings.
+        node: Name of the calling node, used for cache flags and stream events.
+        step: Plan step index the call belongs to, if any.
+        stream: Stream tokens to the client through the custom stream channel.
+    """
+    model_name, settings = node_model(node, context)
+    span = Span(
+        kind="llm",
+        name=model_name,
+        node=node,
+        step=step,
+        model=model_name,
+        queue_ms=take_queue_time(),
+        status="error",
+    )
+    start = time.perf_counter()
+    try:
+        response = await _call_model(
+            messages,
+            context,
+            model_name,
+            settings,
+            span,
+            node=node,
+            step=step,
+            stream=stream,
+        )
+        span["status"] = "ok"
+        return response
+    finally:
+        span["wall_ms"] = (time.perf_counter() - start) * 1000
+        INSTRUMENTATION.record(span, context)
+
+
+async def _call_model(
+    messages: Sequence[Any],
+    context: Context,
+    model_name: str,
+    settings: dict[str, Any],
+    span: Span,
+    *,
+    node: str,
+    step: int | None,
+    stream: bool,
+) -> AIMessage:
+    cache = get_llm_cache(context, node)
+    key = cache_key(model_name, settings, messages) if cache else ""
+    if cache:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            span["cache"] = "hit"
+            cached.response_metadata["llm_cache"] = "hit"
+            if stream:
+                replay_response(cached, node=node, step=step)
+            return cast(AIMessage, cached)
+        span["cache"] = "miss"
+
+    async def attempt(name: str, claim: Claim | None) -> AIMessage:
+        started = time.perf_counter()
+        limiter = GOVERNOR.limiter_for(name, context)
+        prompt = for_provider(messages, name)
+        if limiter is None:
+            model = get_chat_model(name, **settings)
+            response = await _generate(
+                model, prompt, node=node, step=step, stream=stream, claim=claim
+            )
+        else:
+            response = await _generate_limited(
+                limiter,
+                name,
+                settings,
+                prompt,
+                context,
+                span,
+                node=node,
+                step=step,
+                stream=stream,
+                claim=claim,
+            )
+        latency = response.response_metadata.get("ttft_ms", 0) / 1000 if stream else 0
+        LATENCIES.record((name, node, stream), latency or time.perf_counter() - started)
+        return response
+
+    chain = model_chain(model_name, node, context)
+    if len(chain) == 1:
+        served, response = model_name, await attempt(model_name, None)
+    else:
+        served, response, span["hedges"] = await hedged_call(
+            chain, attempt, lambda name: hedge_delay(name, node, stream, context)
+        )
+    response.response_metadata["served_model"] = served
+
+    input_tokens, output_tokens, cached_tokens = usage_from_message(response)
+    span.update(
+        Span(
+            name=served,
+            model=served,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            cost_usd=estimate_cost(
+                served, input_tokens, output_tokens, cached_tokens, context
+            ),
+        )
+    )
+    if cache:
+        await asyncio.to_thread(cache.put, key, node, response)
+    return response
+
+
+async def _generate(
+    model: BaseChatModel,
+    messages: Sequence[Any],
+    *,
+    node: str,
+    step: int | None,
+    stream: bool,
+    claim: Claim | None = None,
+) -> AIMessage:
+    if stream:
+        return await stream_response(
+            model, messages, node=node, step=step, on_first_token=claim
+        )
+    return cast(AIMessage, await model.ainvoke(list(messages)))
+
+
+def _prompt_tokens(messages: Sequence[Any]) -> int:
+    total = 0
+    for message in messages:
+        if isinstance(message, dict):
+            content = message.get("content", "")
+        elif isinstance(message, tuple):
+            content = message[1]
+        else:
+            content = getattr(message, "content", "")
+        total += estimate_tokens(content_text(content))
+    return total
+
+
+async def _generate_limited(
+    limiter: RateLimiter,
+    model_name: str,
+    settings: dict[str, Any],
+    messages: Sequence[Any],
+    context: Context,
+    span: Span,
+    *,
+    node: str,
+    step: int | None,
+    stream: bool,
+    claim: Claim | None = None,
+) -> AIMessage:
+    """Generate under the provider quota, retrying rate-limit errors with backoff.
+
+    The provider client's own retries are disabled so 429s reach the limiter.
+    OpenAI models also return their rate-limit headers, which are consumed here
+    and dropped so they never reach the state, checkpoints or the LLM cache.
+    """
+    settings = {**settings, "max_retries": 0}
+    if model_name.startswith("openai/"):
+        settings["include_response_headers"] = True
+    model = get_chat_model(model_name, **settings)
+    reserved = _prompt_tokens(messages) + settings.get(
+        "max_tokens", OUTPUT_TOKEN_RESERVE
+    )
+    priority = priority_for(node, context)
+    for attempt in range(context.rate_limit_max_retries + 1):
+        waited = await limiter.acquire(reserved, priority)
+        span["queue_ms"] = span.get("queue_ms", 0.0) + waited * 1000
+        try:
+            response = await _generate(
+                model, messages, node=node, step=step, stream=stream, claim=claim
+            )
+        except Exception as e:
+            limiter.release(reserved, reserved)
+            if not is_rate_limit_error(e) or attempt == context.rate_limit_max_retries:
+                raise
+            await asyncio.sleep(limiter.on_rate_limited(error_headers(e), attempt))
+            span["retries"] = attempt + 1
+            continue
+        except BaseException:
+            limiter.release(reserved, 0)
+            raise
+        input_tokens, output_tokens, _ = usage_from_message(response)
+        used = input_tokens + output_tokens or reserved
+        limiter.release(reserved, used, response.response_metadata.pop("headers", None))
+        return response
+    raise AssertionError("unreachable")
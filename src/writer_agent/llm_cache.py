@@ -0,0 +1,133 @@
+"""Content-addressed cache of LLM responses.
+
+Responses are stored in SQLite keyed by a hash of the model name, generation
+settings and the exact messages sent, so replaying a thread from a checkpoint,
+retrying after a crash or re-running for QA returns identical calls instantly.
+The cache is opt-in per node (`Context.llm_cache_nodes`) and evicts the least
+recently used responses once it grows past a byte limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Sequence
+
+from langchain_core.messages import (
+    AIMessage,
+    convert_to_messages,
+    message_to_dict,
+    messages_from_dict,
+)
+
+from writer_agent.context import Context
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    node TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+def cache_key(model: str, settings: dict[str, Any], messages: Sequence[Any]) -> str:
+    """Hash the model, its settings and the messages into a cache key."""
+    material = {
+        "model": model,
+        "settings": settings,
+        "messages": [message_to_dict(m) for m in convert_to_messages(messages)],
+    }
+    encoded = json.dumps(material, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache with size-based LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        """Open (or create) the cache database at `path`."""
+        self.path = path
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> AIMessage | None:
+        """Return the cached response for `key`, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return messages_from_dict([json.loads(row[0])])[0]
+
+    def put(self, key: str, node: str, message: AIMessage) -> None:
+        """Store a response, then evict least recently used ones over the byte limit."""
+        payload = json.dumps(message_to_dict(message), default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                (key, node, payload, len(payload), time.time()),
+            )
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY accessed_at"
+                ).fetchall()
+                stale = []
+                for old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((old_key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+            self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the stored byte total."""
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "bytes": size}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_CACHES: dict[str, LLMCache] = {}
+
+
+def get_llm_cache(context: Context, node: str) -> LLMCache | None:
+    """Return the response cache if it is enabled for `node`, else None."""
+    nodes = {n.strip() for n in context.llm_cache_nodes.split(",") if n.strip()}
+    if not context.llm_cache_path or not (node in nodes or "*" in nodes):
+        return None
+    if context.llm_cache_path not in _CACHES:
+        _CACHES[context.llm_cache_path] = LLMCache(
+            context.llm_cache_path, max_bytes=context.llm_cache_max_bytes
+        )
+    return _CACHES[context.llm_cache_path]
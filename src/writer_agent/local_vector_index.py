@@ -0,0 +1,362 @@
+"""Memory-mapped, in-process vector index for saved article chunks.
+
+An alternative to Pinecone for staging and air-gapped deployments. Vectors are
+L2-normalized float32 rows appended to a flat file and read through `np.memmap`,
+so the OS page cache holds the corpus instead of the Python heap; metadata lives
+in a JSONL sidecar and only the top-k rows are read back per query. Queries are a blocked matrix-vector product with
+`argpartition` top-k. For large corpora an IVF mode clusters rows around k-means
+centroids and only scans the `nprobe` closest lists.
+
+Layout of an index directory::
+
+    manifest.json     {"dimension": d, "count": n}
+    vectors.f32       n x d float32, row-major, normalized
+    metadata.jsonl    one {"row", "id", "metadata"} object per write (last wins)
+    centroids.f32     nlist x d float32 (IVF mode only)
+    assignments.i32   n int32 list ids (IVF mode only)
+
+The manifest is written last, so it is the commit point of an upsert: rows past
+`count` left by a crash are truncated on open. The metadata log is compacted
+once superseded lines outnumber live ones.
+
+Requires numpy (the 'local' extra).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from array import array
+from typing import Any, Sequence
+
+import numpy as np
+
+from writer_agent.vector_store import VectorMatch, VectorRecord, VectorStore
+
+_BLOCK_ROWS = 65_536
+# Superseded metadata lines tolerated before the log is compacted.
+_COMPACT_MIN_DEAD = 1024
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _entry(row: int, record: VectorRecord) -> bytes:
+    line = json.dumps({"row": row, "id": record["id"], "metadata": record["metadata"]})
+    return (line + "\n").encode()
+
+
+class LocalVectorIndex(VectorStore):
+    """Append-only flat index with optional IVF acceleration."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        mode: str = "exact",
+        nlist: int = 256,
+        nprobe: int = 8,
+    ) -> None:
+        """Open (or create) the index stored in directory `path`."""
+        if mode not in ("exact", "ivf"):
+            raise ValueError(f"Unknown local index mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+
+        manifest = self._read_json("manifest.json") or {}
+        self.dimension: int | None = manifest.get("dimension")
+        self.count: int = manifest.get("count", 0)
+        self._rows: dict[str, int] = {}
+        # Byte offset of each row's latest line in metadata.jsonl (-1: none).
+        self._offsets = array("q", [-1]) * self.count
+        self._log_lines = 0
+        meta_path = self._file("metadata.jsonl")
+        if os.path.exists(meta_path):
+            with open(meta_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    entry = json.loads(line)
+                    row = entry["row"]
+                    if row < self.count:
+                        self._offsets[row] = offset
+                        self._rows[entry["id"]] = row
+                    offset += len(line)
+                    self._log_lines += 1
+        self._vectors: np.ndarray | None = None
+        self._centroids: np.ndarray | None = None
+        self._lists: list[np.ndarray] | None = None
+        self._recover()
+
+    def _recover(self) -> None:
+        """Drop rows an interrupted upsert wrote past the manifest's `count`."""
+        if self.dimension is None:
+            return
+        self._truncate("vectors.f32", self.count * self.dimension * 4)
+        assignments = self._file("assignments.i32")
+        if os.path.exists(assignments):
+            if os.path.getsize(assignments) < self.count * 4:
+                # Rows were added without IVF assignments: rebuild on next query.
+                for name in ("assignments.i32", "centroids.f32"):
+                    if os.path.exists(self._file(name)):
+                        os.remove(self._file(name))
+            else:
+                self._truncate("assignments.i32", self.count * 4)
+        self._maybe_compact()
+
+    def _truncate(self, name: str, size: int) -> None:
+        if (
+            os.path.exists(self._file(name))
+            and os.path.getsize(self._file(name)) > size
+        ):
+            os.truncate(self._file(name), size)
+
+    def _maybe_compact(self) -> None:
+        """Rewrite metadata.jsonl with one line per row once it is mostly dead."""
+        dead = self._log_lines - self.count
+        if dead < max(self.count, _COMPACT_MIN_DEAD):
+            return
+        tmp = self._file("metadata.jsonl.tmp")
+        offsets = array("q", [-1]) * self.count
+        with open(self._file("metadata.jsonl"), "rb") as src, open(tmp, "wb") as dst:
+            for row in range(self.count):
+                if self._offsets[row] >= 0:
+                    src.seek(self._offsets[row])
+                    offsets[row] = dst.tell()
+                    dst.write(src.readline())
+        os.replace(tmp, self._file("metadata.jsonl"))
+        self._offsets = offsets
+        self._log_lines = self.count
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_json(self, name: str) -> Any:
+        if not os.path.exists(self._file(name)):
+            return None
+        with open(self._file(name)) as f:
+            return json.load(f)
+
+    def _write_manifest(self) -> None:
+        tmp = self._file("manifest.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"dimension": self.dimension, "count": self.count}, f)
+        os.replace(tmp, self._file("manifest.json"))
+
+    def _matrix(self) -> np.ndarray:
+        """Return the memory-mapped vectors, remapping after appends."""
+        if self._vectors is None or len(self._vectors) != self.count:
+            if self.count == 0:
+                return np.zeros((0, self.dimension or 0), dtype=np.float32)
+            self._vectors = np.memmap(
+                self._file("vectors.f32"),
+                dtype=np.float32,
+                mode="r",
+                shape=(self.count, self.dimension),
+            )
+        return self._vectors
+
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        """Append new ids and overwrite existing ones in place, off the event loop."""
+        if not records:
+            return 0
+        return await asyncio.to_thread(self.write, records)
+
+    def write(self, records: Sequence[VectorRecord]) -> int:
+        """Synchronous upsert; see `upsert`."""
+        with self._lock:
+            matrix = _normalize(
+                np.asarray([r["values"] for r in records], dtype=np.float32)
+            )
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+            elif matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} does not match index dimension {self.dimension}"
+                )
+
+            updates = [
+                (self._rows[r["id"]], i)
+                for i, r in enumerate(records)
+                if r["id"] in self._rows
+            ]
+            appends = [i for i, r in enumerate(records) if r["id"] not in self._rows]
+
+            if updates:
+                writable = np.memmap(
+                    self._file("vectors.f32"),
+                    dtype=np.float32,
+                    mode="r+",
+                    shape=(self.count, self.dimension),
+                )
+                for row, i in updates:
+                    writable[row] = matrix[i]
+                writable.flush()
+                del writable
+            if appends:
+                with open(self._file("vectors.f32"), "ab") as f:
+                    f.write(matrix[appends].tobytes())
+
+            with open(self._file("metadata.jsonl"), "ab") as f:
+                for row, i in updates:
+                    self._offsets[row] = f.tell()
+                    f.write(_entry(row, records[i]))
+                    self._log_lines += 1
+                for i in appends:
+                    row = self.count
+                    self._offsets.append(f.tell())
+                    f.write(_entry(row, records[i]))
+                    self._rows[records[i]["id"]] = row
+                    self._log_lines += 1
+                    self.count += 1
+
+            if self._load_centroids() is not None:
+                self._assign_rows(matrix, updates, appends)
+            self._write_manifest()
+            self._vectors = None
+            self._maybe_compact()
+        return len(records)
+
+    # -- IVF -----------------------------------------------------------------
+
+    def _load_centroids(self) -> np.ndarray | None:
+        if self._centroids is None and os.path.exists(self._file("centroids.f32")):
+            raw = np.fromfile(self._file("centroids.f32"), dtype=np.float32)
+            self._centroids = raw.reshape(-1, self.dimension)
+        return self._centroids
+
+    def _assign_rows(
+        self, matrix: np.ndarray, updates: list[tuple[int, int]], appends: list[int]
+    ) -> None:
+        """Incrementally place new or changed rows into their nearest list."""
+        centroids = self._centroids
+        nearest = np.argmax(matrix @ centroids.T, axis=1).astype(np.int32)
+        if updates:
+            assignments = np.memmap(
+                self._file("assignments.i32"),
+                dtype=np.int32,
+                mode="r+",
+                shape=(self.count - len(appends),),
+            )
+            for row, i in updates:
+                assignments[row] = nearest[i]
+            assignments.flush()
+            del assignments
+        if appends:
+            with open(self._file("assignments.i32"), "ab") as f:
+                f.write(nearest[appends].tobytes())
+        self._lists = None
+
+    def build_ivf(
+        self, iterations: int = 10, sample_size: int = 50_000, seed: int = 0
+    ) -> None:
+        """Cluster the corpus with spherical k-means and write the IVF lists."""
+        with self._lock:
+            vectors = self._matrix()
+            if len(vectors) == 0:
+                return
+            rng = np.random.default_rng(seed)
+            nlist = min(self.nlist, len(vectors))
+            sample = vectors[
+                rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)
+            ]
+            centroids = np.array(sample[rng.choice(len(sample), nlist, replace=False)])
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(nlist):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroids[c] = members.sum(axis=0)
+                centroids = _normalize(centroids)
+
+            assignments = np.empty(len(vectors), dtype=np.int32)
+            for start in range(0, len(vectors), _BLOCK_ROWS):
+                block = vectors[start : start + _BLOCK_ROWS]
+                assignments[start : start + len(block)] = np.argmax(
+                    block @ centroids.T, axis=1
+                )
+            centroids.astype(np.float32).tofile(self._file("centroids.f32"))
+            assignments.tofile(self._file("assignments.i32"))
+            self._centroids = centroids
+            self._lists = None
+
+    def _inverted_lists(self) -> list[np.ndarray]:
+        if self._lists is None:
+            assignments = np.fromfile(self._file("assignments.i32"), dtype=np.int32)
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(
+                assignments[order], np.arange(len(self._centroids) + 1)
+            )
+            self._lists = [
+                order[bounds[i] : bounds[i + 1]] for i in range(len(self._centroids))
+            ]
+        return self._lists
+
+    # -- Query ---------------------------------------------------------------
+
+    def search(self, vector: Sequence[float], top_k: int) -> list[VectorMatch]:
+        """Synchronous cosine top-k search."""
+        with self._lock:
+            return self._search(vector, top_k)
+
+    def _search(self, vector: Sequence[float], top_k: int) -> list[VectorMatch]:
+        if self.count == 0:
+            return []
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        vectors = self._matrix()
+
+        if self.mode == "ivf":
+            if self._load_centroids() is None:
+                self.build_ivf()
+            probe = np.argsort(self._centroids @ query)[::-1][: self.nprobe]
+            rows = np.sort(np.concatenate([self._inverted_lists()[c] for c in probe]))
+            scores = vectors[rows] @ query
+        else:
+            rows = None
+            scores = np.concatenate(
+                [
+                    vectors[s : s + _BLOCK_ROWS] @ query
+                    for s in range(0, len(vectors), _BLOCK_ROWS)
+                ]
+            )
+
+        k = min(top_k, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        hits = [int(rows[i]) if rows is not None else int(i) for i in best]
+        return [
+            VectorMatch(
+                id=entry["id"], score=float(scores[i]), metadata=entry["metadata"]
+            )
+            for i, entry in zip(best, self._read_entries(hits))
+        ]
+
+    def _read_entries(self, rows: Sequence[int]) -> list[dict[str, Any]]:
+        """Read the metadata lines of `rows` from disk."""
+        entries = []
+        with open(self._file("metadata.jsonl"), "rb") as f:
+            for row in rows:
+                if self._offsets[row] < 0:
+                    entries.append({"id": "", "metadata": {}})
+                    continue
+                f.seek(self._offsets[row])
+                entries.append(json.loads(f.readline()))
+        return entries
+
+    async def query(self, vector: Sequence[float], top_k: int) -> list[VectorMatch]:
+        """Return the `top_k` most similar chunks.
+
+        Runs in a worker thread: the scan, and in IVF mode the first k-means
+        build, would otherwise block the event loop.
+        """
+        return await asyncio.to_thread(self.search, vector, top_k)
@@ -0,0 +1,157 @@
+"""Model fallback chains with latency-percentile hedging.
+
+Each node can list backup models in `Context.model_fallbacks`. A call starts on
+the node's primary model; if it fails, or has not answered (for streamed calls:
+produced its first token) within the configured percentile of that model's
+recent latency for the node, the next model in the chain is started as well.
+The first model to answer wins, every other attempt is cancelled, and the
+serving model is reported to the caller.
+
+Streamed attempts race to their first token: the first one to produce text
+claims the client stream and the rest are cancelled before emitting anything,
+so clients never see interleaved output.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Hashable, Sequence, TypeVar
+
+from writer_agent.context import Context
+
+T = TypeVar("T")
+
+# Called by an attempt once it is ready to deliver output; False means another attempt won.
+Claim = Callable[[], bool]
+
+
+def parse_fallbacks(spec: str) -> dict[str, list[str]]:
+    """Parse "node=provider/a|provider/b,*=provider/c" into per-node backup chains."""
+    chains = {}
+    for item in spec.split(","):
+        if "=" in item:
+            node, models = item.split("=", 1)
+            chains[node.strip()] = [m.strip() for m in models.split("|") if m.strip()]
+    return chains
+
+
+def model_chain(primary: str, node: str, context: Context) -> list[str]:
+    """Return `primary` followed by the node's backups (or the '*' backups), without repeats."""
+    chains = parse_fallbacks(context.model_fallbacks)
+    chain = [primary, *chains.get(node, chains.get("*", []))]
+    return list(dict.fromkeys(chain))
+
+
+class LatencyTracker:
+    """Rolling latency samples per (model, node, streamed) key."""
+
+    def __init__(self, window: int = 200) -> None:
+        """Keep the most recent `window` samples per key."""
+        self._samples: defaultdict[Hashable, deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+
+    def record(self, key: Hashable, seconds: float) -> None:
+        """Add one successful call's latency."""
+        self._samples[key].append(seconds)
+
+    def percentile(self, key: Hashable, q: float, min_samples: int) -> float | None:
+        """Return the `q`-th percentile, or None with fewer than `min_samples` samples."""
+        samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q / 100 * len(samples)) - 1)]
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._samples.clear()
+
+
+LATENCIES = LatencyTracker()
+
+
+def hedge_delay(model: str, node: str, stream: bool, context: Context) -> float | None:
+    """Seconds to wait on `model` before starting the next one (None: only on error)."""
+    delay = LATENCIES.percentile(
+        (model, node, stream),
+        context.llm_hedge_percentile,
+        context.llm_hedge_min_samples,
+    )
+    if delay is None:
+        delay = context.llm_hedge_delay
+    return delay or None
+
+
+async def hedged_call(
+    chain: Sequence[str],
+    attempt: Callable[[str, Claim], Awaitable[T]],
+    delay_for: Callable[[str], float | None],
+) -> tuple[str, T, int]:
+    """Run `attempt` along `chain`, hedging to the next model on error or slowness.
+
+    Returns the serving model, its result and how many backup attempts were
+    started. If every model fails, the last error is raised.
+    """
+    tasks: dict[asyncio.Task[T], int] = {}
+    winner: int | None = None
+    launched = 0
+    last_error: BaseException | None = None
+
+    def claim_for(index: int) -> Claim:
+        def claim() -> bool:
+            nonlocal winner
+            if winner is None:
+                winner = index
+                for task, i in tasks.items():
+                    if i != index:
+                        task.cancel()
+            return winner == index
+
+        return claim
+
+    def launch_next() -> None:
+        nonlocal launched
+        if launched < len(chain) and winner is None:
+            index = launched
+            launched += 1
+            tasks[asyncio.ensure_future(attempt(chain[index], claim_for(index)))] = (
+                index
+            )
+
+    try:
+        launch_next()
+        while True:
+            pending = {t for t in tasks if not t.done()}
+            if not pending:
+                break
+            hedging = winner is None and launched < len(chain)
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=delay_for(chain[launched - 1]) if hedging else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                launch_next()
+                continue
+            for task in done:
+                index = tasks[task]
+                if task.cancelled():
+                    continue
+                error = task.exception()
+                if error is None and claim_for(index)():
+                    return chain[index], task.result(), launched - 1
+                if error is not None:
+                    if index == winner:
+                        raise error
+                    last_error = error
+                    launch_next()
+    finally:
+        for task in tasks:
+            task.cancel()
+            # Losers' late errors are expected; retrieve them so they are not logged.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    raise last_error or RuntimeError(
+        "No model in the fallback chain produced a response"
+    )
@@ -0,0 +1,147 @@
+"""Process-wide registry of chat model clients.
+
+Building a chat model creates a provider client with its own HTTP connection
+pool. The registry keeps one instance per provider/model/settings combination so
+that every node, revision and thread reuses the same client and keep-alive
+connections instead of paying client construction and TLS handshakes per call.
+
+Models are built by the registry's `loader` (`load_chat_model` by default);
+`use_loader` swaps it temporarily, e.g. to serve fakes in benchmarks and tests.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterator
+
+from langchain_core.language_models import BaseChatModel
+
+from writer_agent.utils import load_chat_model
+
+# Builds a chat model from a 'provider/model' name and generation settings.
+ModelLoader = Callable[..., BaseChatModel]
+
+
+@dataclass
+class _Entry:
+    model: BaseChatModel
+    last_used: float
+
+
+def _freeze(settings: dict[str, Any]) -> tuple[tuple[str, Hashable], ...]:
+    """Turn model settings into a hashable, order-independent key."""
+    return tuple(sorted((k, repr(v)) for k, v in settings.items()))
+
+
+class ModelRegistry:
+    """Cache of chat model instances keyed by provider/model and settings.
+
+    Entries unused for longer than `idle_ttl` seconds are evicted, and the least
+    recently used entries are dropped once more than `max_entries` are held.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = 900.0,
+        max_entries: int = 32,
+        loader: ModelLoader = load_chat_model,
+    ) -> None:
+        """Create an empty registry that builds models with `loader`."""
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[Any, ...], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fully_specified_name: str, **settings: Any) -> BaseChatModel:
+        """Return a shared chat model, building it on first use.
+
+        Args:
+            fully_specified_name (str): String in the format 'provider/model'.
+            **settings: Generation settings forwarded to the model constructor.
+        """
+        key = (fully_specified_name, _freeze(settings))
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                entry.last_used = now
+                self._entries.move_to_end(key)
+                return entry.model
+            self.misses += 1
+
+        # Build outside the lock: provider constructors can be slow.
+        model = self.loader(fully_specified_name, **settings)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Another caller won the race; keep the first instance.
+                entry.last_used = now
+                return entry.model
+            self._entries[key] = _Entry(model=model, last_used=now)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return model
+
+    def _evict_idle(self, now: float) -> None:
+        expired = [
+            k for k, e in self._entries.items() if now - e.last_used > self.idle_ttl
+        ]
+        for key in expired:
+            del self._entries[key]
+        self.evictions += len(expired)
+
+    @contextmanager
+    def use_loader(self, loader: ModelLoader) -> Iterator[None]:
+        """Build models with `loader` inside the block, then restore the previous one.
+
+        Cached models are dropped on entry and exit so none leak across loaders.
+        """
+        original = self.loader
+        self.loader = loader
+        self.clear()
+        try:
+            yield
+        finally:
+            self.loader = original
+            self.clear()
+
+    def clear(self) -> None:
+        """Drop every cached model and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+def get_chat_model(fully_specified_name: str, **settings: Any) -> BaseChatModel:
+    """Return a chat model from the process-wide registry.
+
+    Args:
+        fully_specified_name (str): String in the format 'provider/model'.
+        **settings: Generation settings forwarded to the model constructor.
+    """
+    return MODEL_REGISTRY.get(fully_specified_name, **settings)
@@ -0,0 +1,71 @@
+"""Per-node model and generation-setting assignments.
+
+Nodes differ a lot in what they need from a model: routing emits one word and
+critique a short review, while drafting and final polishing produce the long
+text the user reads. `Context.node_models` maps nodes to a model or a tier
+("main" is `Context.model`, "fast" is `Context.fast_model`), and
+`Context.node_settings` sets per-node generation settings such as
+`max_tokens` and `temperature`. By default routing, query generation and
+critique run on the fast tier with tight output limits; setting both fields to
+empty puts every node back on the main model.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from writer_agent.context import Context
+
+# Small, fast model per provider, used for the "fast" tier when fast_model is unset.
+SMALL_MODELS = {
+    "openai": "openai/gpt-4o-mini",
+    "anthropic": "anthropic/claude-3-5-haiku-latest",
+}
+
+
+def _parse_value(value: str) -> Any:
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+
+def parse_node_models(spec: str) -> dict[str, str]:
+    """Parse "node=model_or_tier,..." assignments."""
+    return {
+        node.strip(): model.strip()
+        for node, _, model in (item.partition("=") for item in spec.split(","))
+        if model.strip()
+    }
+
+
+def parse_node_settings(spec: str) -> dict[str, dict[str, Any]]:
+    """Parse "node.setting=value,..." into per-node generation settings."""
+    settings: dict[str, dict[str, Any]] = {}
+    for item in spec.split(","):
+        key, _, value = item.partition("=")
+        node, _, name = key.strip().partition(".")
+        if name and value.strip():
+            settings.setdefault(node, {})[name] = _parse_value(value.strip())
+    return settings
+
+
+def tier_model(tier: str, context: Context) -> str:
+    """Resolve a tier name to a provider/model; other values are returned unchanged."""
+    if tier == "main":
+        return context.model
+    if tier == "fast":
+        provider = context.model.split("/", 1)[0]
+        return context.fast_model or SMALL_MODELS.get(provider, context.model)
+    return tier
+
+
+def node_model(node: str, context: Context) -> tuple[str, dict[str, Any]]:
+    """Return the model and generation settings assigned to `node`."""
+    assigned = parse_node_models(context.node_models).get(node, "main")
+    settings = parse_node_settings(context.node_settings).get(node, {})
+    return tier_model(assigned, context), settings
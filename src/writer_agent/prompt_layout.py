@@ -0,0 +1,73 @@
+"""Prompt assembly that keeps stable content ahead of per-call content.
+
+Providers cache prompt prefixes: OpenAI automatically once a prompt exceeds
+1024 tokens, Anthropic at explicitly marked cache breakpoints. A prefix only
+hits the cache when it is identical to an earlier prompt's, so whatever
+changes from one plan step to the next must come after the instructions,
+plan and research that every step shares.
+
+`layout_prompt` builds messages in that order, as text blocks with a cache
+breakpoint after each stable part. `for_provider` adapts them to the model
+actually called: Anthropic keeps the `cache_control` markers, other providers
+get the same text as plain strings, so the prefix is unchanged.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+# Anthropic's marker for "cache the prompt up to and including this block".
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Providers that take explicit cache breakpoints on content blocks.
+BREAKPOINT_PROVIDERS = {"anthropic"}
+
+
+def _block(text: str, cache: bool = False) -> dict[str, Any]:
+    block: dict[str, Any] = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = CACHE_CONTROL
+    return block
+
+
+def layout_prompt(instructions: str, stable: str, varying: str) -> list[dict[str, Any]]:
+    """Build a system + user prompt ordered from most to least stable.
+
+    Args:
+        instructions: System instructions, identical for every call of a node.
+        stable: Context shared by a series of calls (e.g. plan and research for
+            every step of one article); may be empty.
+        varying: What is specific to this call, such as the current step.
+    """
+    user = [_block(stable, cache=True)] if stable else []
+    user.append(_block(varying))
+    return [
+        {"role": "system", "content": [_block(instructions, cache=True)]},
+        {"role": "user", "content": user},
+    ]
+
+
+def content_text(content: Any) -> str:
+    """Return the text of a message content string or list of content blocks."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(
+        block if isinstance(block, str) else str(block.get("text", ""))
+        for block in content
+    )
+
+
+def for_provider(messages: Sequence[Any], model: str) -> list[Any]:
+    """Adapt laid-out messages for `model` ("provider/model").
+
+    Block content is flattened to plain text (dropping cache markers) for
+    providers without explicit breakpoints; other messages pass through.
+    """
+    if model.split("/", 1)[0] in BREAKPOINT_PROVIDERS:
+        return list(messages)
+    return [
+        {**message, "content": content_text(message["content"])}
+        if isinstance(message, dict) and isinstance(message.get("content"), list)
+        else message
+        for message in messages
+    ]
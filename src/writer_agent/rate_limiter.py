@@ -0,0 +1,315 @@
+"""Provider-aware rate limiting for LLM calls.
+
+Every model call goes through a `RateLimiter` shared by all threads in the
+process, keyed by the provider/model entry it matches in `Context.rate_limits`.
+A limiter combines:
+
+- token buckets for requests and estimated tokens per minute, refilled
+  continuously with a short burst allowance,
+- an optional cap on concurrent calls,
+- a priority queue, so interactive nodes (routing, direct answers) are served
+  before long-form drafting when the quota is contended,
+- adaptive backoff: provider rate-limit headers clamp the buckets to what the
+  provider says is left, and a 429 pauses the limiter for the advertised
+  retry-after and halves its effective rate, which then recovers additively on
+  success (AIMD). Throughput settles just under quota instead of oscillating
+  between bursts and 429 storms.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from typing import Any, Mapping
+from weakref import WeakKeyDictionary
+
+from writer_agent.context import Context
+
+# Lower numbers are served first.
+NODE_PRIORITIES: dict[str, int] = {
+    "basic_llm_response": 0,
+    "orchestrator": 0,
+    "analyzer_collector": 1,
+    "plan_writer": 1,
+    "critic_agent": 1,
+    "draft_writer": 2,
+    "final_drafter": 2,
+}
+DEFAULT_PRIORITY = 1
+
+# Seconds of quota that may be spent in one burst.
+BURST_SECONDS = 10.0
+
+_MIN_RATE_SCALE = 0.1
+_RATE_RECOVERY = 0.05
+
+
+def parse_rate_limits(spec: str) -> dict[str, tuple[float, float, int]]:
+    """Parse "provider[/model]=rpm:tpm[:max_concurrency],..."; 0 means unlimited."""
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, values = item.split("=", 1)
+            parts = values.split(":")
+            limits[name.strip()] = (
+                float(parts[0] or 0),
+                float(parts[1]) if len(parts) > 1 and parts[1] else 0.0,
+                int(parts[2]) if len(parts) > 2 and parts[2] else 0,
+            )
+    return limits
+
+
+def priority_for(node: str, context: Context) -> int:
+    """Return the scheduling priority of LLM calls made by `node`."""
+    overrides = {}
+    for item in context.llm_priorities.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            overrides[name.strip()] = int(value)
+    return overrides.get(node, NODE_PRIORITIES.get(node, DEFAULT_PRIORITY))
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse OpenAI-style reset durations ("1s", "6m0s", "20ms") or plain seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    parts = re.findall(r"([\d.]+)(ms|h|m|s)", value)
+    return sum(float(n) * units[u] for n, u in parts) if parts else None
+
+
+def _header(headers: Mapping[str, Any], *names: str) -> str | None:
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    for name in names:
+        if name in lowered:
+            return str(lowered[name])
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True for provider 429 / rate-limit errors."""
+    status = getattr(exc, "status_code", None) or getattr(
+        getattr(exc, "response", None), "status_code", None
+    )
+    return status == 429 or "RateLimit" in type(exc).__name__
+
+
+def error_headers(exc: BaseException) -> Mapping[str, Any]:
+    """Return the HTTP response headers attached to a provider error, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    return headers if headers is not None else {}
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding up to `BURST_SECONDS` of a per-minute rate."""
+
+    def __init__(self, per_minute: float) -> None:
+        """Create a full bucket for `per_minute` units per minute."""
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * BURST_SECONDS)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float, scale: float) -> None:
+        """Add what accrued since the last refill at the scaled rate."""
+        self.level = min(
+            self.capacity, self.level + (now - self.updated) * self.rate * scale
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float, scale: float) -> float:
+        """Seconds until `amount` (capped at capacity) is available."""
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / (self.rate * scale)) if needed > 0 else 0.0
+
+
+class RateLimiter:
+    """Priority-ordered admission control for one provider/model quota."""
+
+    def __init__(
+        self, rpm: float = 0, tpm: float = 0, max_concurrency: int = 0
+    ) -> None:
+        """Limit requests and tokens per minute and concurrent calls (0 = unlimited)."""
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.rate_scale = 1.0
+        self.paused_until = 0.0
+        self.rate_limited = 0
+        self.granted = 0
+        self._waiters: list[tuple[int, int, float, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(self, tokens: float, priority: int = DEFAULT_PRIORITY) -> float:
+        """Wait for quota to make one call of about `tokens` tokens.
+
+        Returns the seconds spent waiting.
+        """
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back.
+                self.release(tokens, 0)
+            raise
+        return time.monotonic() - start
+
+    def release(
+        self, reserved: float, used: float, headers: Mapping[str, Any] | None = None
+    ) -> None:
+        """Finish a call: reconcile its token estimate and learn from response headers."""
+        self.in_flight -= 1
+        if self.tokens is not None:
+            self.tokens.level = min(
+                self.tokens.capacity, self.tokens.level + reserved - used
+            )
+        if headers:
+            self._sync_from_headers(headers)
+        self.rate_scale = min(1.0, self.rate_scale + _RATE_RECOVERY)
+        self._dispatch()
+
+    def on_rate_limited(self, headers: Mapping[str, Any], attempt: int) -> float:
+        """Back off after a 429; returns the pause in seconds."""
+        self.rate_limited += 1
+        self.rate_scale = max(_MIN_RATE_SCALE, self.rate_scale / 2)
+        retry_ms = _header(headers, "retry-after-ms")
+        retry = _header(headers, "retry-after")
+        if retry_ms is not None:
+            delay = float(retry_ms) / 1000
+        elif retry is not None and _parse_duration(retry) is not None:
+            delay = _parse_duration(retry)
+        else:
+            delay = min(60.0, 2.0**attempt)
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.level = min(bucket.level, 0.0)
+        return delay
+
+    def _sync_from_headers(self, headers: Mapping[str, Any]) -> None:
+        """Clamp the buckets to the provider's view of the remaining quota."""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            remaining = _header(
+                headers,
+                f"x-ratelimit-remaining-{kind}",
+                f"anthropic-ratelimit-{kind}-remaining",
+            )
+            if bucket is None or remaining is None:
+                continue
+            try:
+                bucket.level = min(bucket.level, float(remaining))
+            except ValueError:
+                continue
+            if float(remaining) <= 0:
+                reset = _header(headers, f"x-ratelimit-reset-{kind}")
+                delay = _parse_duration(reset) if reset else None
+                if delay:
+                    self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        wait = max(0.0, self.paused_until - now)
+        for bucket, amount in ((self.requests, 1.0), (self.tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now, self.rate_scale)
+                wait = max(wait, bucket.wait_time(amount, self.rate_scale))
+        return wait
+
+    def _dispatch(self) -> None:
+        """Grant quota to waiters in priority order while it lasts."""
+        now = time.monotonic()
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                return  # release() dispatches again
+            wait = self._wait_time(tokens, now)
+            if wait > 0:
+                self._schedule(wait)
+                return
+            heapq.heappop(self._waiters)
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= tokens
+            self.in_flight += 1
+            self.granted += 1
+            future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        if (
+            self._timer is not None
+            and not self._timer.cancelled()
+            and self._timer.when() <= when
+        ):
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def stats(self) -> dict[str, float | int]:
+        """Return queue depth, usage and backoff state."""
+        return {
+            "waiting": sum(1 for *_, f in self._waiters if not f.done()),
+            "in_flight": self.in_flight,
+            "granted": self.granted,
+            "rate_limited": self.rate_limited,
+            "rate_scale": round(self.rate_scale, 3),
+            "request_level": round(self.requests.level, 1) if self.requests else -1,
+            "token_level": round(self.tokens.level, 1) if self.tokens else -1,
+        }
+
+
+class RateGovernor:
+    """Process-wide registry of rate limiters, one per configured quota and event loop."""
+
+    def __init__(self) -> None:
+        """Create an empty governor."""
+        self._limiters: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[str, float, float, int], RateLimiter]
+        ] = WeakKeyDictionary()
+
+    def limiter_for(self, model: str, context: Context) -> RateLimiter | None:
+        """Return the limiter for `model` ("provider/model"), or None if it has no limit.
+
+        An exact provider/model entry in `Context.rate_limits` wins over a
+        provider-wide one; models sharing a provider entry share its quota.
+        """
+        limits = parse_rate_limits(context.rate_limits)
+        name = model if model in limits else model.split("/", 1)[0]
+        if name not in limits or not any(limits[name]):
+            return None
+        key = (name, *limits[name])
+        by_key = self._limiters.setdefault(asyncio.get_running_loop(), {})
+        if key not in by_key:
+            by_key[key] = RateLimiter(*limits[name])
+        return by_key[key]
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        """Return stats for every limiter on the running loop."""
+        try:
+            by_key = self._limiters.get(asyncio.get_running_loop(), {})
+        except RuntimeError:
+            return {}
+        return {name: limiter.stats() for (name, *_), limiter in by_key.items()}
+
+
+GOVERNOR = RateGovernor()
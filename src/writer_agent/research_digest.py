@@ -0,0 +1,111 @@
+"""Compact raw search payloads into a token-bounded research digest.
+
+Serper and Tavily return large JSON documents (knowledge graphs, search
+parameters, related searches, raw page content). Only titles, snippets and URLs
+are useful to the writing prompts, so this stage extracts those, drops duplicate
+sources and fits the result into a token budget before it enters State.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence, TypedDict
+
+from writer_agent.utils import estimate_tokens
+
+
+class Source(TypedDict):
+    """A single search hit reduced to what the prompts need."""
+
+    title: str
+    snippet: str
+    url: str
+
+
+# Serper sections that carry useful hits, with the fields holding title and text.
+_SERPER_SECTIONS = (
+    ("answerBox", "title", "answer"),
+    ("organic", "title", "snippet"),
+    ("topStories", "title", "snippet"),
+    ("news", "title", "snippet"),
+    ("peopleAlsoAsk", "question", "snippet"),
+)
+
+
+def _clean(text: Any) -> str:
+    return " ".join(str(text or "").split())
+
+
+def extract_sources(result: dict[str, Any] | None) -> list[Source]:
+    """Extract title/snippet/URL triples from a Serper or Tavily payload.
+
+    Entries are returned in relevance order; knowledge graphs, search
+    parameters and related searches are dropped.
+    """
+    if not result or "error" in result:
+        return []
+    sources: list[Source] = []
+    for section, title_key, text_key in _SERPER_SECTIONS:
+        items = result.get(section) or []
+        for item in [items] if isinstance(items, dict) else items:
+            sources.append(
+                Source(
+                    title=_clean(item.get(title_key)),
+                    snippet=_clean(item.get(text_key) or item.get("snippet")),
+                    url=_clean(item.get("link")),
+                )
+            )
+    if result.get("answer"):
+        sources.append(Source(title="Answer", snippet=_clean(result["answer"]), url=""))
+    for item in result.get("results") or []:
+        sources.append(
+            Source(
+                title=_clean(item.get("title")),
+                snippet=_clean(item.get("content"))[:500],
+                url=_clean(item.get("url")),
+            )
+        )
+    return [s for s in sources if s["snippet"] or s["title"]]
+
+
+def _format_source(source: Source) -> str:
+    line = (
+        f"- {source['title']}: {source['snippet']}"
+        if source["title"]
+        else f"- {source['snippet']}"
+    )
+    return f"{line} ({source['url']})" if source["url"] else line
+
+
+def digest_results(
+    queries: Sequence[str],
+    results: Sequence[dict[str, Any] | None],
+    token_budget: int,
+) -> list[str]:
+    """Build one digest block per query, sharing a total token budget.
+
+    Sources are taken round-robin by rank across queries so every query keeps
+    its best hits when the budget is tight. Repeated URLs or snippets are kept
+    only once.
+    """
+    per_query = [extract_sources(r) for r in results]
+    blocks: list[list[str]] = [[f"### {q}"] for q in queries]
+    used = sum(estimate_tokens(b[0]) for b in blocks)
+    seen: set[str] = set()
+
+    for rank in range(max((len(s) for s in per_query), default=0)):
+        for index, sources in enumerate(per_query):
+            if rank >= len(sources):
+                continue
+            source = sources[rank]
+            key = source["url"] or source["snippet"]
+            if key in seen:
+                continue
+            line = _format_source(source)
+            cost = estimate_tokens(line)
+            if used + cost > token_budget:
+                continue
+            seen.add(key)
+            blocks[index].append(line)
+            used += cost
+
+    return ["\n".join(b) for b in blocks if len(b) > 1]
@@ -0,0 +1,303 @@
+"""Persistent search-result cache shared by the search tools.
+
+Results are stored in SQLite keyed by provider and a normalized form of the
+query (case, punctuation, whitespace, stopwords and word order are ignored) plus
+any request parameters that change the result, such as the number of results, so
+repeat or near-identical research queries skip the paid APIs entirely. Each
+provider has its own TTL; expired entries are still served for a grace period
+while a background refresh runs (stale-while-revalidate), and the least recently
+used entries are evicted beyond a size limit. Database access runs in a worker
+thread so lookups never block the event loop.
+
+The cache is opt-in: set `Context.search_cache_path` to enable it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Mapping
+
+from writer_agent.context import Context
+from writer_agent.instrumentation import INSTRUMENTATION, Span, take_queue_time
+from writer_agent.utils import current_node, current_run_id
+
+logger = logging.getLogger(__name__)
+
+# Per-run hit/miss counters kept at most; the least recently active runs are dropped.
+MAX_TRACKED_RUNS = 256
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to what when "
+    "where which who why with about into vs".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    provider TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (provider, key)
+)
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Reduce a query to a canonical key.
+
+    Lowercases, strips punctuation, drops stopwords and sorts the remaining
+    terms, so "The history of Python" and "python history" share a key.
+    """
+    tokens = re.findall(r"\w+", query.lower())
+    terms = [t for t in tokens if t not in STOPWORDS] or tokens
+    return " ".join(sorted(terms))
+
+
+def cache_key(query: str, params: Mapping[str, Any] | None = None) -> str:
+    """Return the cache key for `query` sent with request `params`.
+
+    Parameters that change the result (e.g. the number of results) are part
+    of the key, so a short result list is never served for a longer request.
+    """
+    key = normalize_query(query)
+    if params:
+        key += " " + json.dumps(dict(params), sort_keys=True)
+    return key
+
+
+def parse_ttls(spec: str) -> dict[str, float]:
+    """Parse a "provider=seconds,provider=seconds" TTL spec."""
+    ttls = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, seconds = item.split("=", 1)
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+class SearchCache:
+    """SQLite-backed TTL/LRU cache of search results."""
+
+    def __init__(self, path: str, max_entries: int = 5000) -> None:
+        """Open (or create) the cache database at `path`."""
+        path = os.path.expanduser(path)
+        self.path = path
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self._refreshing: dict[tuple[str, str], asyncio.Task[Any]] = {}
+        self.run_stats: OrderedDict[str, Counter[str]] = OrderedDict()
+
+    def _run_counts(self, run_id: str) -> Counter[str]:
+        counts = self.run_stats.setdefault(run_id, Counter())
+        self.run_stats.move_to_end(run_id)
+        while len(self.run_stats) > MAX_TRACKED_RUNS:
+            self.run_stats.popitem(last=False)
+        return counts
+
+    def get(
+        self, provider: str, key: str, ttl: float, stale_ttl: float
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Look up an entry and classify it as "fresh", "stale" or "miss"."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, stored_at FROM search_cache WHERE provider = ? AND key = ?",
+                (provider, key),
+            ).fetchone()
+            if row is None:
+                return None, "miss"
+            age = now - row[1]
+            if age > ttl + stale_ttl:
+                return None, "miss"
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE provider = ? AND key = ?",
+                (now, provider, key),
+            )
+            self._conn.commit()
+        return json.loads(row[0]), "fresh" if age <= ttl else "stale"
+
+    def put(self, provider: str, key: str, payload: dict[str, Any]) -> None:
+        """Store a result and evict least recently used entries over the limit."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?)",
+                (provider, key, json.dumps(payload), now, now),
+            )
+            self._conn.execute(
+                """DELETE FROM search_cache WHERE rowid IN (
+                    SELECT rowid FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    async def fetch(
+        self,
+        provider: str,
+        query: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+        *,
+        ttl: float,
+        stale_ttl: float,
+        params: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Return a cached result for `query`, calling `fetch` on a miss.
+
+        Stale entries are returned immediately while a single background
+        refresh per key updates the cache. `params` are the request
+        parameters that affect the result; they are part of the cache key.
+        """
+        payload, _ = await self.fetch_with_state(
+            provider, query, fetch, ttl=ttl, stale_ttl=stale_ttl, params=params
+        )
+        return payload
+
+    async def fetch_with_state(
+        self,
+        provider: str,
+        query: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+        *,
+        ttl: float,
+        stale_ttl: float,
+        params: Mapping[str, Any] | None = None,
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Like `fetch`, but also return the lookup outcome ("hit", "stale" or "miss")."""
+        key = cache_key(query, params)
+        stats = self._run_counts(current_run_id())
+        payload, state = await asyncio.to_thread(
+            self.get, provider, key, ttl, stale_ttl
+        )
+        if state == "fresh":
+            stats["hits"] += 1
+            return payload, "hit"
+        if state == "stale":
+            stats["stale_hits"] += 1
+            if (provider, key) not in self._refreshing:
+                task = asyncio.create_task(
+                    self._refresh_in_background(provider, key, fetch)
+                )
+                self._refreshing[(provider, key)] = task
+                task.add_done_callback(
+                    lambda _: self._refreshing.pop((provider, key), None)
+                )
+            return payload, "stale"
+        stats["misses"] += 1
+        return await self._refresh(provider, key, fetch), "miss"
+
+    async def _refresh(
+        self,
+        provider: str,
+        key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> dict[str, Any] | None:
+        result = await fetch()
+        if result and "error" not in result:
+            await asyncio.to_thread(self.put, provider, key, result)
+        return result
+
+    async def _refresh_in_background(
+        self,
+        provider: str,
+        key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> None:
+        """Refresh a stale entry; on failure, keep serving the stale one."""
+        try:
+            await self._refresh(provider, key, fetch)
+        except Exception:
+            logger.warning(
+                "Background refresh of a stale %s result failed",
+                provider,
+                exc_info=True,
+            )
+
+    def stats(self, run_id: str | None = None) -> dict[str, Any]:
+        """Return hit/miss counters and hit rate for one run (or the current one)."""
+        counts = self.run_stats.get(run_id or current_run_id(), Counter())
+        lookups = counts["hits"] + counts["stale_hits"] + counts["misses"]
+        return {
+            "hits": counts["hits"],
+            "stale_hits": counts["stale_hits"],
+            "misses": counts["misses"],
+            "hit_rate": (counts["hits"] + counts["stale_hits"]) / lookups
+            if lookups
+            else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_CACHES: dict[str, SearchCache] = {}
+
+
+def get_search_cache(context: Context) -> SearchCache | None:
+    """Return the process-wide cache for the configured path, or None if disabled."""
+    path = context.search_cache_path
+    if not path:
+        return None
+    if path not in _CACHES:
+        _CACHES[path] = SearchCache(path, max_entries=context.search_cache_max_entries)
+    return _CACHES[path]
+
+
+async def cached_search(
+    provider: str,
+    query: str,
+    fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+    context: Context,
+    params: Mapping[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    """Serve `query` for `provider` through the search cache when enabled.
+
+    `params` are the request parameters that affect the result. Each call is
+    recorded as a "search" span with its cache outcome.
+    """
+    span = Span(
+        kind="search", name=provider, node=current_node(), queue_ms=take_queue_time()
+    )
+    start = time.perf_counter()
+    try:
+        cache = get_search_cache(context)
+        if cache is None:
+            result = await fetch()
+        else:
+            ttls = parse_ttls(context.search_cache_ttls)
+            result, span["cache"] = await cache.fetch_with_state(
+                provider,
+                query,
+                fetch,
+                ttl=ttls.get(provider, ttls.get("default", 86400.0)),
+                stale_ttl=context.search_cache_stale_ttl,
+                params=params,
+            )
+        span["status"] = "error" if not result or "error" in result else "ok"
+        return result
+    except asyncio.CancelledError:
+        # Lost a hedge race; not a provider failure.
+        span["status"] = "cancelled"
+        raise
+    except Exception:
+        span["status"] = "error"
+        raise
+    finally:
+        span["wall_ms"] = (time.perf_counter() - start) * 1000
+        INSTRUMENTATION.record(span, context)
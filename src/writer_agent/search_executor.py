@@ -0,0 +1,96 @@
+"""Concurrent, hedged execution of research search queries.
+
+All queries run at once (bounded by a semaphore). Each query starts on the
+primary provider and, if no usable answer arrives within the hedge delay, is
+also sent to the next provider; the first successful response wins and the
+others are cancelled. Research wall time is then close to the slowest single
+query instead of the sum of every round-trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Coroutine, Sequence
+
+from writer_agent.instrumentation import set_queue_time
+
+SearchFn = Callable[[str], Coroutine[Any, Any, dict[str, Any] | None]]
+
+
+def _is_usable(result: dict[str, Any] | None) -> bool:
+    return bool(result) and "error" not in result
+
+
+async def hedged_search(
+    query: str,
+    providers: Sequence[SearchFn],
+    *,
+    hedge_delay: float,
+    timeout: float,
+) -> dict[str, Any] | None:
+    """Run one query against a chain of providers, hedging after a delay.
+
+    The next provider is started when the hedge delay elapses or as soon as a
+    running provider fails, whichever comes first. Returns the first usable
+    result, otherwise the last failure (or None on timeout).
+    """
+    pending: set[asyncio.Task[dict[str, Any] | None]] = set()
+    remaining = list(providers)
+    last_result: dict[str, Any] | None = None
+
+    def launch_next() -> None:
+        if remaining:
+            pending.add(asyncio.create_task(remaining.pop(0)(query)))
+
+    try:
+        async with asyncio.timeout(timeout):
+            launch_next()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Primary is slow: hedge to the next provider.
+                    launch_next()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = {"error": f"Search provider error: {e}"}
+                    if _is_usable(result):
+                        return result
+                    last_result = result
+                    launch_next()
+    except TimeoutError:
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
+    return last_result
+
+
+async def run_searches(
+    queries: Sequence[str],
+    providers: Sequence[SearchFn],
+    *,
+    concurrency: int,
+    hedge_delay: float,
+    timeout: float,
+) -> list[dict[str, Any] | None]:
+    """Run all queries concurrently and return results in query order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(query: str) -> dict[str, Any] | None:
+        queued = time.perf_counter()
+        async with semaphore:
+            set_queue_time((time.perf_counter() - queued) * 1000)
+            return await hedged_search(
+                query, providers, hedge_delay=hedge_delay, timeout=timeout
+            )
+
+    return list(await asyncio.gather(*(run_one(q) for q in queries)))
@@ -0,0 +1,93 @@
+"""Speculative drafting of the next plan step during human review.
+
+While a reviewer looks at step k, the workflow can draft and critique step k+1
+in the background on the assumption that step k will be approved. Results are
+keyed by thread, step index and the exact completed sections they were built
+on, so a speculation is only ever used when that assumption held; revisions
+discard it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Sequence
+
+
+def speculation_key(
+    thread_id: str, step_index: int, completed_steps: Sequence[str]
+) -> str:
+    """Identify a speculative draft by what it assumed."""
+    digest = hashlib.sha256("\x00".join(completed_steps).encode()).hexdigest()
+    return f"{thread_id}:{step_index}:{digest}"
+
+
+def critique_key(thread_id: str, draft: str) -> str:
+    """Identify a precomputed critique by the draft it reviewed."""
+    return f"{thread_id}:{hashlib.sha256(draft.encode()).hexdigest()}"
+
+
+class SpeculativeDrafts:
+    """Background tasks drafting ahead, plus critiques waiting to be consumed."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Create an empty store holding at most `max_entries` speculations."""
+        self.max_entries = max_entries
+        self._tasks: OrderedDict[str, asyncio.Task[Any]] = OrderedDict()
+        self._critiques: OrderedDict[str, Any] = OrderedDict()
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+
+    def start(self, key: str, work: Awaitable[Any]) -> None:
+        """Schedule `work` under `key` unless a speculation is already running."""
+        if key in self._tasks:
+            if asyncio.iscoroutine(work):
+                work.close()
+            return
+        self._tasks[key] = asyncio.ensure_future(work)
+        self.started += 1
+        while len(self._tasks) > self.max_entries:
+            _, task = self._tasks.popitem(last=False)
+            task.cancel()
+
+    async def take(self, key: str) -> Any | None:
+        """Pop and await the speculation for `key`; None if absent or failed."""
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return None
+        try:
+            result = await task
+        except Exception:
+            return None
+        self.used += 1
+        return result
+
+    def discard(self, thread_id: str) -> None:
+        """Cancel every pending speculation for a thread."""
+        for key in [k for k in self._tasks if k.startswith(f"{thread_id}:")]:
+            self._tasks.pop(key).cancel()
+            self.discarded += 1
+
+    def put_critique(self, key: str, critique: Any) -> None:
+        """Hold a precomputed critique until the critic node asks for it."""
+        self._critiques[key] = critique
+        while len(self._critiques) > self.max_entries:
+            self._critiques.popitem(last=False)
+
+    def take_critique(self, key: str) -> Any | None:
+        """Pop a precomputed critique, if one exists."""
+        return self._critiques.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return counters for started, used and discarded speculations."""
+        return {
+            "started": self.started,
+            "used": self.used,
+            "discarded": self.discarded,
+            "pending": len(self._tasks),
+        }
+
+
+SPECULATIVE_DRAFTS = SpeculativeDrafts()
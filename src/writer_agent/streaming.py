@@ -0,0 +1,84 @@
+"""Token streaming from LLM nodes to graph clients.
+
+Long generations are streamed through LangGraph's custom stream channel
+(`stream_mode="custom"`) as they are produced, so clients can render text
+immediately instead of waiting for the full response. Each event is keyed by
+node and plan step; the complete message is still returned for State.
+
+Events have the shape ``{"node", "step", "delta"}`` while tokens arrive and
+``{"node", "step", "done": True, "ttft_ms", "total_ms"}`` at the end.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, message_chunk_to_message
+from langgraph.config import get_stream_writer
+
+from writer_agent.utils import get_message_text
+
+
+def _get_writer() -> Callable[[Any], None]:
+    try:
+        return get_stream_writer()
+    except (RuntimeError, KeyError):
+        # Called outside a graph run (e.g. a background task): nothing to stream to.
+        return lambda _: None
+
+
+async def stream_response(
+    model: BaseChatModel,
+    messages: Sequence[Any],
+    *,
+    node: str,
+    step: int | None = None,
+    on_first_token: Callable[[], bool] | None = None,
+) -> AIMessage:
+    """Stream a model response to the client and return the full message.
+
+    Time to first token and total generation time (in milliseconds) are
+    emitted with the final event and recorded in the message's
+    `response_metadata`. `on_first_token` is called before any text is
+    emitted; if it returns False the stream is abandoned (another hedged
+    attempt already owns the client stream) and CancelledError is raised.
+    """
+    writer = _get_writer()
+    start = time.perf_counter()
+    first_token_at: float | None = None
+    full: AIMessageChunk | None = None
+
+    async for chunk in model.astream(messages):
+        delta = get_message_text(chunk)
+        if delta and first_token_at is None:
+            if on_first_token is not None and not on_first_token():
+                raise asyncio.CancelledError
+            first_token_at = time.perf_counter()
+        full = chunk if full is None else full + chunk
+        if delta:
+            writer({"node": node, "step": step, "delta": delta})
+
+    end = time.perf_counter()
+    timings = {
+        "ttft_ms": round(((first_token_at or end) - start) * 1000, 1),
+        "total_ms": round((end - start) * 1000, 1),
+    }
+    writer({"node": node, "step": step, "done": True, **timings})
+
+    message = (
+        message_chunk_to_message(full) if full is not None else AIMessage(content="")
+    )
+    message.response_metadata.update(timings)
+    return message
+
+
+def replay_response(message: AIMessage, *, node: str, step: int | None = None) -> None:
+    """Emit an already complete response (e.g. a cache hit) as stream events."""
+    writer = _get_writer()
+    text = get_message_text(message)
+    if text:
+        writer({"node": node, "step": step, "delta": text})
+    writer({"node": node, "step": step, "done": True, "ttft_ms": 0.0, "total_ms": 0.0})
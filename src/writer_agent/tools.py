@@ -7,54 +7,84 @@ consider implementing more robust and specialized tools tailored to your needs.
 """
 
 import os
-from typing import Any, Callable, List, Optional, cast
+from typing import Any, Callable, Dict, List
 
-import httpx
-from langchain_tavily import TavilySearch
 from langgraph.runtime import get_runtime
 
 from writer_agent.context import Context
+from writer_agent.http_client import SEARCH_CLIENTS
+from writer_agent.search_cache import cached_search
 
 
-async def search(query: str) -> Optional[dict[str, Any]]:
+async def search(query: str) -> dict[str, Any] | None:
     """Search for general web results.
 
     This function performs a search using the Tavily search engine, which is designed
     to provide comprehensive, accurate, and trusted results. It's particularly useful
     for answering questions about current events.
     """
-    runtime = get_runtime(Context)
-    wrapped = TavilySearch(max_results=runtime.context.max_search_results)
-    return cast(dict[str, Any], await wrapped.ainvoke({"query": query}))
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        return {"error": "TAVILY_API_KEY not found in environment"}
+
+    url = "https://api.tavily.com/search"
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    context = get_runtime(Context).context
+    payload = {"query": query, "max_results": int(context.max_search_results)}
+    client = await SEARCH_CLIENTS.get_client(context)
+
+    async def fetch() -> dict[str, Any] | None:
+        async with SEARCH_CLIENTS.slot():
+            try:
+                response = await client.post(url, json=payload, headers=headers)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                return {"error": f"Tavily API error: {str(e)}"}
 
+    return await cached_search(
+        "tavily", query, fetch, context, params={"max_results": payload["max_results"]}
+    )
 
-async def serper_search(query: str) -> Optional[dict[str, Any]]:
+
+async def serper_search(query: str) -> dict[str, Any] | None:
     """Search using Serper API for comprehensive research results.
-    
+
     Serper provides Google Search API results including organic results,
     knowledge graphs, and related searches. Useful for in-depth research.
     """
     api_key = os.getenv("SERPER_API_KEY")
     if not api_key:
         return {"error": "SERPER_API_KEY not found in environment"}
-    
+
     url = "https://google.serper.dev/search"
-    headers = {
-        "X-API-KEY": api_key,
-        "Content-Type": "application/json"
-    }
+    headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
     payload = {
         "q": query,
-        "num": 10  # Number of results
+        "num": 10,  # Number of results
     }
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            return {"error": f"Serper API error: {str(e)}"}
+
+    context = get_runtime(Context).context
+    client = await SEARCH_CLIENTS.get_client(context)
+
+    async def fetch() -> dict[str, Any] | None:
+        async with SEARCH_CLIENTS.slot():
+            try:
+                response = await client.post(url, json=payload, headers=headers)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                return {"error": f"Serper API error: {str(e)}"}
+
+    return await cached_search(
+        "serper", query, fetch, context, params={"num": payload["num"]}
+    )
 
 
 TOOLS: List[Callable[..., Any]] = [search, serper_search]
+
+# Search backends by name, as referenced by Context.search_providers.
+SEARCH_PROVIDERS: Dict[str, Callable[..., Any]] = {
+    "serper": serper_search,
+    "tavily": search,
+}
@@ -1,8 +1,11 @@
 """Utility & helper functions."""
 
-from langchain.chat_models import init_chat_model
+from typing import Any
+
+from langchain_core.embeddings import Embeddings
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
+from langgraph.config import get_config
 
 
 def get_message_text(msg: BaseMessage) -> str:
@@ -17,11 +20,57 @@ def get_message_text(msg: BaseMessage) -> str:
         return "".join(txts).strip()
 
 
-def load_chat_model(fully_specified_name: str) -> BaseChatModel:
+def load_chat_model(fully_specified_name: str, **kwargs: Any) -> BaseChatModel:
     """Load a chat model from a fully specified name.
 
     Args:
         fully_specified_name (str): String in the format 'provider/model'.
+        **kwargs: Extra settings passed to the model constructor.
+    """
+    from langchain.chat_models import init_chat_model
+
+    provider, model = fully_specified_name.split("/", maxsplit=1)
+    if provider == "openai":
+        # Report token usage on streamed responses too, for instrumentation.
+        kwargs.setdefault("stream_usage", True)
+    return init_chat_model(model, model_provider=provider, **kwargs)
+
+
+def load_embeddings(fully_specified_name: str) -> Embeddings:
+    """Load an embeddings model from a fully specified name.
+
+    Args:
+        fully_specified_name (str): String in the format 'provider/model'.
+            'fake/<dimension>' gives deterministic offline embeddings for testing
+            (requires numpy, from the 'local' extra).
     """
     provider, model = fully_specified_name.split("/", maxsplit=1)
-    return init_chat_model(model, model_provider=provider)
+    if provider == "fake":
+        # Imported here: the fake embeddings pull in numpy.
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        return DeterministicFakeEmbedding(size=int(model))
+    from langchain.embeddings import init_embeddings
+
+    return init_embeddings(model, provider=provider)
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def current_run_id() -> str:
+    """Return the thread id of the current graph run, if any."""
+    try:
+        return str(get_config().get("configurable", {}).get("thread_id", "default"))
+    except RuntimeError:
+        return "default"
+
+
+def current_node() -> str | None:
+    """Return the name of the graph node currently executing, if any."""
+    try:
+        return get_config().get("metadata", {}).get("langgraph_node")
+    except RuntimeError:
+        return None
@@ -0,0 +1,251 @@
+"""Article persistence: chunking, batched embeddings and vector upserts.
+
+Approved articles are split into one chunk per plan step, embedded in a single
+batched call and written to the configured vector backend in bulk. Backends are
+created once per process and cached, so repeated saves reuse the same client
+and index handle instead of reconnecting and listing indexes every run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, Sequence, TypedDict
+
+from langchain_core.embeddings import Embeddings
+
+from writer_agent.context import Context
+from writer_agent.utils import load_embeddings
+
+# Pinecone rejects metadata over 40KB per vector; keep chunk text well below.
+_MAX_METADATA_TEXT = 30_000
+
+
+class VectorRecord(TypedDict):
+    """A chunk ready to be upserted."""
+
+    id: str
+    values: list[float]
+    metadata: dict[str, Any]
+
+
+class VectorMatch(TypedDict):
+    """A query result."""
+
+    id: str
+    score: float
+    metadata: dict[str, Any]
+
+
+class VectorStore(ABC):
+    """Minimal interface shared by the vector backends."""
+
+    @abstractmethod
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        """Insert or replace records; return the number written."""
+
+    @abstractmethod
+    async def query(self, vector: Sequence[float], top_k: int) -> list[VectorMatch]:
+        """Return the `top_k` most similar records by cosine similarity."""
+
+
+class InMemoryVectorStore(VectorStore):
+    """Process-local store for offline runs and tests."""
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self.records: dict[str, VectorRecord] = {}
+        self.upsert_calls = 0
+
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        """Insert or replace records in one call."""
+        self.upsert_calls += 1
+        for record in records:
+            self.records[record["id"]] = record
+        return len(records)
+
+    async def query(self, vector: Sequence[float], top_k: int) -> list[VectorMatch]:
+        """Brute-force cosine similarity over all records."""
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        scored = []
+        for record in self.records.values():
+            values = record["values"]
+            other = math.sqrt(sum(v * v for v in values)) or 1.0
+            score = sum(a * b for a, b in zip(vector, values)) / (norm * other)
+            scored.append(
+                VectorMatch(id=record["id"], score=score, metadata=record["metadata"])
+            )
+        return sorted(scored, key=lambda m: m["score"], reverse=True)[:top_k]
+
+
+class PineconeVectorStore(VectorStore):
+    """Pinecone backend holding one client and one index handle per process."""
+
+    def __init__(self, api_key: str, index_name: str, batch_size: int = 100) -> None:
+        """Connect lazily to `index_name`; the index is created on first upsert."""
+        self.api_key = api_key
+        self.index_name = index_name
+        self.batch_size = batch_size
+        self._client: Any = None
+        self._index: Any = None
+        self._lock = threading.Lock()
+
+    def _connect(self, dimension: int | None) -> Any:
+        """Return the index handle, or None if it does not exist yet.
+
+        The index is only created when `dimension` is given (the upsert path),
+        so read-only runs never create one. Blocking: call via a thread.
+        """
+        with self._lock:
+            if self._index is None:
+                if self._client is None:
+                    from pinecone.grpc import PineconeGRPC
+
+                    self._client = PineconeGRPC(api_key=self.api_key)
+                if not self._client.has_index(self.index_name):
+                    if dimension is None:
+                        return None
+                    from pinecone import ServerlessSpec
+
+                    self._client.create_index(
+                        name=self.index_name,
+                        dimension=dimension,
+                        metric="cosine",
+                        spec=ServerlessSpec(cloud="aws", region="us-east-1"),
+                    )
+                self._index = self._client.Index(self.index_name)
+            return self._index
+
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        """Upsert in batches of `batch_size` (one request for typical articles)."""
+        if not records:
+            return 0
+        index = self._index or await asyncio.to_thread(
+            self._connect, len(records[0]["values"])
+        )
+        for start in range(0, len(records), self.batch_size):
+            batch = [dict(r) for r in records[start : start + self.batch_size]]
+            await asyncio.to_thread(index.upsert, vectors=batch)
+        return len(records)
+
+    async def query(self, vector: Sequence[float], top_k: int) -> list[VectorMatch]:
+        """Query the index for the nearest chunks; none if it does not exist yet."""
+        index = self._index or await asyncio.to_thread(self._connect, None)
+        if index is None:
+            return []
+        result = await asyncio.to_thread(
+            index.query, vector=list(vector), top_k=top_k, include_metadata=True
+        )
+        return [
+            VectorMatch(id=m.id, score=m.score, metadata=dict(m.metadata or {}))
+            for m in result.matches
+        ]
+
+
+def _pinecone_store(context: Context) -> VectorStore | None:
+    api_key = os.getenv("PINECONE_API_KEY")
+    if not api_key or api_key == "your_pinecone_api_key_here":
+        return None
+    return PineconeVectorStore(
+        api_key, context.vector_index_name, batch_size=context.vector_upsert_batch_size
+    )
+
+
+def _local_store(context: Context) -> VectorStore:
+    # Imported lazily: the local index needs numpy (the 'local' extra).
+    from writer_agent.local_vector_index import LocalVectorIndex
+
+    return LocalVectorIndex(
+        os.path.join(context.local_index_path, context.vector_index_name),
+        mode=context.local_index_mode,
+        nlist=context.local_index_nlist,
+        nprobe=context.local_index_nprobe,
+    )
+
+
+# Backend factories by name, as referenced by Context.vector_backend.
+VECTOR_BACKENDS: Dict[str, Callable[[Context], VectorStore | None]] = {
+    "pinecone": _pinecone_store,
+    "local": _local_store,
+    "memory": lambda context: InMemoryVectorStore(),
+}
+
+_STORES: dict[tuple[str, str], VectorStore] = {}
+_EMBEDDINGS: dict[str, Embeddings] = {}
+
+
+def get_vector_store(context: Context) -> VectorStore | None:
+    """Return the cached backend for `context`, or None if it is unavailable.
+
+    Unavailable backends are not cached, so setting the API key later is
+    picked up on the next call.
+    """
+    key = (context.vector_backend, context.vector_index_name)
+    if key not in _STORES:
+        factory = VECTOR_BACKENDS.get(context.vector_backend)
+        store = factory(context) if factory else None
+        if store is None:
+            return None
+        _STORES[key] = store
+    return _STORES[key]
+
+
+def get_embeddings(context: Context) -> Embeddings:
+    """Return the cached embeddings model named in `context`."""
+    if context.embedding_model not in _EMBEDDINGS:
+        _EMBEDDINGS[context.embedding_model] = load_embeddings(context.embedding_model)
+    return _EMBEDDINGS[context.embedding_model]
+
+
+def chunk_article(
+    title: str,
+    plan_steps: Sequence[str],
+    sections: Sequence[str],
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """Split an article into one (id, text, metadata) chunk per plan step.
+
+    Ids are derived from the article content, so saving the same article
+    twice overwrites rather than duplicates it.
+    """
+    article_id = hashlib.sha256("\n\n".join(sections).encode()).hexdigest()[:16]
+    timestamp = datetime.now().isoformat()
+    chunks = []
+    for i, text in enumerate(sections):
+        metadata = {
+            "article_id": article_id,
+            "title": title[:200],
+            "step": i,
+            "step_title": plan_steps[i][:200] if i < len(plan_steps) else "",
+            "steps_count": len(sections),
+            "timestamp": timestamp,
+            "text": text[:_MAX_METADATA_TEXT],
+        }
+        chunks.append((f"{article_id}-{i}", text, metadata))
+    return chunks
+
+
+async def save_article(
+    title: str,
+    plan_steps: Sequence[str],
+    sections: Sequence[str],
+    context: Context,
+) -> int:
+    """Embed and upsert an article's sections; return the number of chunks stored."""
+    store = get_vector_store(context)
+    if store is None or not sections:
+        return 0
+    chunks = chunk_article(title, plan_steps, sections)
+    vectors = await get_embeddings(context).aembed_documents(
+        [text for _, text, _ in chunks]
+    )
+    return await store.upsert(
+        [
+            VectorRecord(id=chunk_id, values=list(values), metadata=metadata)
+            for (chunk_id, _, metadata), values in zip(chunks, vectors)
+        ]
+    )
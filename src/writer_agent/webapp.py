@@ -0,0 +1,55 @@
+"""Custom HTTP app mounted by the LangGraph server (see langgraph.json).
+
+It ties shared client lifecycles to the server's lifespan, exposes pool usage
+so the search HTTP pool can be sized, reports how often the routing fast path
+fires, and serves run instrumentation.
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from writer_agent.classifier import FAST_PATH
+from writer_agent.http_client import SEARCH_CLIENTS, lifespan
+from writer_agent.instrumentation import INSTRUMENTATION, PROMETHEUS
+from writer_agent.rate_limiter import GOVERNOR
+
+
+async def search_pool_stats(request: Request) -> JSONResponse:
+    """Report usage and saturation of the shared search HTTP pool."""
+    return JSONResponse(SEARCH_CLIENTS.stats())
+
+
+async def rate_limit_stats(request: Request) -> JSONResponse:
+    """Report queue depth and backoff state of each LLM rate limiter."""
+    return JSONResponse(GOVERNOR.stats())
+
+
+async def classifier_stats(request: Request) -> JSONResponse:
+    """Report how often routing was decided locally instead of by the LLM."""
+    return JSONResponse(FAST_PATH.stats())
+
+
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose counters in the Prometheus text format ('prometheus' metrics sink)."""
+    return PlainTextResponse(
+        PROMETHEUS.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+async def thread_usage(request: Request) -> JSONResponse:
+    """Report latency, tokens and cost of one thread, per step, node and model."""
+    return JSONResponse(INSTRUMENTATION.summary(request.path_params["thread_id"]))
+
+
+app = Starlette(
+    routes=[
+        Route("/stats/search-pool", search_pool_stats),
+        Route("/stats/rate-limits", rate_limit_stats),
+        Route("/stats/classifier", classifier_stats),
+        Route("/stats/threads/{thread_id}", thread_usage),
+        Route("/metrics", metrics),
+    ],
+    lifespan=lifespan,
+)
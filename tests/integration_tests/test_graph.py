@@ -8,7 +8,7 @@ pytestmark = pytest.mark.anyio
 
 async def test_react_agent_simple_passthrough() -> None:
     res = await graph.ainvoke(
-        {"messages": [("user", "Who is the founder of LangChain?")]},  # type: ignore
+        {"messages": [("user", "Who is the founder of LangChain?")]},
         context=Context(),
     )
 
@@ -0,0 +1,51 @@
+import pytest
+
+from writer_agent.article_retrieval import retrieve_past_sections
+from writer_agent.context import Context
+from writer_agent.vector_store import save_article
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_covered_queries_skip_web_search() -> None:
+    pytest.importorskip("numpy")  # fake embeddings need it
+    context = Context(
+        vector_backend="memory",
+        embedding_model="fake/32",
+        vector_index_name="retrieval",
+    )
+    await save_article("Python guide", ["STEP 1: History"], ["python history"], context)
+
+    uncovered, blocks = await retrieve_past_sections(
+        "write about python", ["python history", "rust ownership"], context
+    )
+    assert uncovered == ["rust ownership"]
+    assert len(blocks) == 1
+    assert "Python guide / STEP 1: History" in blocks[0]
+
+
+async def test_retrieval_can_be_disabled() -> None:
+    context = Context(vector_backend="memory", retrieval_enabled=False)
+    assert await retrieve_past_sections("x", ["a", "b"], context) == (["a", "b"], [])
+
+
+async def test_queries_cut_by_the_budget_stay_uncovered() -> None:
+    pytest.importorskip("numpy")  # fake embeddings need it
+    context = Context(
+        vector_backend="memory",
+        embedding_model="fake/32",
+        vector_index_name="retrieval-budget",
+        retrieval_token_budget=20,
+    )
+    await save_article(
+        "Guide",
+        ["STEP 1: History", "STEP 2: Ownership"],
+        ["python history", "rust ownership"],
+        context,
+    )
+
+    uncovered, blocks = await retrieve_past_sections(
+        "write a guide", ["python history", "rust ownership"], context
+    )
+    assert uncovered == ["rust ownership"]
+    assert len(blocks) == 1 and "python history" in blocks[0]
@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from writer_agent import batch
+from writer_agent.fakes import FakeChatModel, fake_search_provider, offline
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def offline_fakes() -> Iterator[None]:
+    with offline(FakeChatModel(plan_steps=2), fake_search_provider()):
+        yield
+
+
+async def test_run_batch_completes_items_and_skips_finished(
+    offline_fakes: None, tmp_path: Path
+) -> None:
+    context = {
+        "search_cache_path": "",
+        "retrieval_enabled": False,
+        "vector_backend": "memory",
+    }
+    requests = tmp_path / "requests.jsonl"
+    requests.write_text(
+        "\n".join(
+            json.dumps({"id": i, "user_input": "write a blog post", "context": context})
+            for i in "ab"
+        )
+    )
+    output = tmp_path / "results.jsonl"
+
+    report = await batch.run_batch(
+        str(requests), str(output), concurrency=2, policy=batch.critic_gated()
+    )
+    assert report["done"] == 2 and report["errors"] == 0
+    assert "draft_writer" in report["stages"]
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {r["id"] for r in results} == {"a", "b"}
+    assert all(r["final_content"] and r["steps"] == 2 for r in results)
+
+    again = await batch.run_batch(str(requests), str(output))
+    assert again["items"] == 0 and again["skipped"] == 2
+
+
+def test_critic_gated_requests_revision_until_limit() -> None:
+    policy = batch.critic_gated(max_revisions=1)
+    review = {
+        "step_draft": "x",
+        "critic_feedback": "NEEDS REVISION: more detail",
+        "iteration": 1,
+    }
+    assert "approve" not in policy(review).lower()
+    assert policy({**review, "iteration": 2}) == "approve"
+    assert policy({**review, "critic_feedback": "Approve"}) == "approve"
+    assert policy({"plan": "STEP 1"}) == "approve"
@@ -0,0 +1,32 @@
+import pytest
+
+from writer_agent.benchmark import compare, revise_each_step, run_scenario
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_run_scenario_reports_deterministic_metrics() -> None:
+    small = await run_scenario(2, output_tokens=50)
+    again = await run_scenario(2, output_tokens=50)
+    large = await run_scenario(4, output_tokens=50)
+
+    assert small["nodes"]["draft_writer"]["calls"] == 2
+    assert small["prompt_tokens"] == again["prompt_tokens"]
+    assert small["checkpoint_bytes"] == pytest.approx(
+        again["checkpoint_bytes"], rel=0.01
+    )
+    assert large["prompt_tokens"] > small["prompt_tokens"]
+    assert large["checkpoints"] > small["checkpoints"]
+    assert small["peak_memory_bytes"] > 0
+
+
+async def test_scripted_revisions_redraft_each_step() -> None:
+    result = await run_scenario(2, output_tokens=50, policy=revise_each_step(1))
+    assert result["nodes"]["draft_writer"]["calls"] == 4
+
+
+def test_compare_flags_only_regressions_over_threshold() -> None:
+    baseline = {"scenarios": [{"steps": 3, "wall_s": 1.0, "prompt_tokens": 100}]}
+    current = {"scenarios": [{"steps": 3, "wall_s": 1.05, "prompt_tokens": 150}]}
+    regressions = compare(current, baseline, threshold=0.1)
+    assert len(regressions) == 1 and "prompt_tokens" in regressions[0]
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+import pytest
+
+from writer_agent.blob_store import is_ref, offload, resolve
+from writer_agent.context import Context
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_large_text_is_offloaded_once_and_resolved(tmp_path: Path) -> None:
+    context = Context(blob_store_path=str(tmp_path), blob_inline_threshold=100)
+    text = "section " * 100
+    ref = await offload(text, context)
+    assert is_ref(ref) and len(ref) < 100
+    assert await offload(text, context) == ref
+    assert await offload(ref, context) == ref
+    assert await resolve(ref, context) == text
+    assert await offload("short", context) == "short"
+    assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == 1
+
+
+async def test_disabled_store_keeps_text_inline() -> None:
+    context = Context(blob_store_path="")
+    assert await offload("x" * 10_000, context) == "x" * 10_000
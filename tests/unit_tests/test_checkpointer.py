@@ -0,0 +1,145 @@
+import operator
+from pathlib import Path
+from typing import Annotated, Any, cast
+
+import pytest
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import START, StateGraph
+from typing_extensions import TypedDict
+
+from writer_agent.batch import StageTimer, run_item
+from writer_agent.benchmark import BENCHMARK_CONTEXT, revise_each_step, run_scenario
+from writer_agent.checkpointer import CompactSqliteSaver
+from writer_agent.content_workflow_graph import builder
+from writer_agent.content_workflow_state import InputState
+from writer_agent.context import Context
+from writer_agent.fakes import FakeChatModel, fake_search_provider, offline
+
+pytestmark = pytest.mark.anyio
+
+ITEM: dict[str, Any] = {
+    "id": "a",
+    "user_input": "Write a comprehensive guide on caching",
+    "context": BENCHMARK_CONTEXT,
+}
+CONFIG: RunnableConfig = {"configurable": {"thread_id": "batch-a"}}
+
+
+async def _final_state(saver: BaseCheckpointSaver[Any]) -> dict[str, Any]:
+    graph = builder.compile(checkpointer=saver)
+    with offline(FakeChatModel(plan_steps=4), fake_search_provider()):
+        await run_item(graph, ITEM, revise_each_step(1), StageTimer())
+    return (await graph.aget_state(CONFIG)).values
+
+
+async def test_compact_saver_round_trips_state(tmp_path: Path) -> None:
+    expected = await _final_state(InMemorySaver())
+    saver = CompactSqliteSaver(str(tmp_path / "checkpoints.sqlite"), keep_last=5)
+    values = await _final_state(saver)
+
+    assert values.keys() == expected.keys()
+    for key, value in expected.items():
+        if key == "messages":
+            assert [m.content for m in values[key]] == [m.content for m in value]
+        else:
+            assert values[key] == value
+    assert saver.stats["delta_blobs"] > 0
+    assert saver.footprint()[0] == 5
+    graph = builder.compile(checkpointer=saver)
+    history = [state async for state in graph.aget_state_history(CONFIG)]
+    assert len(history) == 5 and all(state.values["messages"] for state in history)
+
+
+async def test_interrupts_are_durable_without_flush(tmp_path: Path) -> None:
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = CompactSqliteSaver(path, batch_size=10_000, flush_interval=3600)
+    graph = builder.compile(checkpointer=saver)
+    with offline(FakeChatModel(), fake_search_provider()):
+        await graph.ainvoke(
+            InputState(user_input=ITEM["user_input"], messages=[]),
+            CONFIG,
+            context=Context(**BENCHMARK_CONTEXT),
+        )
+
+    reopened = builder.compile(checkpointer=CompactSqliteSaver(path))
+    state = await reopened.aget_state(CONFIG)
+    assert state.interrupts and state.values["user_input"] == ITEM["user_input"]
+
+
+def test_prune_keep_latest(tmp_path: Path) -> None:
+    saver = CompactSqliteSaver(str(tmp_path / "c.sqlite"), keep_last=None)
+    config: RunnableConfig = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+    for i in range(3):
+        checkpoint = cast(
+            Checkpoint,
+            {
+                "v": 4,
+                "id": f"0000{i}",
+                "ts": "",
+                "versions_seen": {},
+                "channel_values": {"messages": ["x"] * (i + 1)},
+                "channel_versions": {
+                    "messages": saver.get_next_version(None if i == 0 else str(i), None)
+                },
+            },
+        )
+        config = saver.put(config, checkpoint, {}, checkpoint["channel_versions"])
+    saver.prune(["t"])
+
+    assert saver.footprint()[0] == 1
+    latest = saver.get_tuple(config)
+    assert latest is not None
+    assert latest.checkpoint["channel_values"]["messages"] == ["x"] * 3
+
+
+async def test_compact_saver_cuts_write_amplification() -> None:
+    memory = await run_scenario(6, output_tokens=50)
+    compact = await run_scenario(6, output_tokens=50, checkpointer="compact")
+    assert compact["final_content_chars"] == memory["final_content_chars"]
+    assert compact["checkpoint_bytes_written"] * 5 < memory["checkpoint_bytes_written"]
+    assert compact["write_amplification"] < memory["write_amplification"]
+
+
+class Steps(TypedDict):
+    completed_steps: Annotated[list[str], operator.add]
+
+
+async def test_finished_runs_are_flushed_and_untracked(tmp_path: Path) -> None:
+    path = str(tmp_path / "checkpoints.sqlite")
+    steps = StateGraph(Steps)
+    steps.add_node("first", lambda state: {"completed_steps": ["first"]})
+    steps.add_node("second", lambda state: {"completed_steps": ["second"]})
+    steps.add_edge(START, "first")
+    steps.add_edge("first", "second")
+    saver = CompactSqliteSaver(path, batch_size=10_000, flush_interval=3600)
+    await steps.compile(checkpointer=saver).ainvoke({"completed_steps": []}, CONFIG)
+
+    assert not saver._last
+    reopened = steps.compile(checkpointer=CompactSqliteSaver(path))
+    state = await reopened.aget_state(CONFIG)
+    assert state.values["completed_steps"] == ["first", "second"]
+
+
+def test_delta_state_is_bounded_by_thread(tmp_path: Path) -> None:
+    saver = CompactSqliteSaver(str(tmp_path / "c.sqlite"), max_tracked_threads=2)
+    for thread_id in ("a", "b", "c"):
+        checkpoint = cast(
+            Checkpoint,
+            {
+                "v": 4,
+                "id": "00001",
+                "ts": "",
+                "versions_seen": {},
+                "channel_values": {"messages": ["x"]},
+                "channel_versions": {"messages": saver.get_next_version(None, None)},
+            },
+        )
+        saver.put(
+            {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}},
+            checkpoint,
+            {},
+            checkpoint["channel_versions"],
+        )
+    assert list(saver._last) == [("b", ""), ("c", "")]
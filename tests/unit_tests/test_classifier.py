@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from writer_agent.classifier import FastPathClassifier, parse_yes_no
+
+
+def test_rules_decide_clear_cases_and_defer_ambiguous_ones() -> None:
+    classifier = FastPathClassifier()
+    assert classifier.decide("What is Python?", min_confidence=0.8) is True
+    assert (
+        classifier.decide("Write a blog post about LangGraph", min_confidence=0.8)
+        is False
+    )
+    assert (
+        classifier.decide("LangGraph and the future of agents", min_confidence=0.8)
+        is None
+    )
+
+    classifier.record("LangGraph and the future of agents", False)
+    assert (
+        classifier.decide("langgraph and the  future of agents", min_confidence=0.8)
+        is False
+    )
+    assert classifier.stats() == {
+        "cache": 1,
+        "rules": 2,
+        "model": 0,
+        "llm": 1,
+        "fast_path_rate": 0.75,
+    }
+
+
+def test_rules_defer_questions_about_content_and_imperatives() -> None:
+    classifier = FastPathClassifier()
+    assert (
+        classifier.decide(
+            "What is the best way to write a blog post?", min_confidence=0.8
+        )
+        is None
+    )
+    assert (
+        classifier.decide("Explain LangGraph in a detailed article", min_confidence=0.8)
+        is None
+    )
+    assert classifier.decide("Explain machine learning", min_confidence=0.8) is None
+    assert classifier.stats()["llm"] == 3
+
+
+def test_on_disk_model_is_only_consulted_when_rules_abstain(tmp_path: Path) -> None:
+    classifier = FastPathClassifier()
+    missing = str(tmp_path / "missing.json")
+    assert (
+        classifier.decide("What is Python?", min_confidence=0.8, model_path=missing)
+        is True
+    )
+
+
+def test_unusable_model_falls_through_to_the_llm(tmp_path: Path) -> None:
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json")
+    classifier = FastPathClassifier()
+    for path in (str(tmp_path / "missing.json"), str(corrupt)):
+        assert (
+            classifier.decide(
+                "the future of agents", min_confidence=0.8, model_path=path
+            )
+            is None
+        )
+    assert classifier.stats()["llm"] == 2 and classifier.stats()["model"] == 0
+
+
+def test_on_disk_model_handles_inputs_rules_miss(tmp_path: Path) -> None:
+    path = tmp_path / "router.json"
+    path.write_text(
+        json.dumps({"bias": -1.0, "weights": {"future": -2.0, "define": 4.0}})
+    )
+    classifier = FastPathClassifier()
+    assert (
+        classifier.decide(
+            "the future of agents", min_confidence=0.8, model_path=str(path)
+        )
+        is False
+    )
+    assert classifier.stats()["model"] == 1
+
+
+def test_parse_yes_no_uses_first_word() -> None:
+    assert parse_yes_no("Yes.")
+    assert not parse_yes_no("No, this needs research (yes, really).")
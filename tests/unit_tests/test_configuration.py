@@ -18,3 +18,14 @@ def test_context_init_with_env_vars_and_passed_values() -> None:
     os.environ["MODEL"] = "openai/gpt-4o-mini"
     context = Context(model="openai/gpt-5o-mini")
     assert context.model == "openai/gpt-5o-mini"
+
+
+def test_context_env_vars_are_coerced_to_field_types() -> None:
+    os.environ["SEARCH_CONCURRENCY"] = "8"
+    os.environ["SEARCH_HEDGE_DELAY"] = "0.5"
+    try:
+        context = Context()
+    finally:
+        del os.environ["SEARCH_CONCURRENCY"], os.environ["SEARCH_HEDGE_DELAY"]
+    assert context.search_concurrency == 8
+    assert context.search_hedge_delay == 0.5
@@ -0,0 +1,30 @@
+from writer_agent.context_builder import summarize_section, update_rolling_summary
+from writer_agent.utils import estimate_tokens
+
+
+def section(n: int) -> str:
+    return f"## STEP {n}: Topic {n}\n" + " ".join(
+        f"Sentence {i} of step {n}." for i in range(40)
+    )
+
+
+def test_summarize_section_keeps_heading_and_leading_sentences() -> None:
+    gist = summarize_section(section(1), max_tokens=20)
+    assert gist.startswith("- STEP 1: Topic 1 — Sentence 0 of step 1.")
+    assert estimate_tokens(gist) <= 20
+
+
+def test_rolling_summary_stays_within_budget() -> None:
+    summary = ""
+    for n in range(1, 51):
+        summary = update_rolling_summary(summary, section(n), token_budget=200)
+        assert estimate_tokens(summary) <= 200
+    assert "STEP 50" in summary
+    assert "Sentence 0 of step 50" in summary
+
+
+def test_rolling_summary_keeps_titles_of_shortened_entries() -> None:
+    summary = ""
+    for n in range(1, 11):
+        summary = update_rolling_summary(summary, section(n), token_budget=120)
+    assert summary.splitlines()[0] == "- STEP 1: Topic 1"
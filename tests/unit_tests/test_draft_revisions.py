@@ -0,0 +1,64 @@
+from typing import cast
+
+import pytest
+from langgraph.runtime import Runtime
+
+from writer_agent.content_workflow_nodes import draft_writer_node
+from writer_agent.content_workflow_state import State
+from writer_agent.context import Context
+from writer_agent.draft_revisions import apply_edits, parse_edits
+from writer_agent.fakes import FakeChatModel, fake_search_provider, offline
+
+pytestmark = pytest.mark.anyio
+
+
+def test_parse_and_apply_edits() -> None:
+    response = """Here are the edits.
+<<<<<<< SEARCH
+quick brown
+=======
+slow red
+>>>>>>> REPLACE
+<<<<<<< SEARCH
+lazy   dog.
+=======
+>>>>>>> REPLACE
+<<<<<<< SEARCH
+not in the draft
+=======
+anything
+>>>>>>> REPLACE"""
+    edits = parse_edits(response)
+    assert edits[1] == ("lazy   dog.", "")
+
+    revised, applied = apply_edits(
+        "The quick brown fox jumps over the lazy\ndog.", edits
+    )
+    assert revised == "The slow red fox jumps over the "
+    assert applied == 2
+
+
+def test_parse_edits_ignores_prose() -> None:
+    assert parse_edits("I rewrote the whole section instead.") == []
+
+
+async def test_revision_edits_the_existing_draft() -> None:
+    model = FakeChatModel(output_tokens=200)
+    draft = "Opening words of the section that the reviewer wants changed. " * 20
+    state = {
+        "user_input": "write a post",
+        "plan_steps": ["Intro"],
+        "current_step_index": 0,
+        "current_step_draft": draft,
+        "step_approved": False,
+        "human_feedback": "Make the opening punchier",
+        "critic_feedback": "Needs Revision",
+        "draft_iteration": 1,
+    }
+    with offline(model, fake_search_provider()):
+        update = await draft_writer_node(cast(State, state), Runtime(context=Context()))
+
+    revised = update["current_step_draft"]
+    assert revised != draft and revised.endswith(draft[-200:])
+    assert update["draft_iteration"] == 2
+    assert update["messages"][0].usage_metadata["output_tokens"] < 50
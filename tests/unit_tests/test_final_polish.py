@@ -0,0 +1,46 @@
+import pytest
+
+from writer_agent.benchmark import run_scenario, scripted
+from writer_agent.context import Context
+from writer_agent.fakes import FakeChatModel, fake_search_provider, offline
+from writer_agent.final_polish import affected_sections, polish_sections, section_title
+
+pytestmark = pytest.mark.anyio
+
+TITLES = ["Introduction", "Current Applications", "Case Studies", "Future Outlook"]
+
+
+def test_affected_sections() -> None:
+    assert affected_sections("Expand sections 2 and 3 a little", TITLES) == [1, 2]
+    assert affected_sections("The case studies need numbers", TITLES) == [2]
+    assert affected_sections("Shorten the intro and the conclusion", TITLES) == [0, 3]
+    assert affected_sections("Use British spelling throughout", TITLES) == [0, 1, 2, 3]
+    assert affected_sections("Fix step 9", TITLES) == [0, 1, 2, 3]
+    assert section_title("STEP 2: Current Applications") == "Current Applications"
+
+
+async def test_polish_sections_only_touches_requested_sections() -> None:
+    model = FakeChatModel(output_tokens=20)
+    sections = ["first draft", "second draft", "third draft"]
+    with offline(model, fake_search_provider()):
+        polished = await polish_sections(
+            sections,
+            TITLES,
+            Context(polish_concurrency=2),
+            indexes=[1],
+            feedback="Tighten it",
+        )
+    assert polished[0] == sections[0] and polished[2] == sections[2]
+    assert polished[1] != sections[1]
+    assert sum(model.calls.values()) == 1
+
+
+async def test_final_review_changes_repolish_only_affected_sections() -> None:
+    approved = await run_scenario(3, output_tokens=50)
+    policy = scripted(["approve"] * 5 + ["Make section 2 more concrete"])
+    changed = await run_scenario(3, output_tokens=50, policy=policy)
+    # Resuming the final review does not polish again: three sections and one
+    # seam pass, then one section and one seam pass for the requested change.
+    assert changed["llm_calls"] - approved["llm_calls"] == 2
+    assert approved["nodes"]["final_drafter"]["calls"] == 1
+    assert changed["nodes"]["final_drafter"]["calls"] == 2
@@ -0,0 +1,33 @@
+import pytest
+
+from writer_agent.context import Context
+from writer_agent.http_client import SearchClientPool
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_client_is_shared_per_limits() -> None:
+    pool = SearchClientPool()
+    context = Context(http_max_connections=2)
+    client = await pool.get_client(context)
+    assert await pool.get_client(context) is client
+
+    resized = await pool.get_client(Context(http_max_connections=4))
+    assert resized is not client
+    assert not client.is_closed  # may still have requests in flight
+    assert await pool.get_client(context) is client
+    await pool.aclose()
+    assert client.is_closed and resized.is_closed
+
+
+async def test_slot_reports_saturation() -> None:
+    pool = SearchClientPool()
+    await pool.get_client(Context(http_max_connections=1))
+    async with pool.slot():
+        async with pool.slot():
+            assert pool.stats()["in_flight"] == 2
+    stats = pool.stats()
+    assert stats["peak_in_flight"] == 2
+    assert stats["saturated_requests"] == 1
+    assert stats["peak_utilization"] == 2.0
+    await pool.aclose()
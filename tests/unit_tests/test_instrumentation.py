@@ -0,0 +1,146 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from writer_agent.context import Context
+from writer_agent.fakes import FakeChatModel, fake_search_provider, offline
+from writer_agent.instrumentation import (
+    INSTRUMENTATION,
+    Instrumentation,
+    JsonLogSink,
+    PrometheusSink,
+    Span,
+    estimate_cost,
+    set_queue_time,
+    take_queue_time,
+)
+from writer_agent.llm import invoke_model
+from writer_agent.search_cache import cached_search
+
+pytestmark = pytest.mark.anyio
+
+
+def test_summary_aggregates_per_thread_step_and_node() -> None:
+    metrics = Instrumentation()
+    metrics.record(
+        Span(
+            kind="llm",
+            name="m",
+            node="draft_writer",
+            step=0,
+            thread_id="t",
+            model="m",
+            wall_ms=100.0,
+            input_tokens=10,
+            output_tokens=5,
+            cost_usd=0.01,
+        )
+    )
+    metrics.record(
+        Span(
+            kind="llm",
+            name="m",
+            node="draft_writer",
+            step=1,
+            thread_id="t",
+            model="m",
+            wall_ms=50.0,
+            input_tokens=20,
+            output_tokens=5,
+        )
+    )
+    metrics.record(
+        Span(
+            kind="node",
+            name="draft_writer",
+            node="draft_writer",
+            step=1,
+            thread_id="t",
+            wall_ms=60.0,
+        )
+    )
+    metrics.record(
+        Span(kind="llm", name="m", node="critic_agent", thread_id="other", wall_ms=1.0)
+    )
+
+    summary = metrics.summary("t")
+    assert summary["total"]["llm_calls"] == 2
+    assert summary["total"]["input_tokens"] == 30
+    assert summary["total"]["node_wall_ms"] == 60.0
+    assert summary["steps"][1]["llm_wall_ms"] == 50.0
+    assert summary["nodes"]["draft_writer"]["output_tokens"] == 10
+    assert summary["models"]["m"]["cost_usd"] == 0.01
+    assert metrics.summary("missing")["total"] == {}
+
+
+def test_estimate_cost_uses_cached_price_and_overrides() -> None:
+    context = Context(model_prices="acme/small=1:2:0.5")
+    cost = estimate_cost("acme/small", 1_000_000, 1_000_000, 500_000, context)
+    assert cost == pytest.approx(0.5 * 1 + 0.5 * 0.5 + 2)
+    assert estimate_cost("acme/unknown", 1000, 1000, 0, context) == 0.0
+
+
+def test_prometheus_and_json_sinks(tmp_path: Path) -> None:
+    prometheus = PrometheusSink()
+    log = JsonLogSink(str(tmp_path / "spans.jsonl"))
+    span = Span(
+        kind="search",
+        name="serper",
+        node="analyzer_collector",
+        wall_ms=250.0,
+        cache="hit",
+    )
+    for sink in (prometheus, log):
+        sink.emit(span)
+        sink.emit(span)
+
+    text = prometheus.render()
+    assert "# TYPE writer_agent_calls_total counter" in text
+    assert (
+        'writer_agent_calls_total{kind="search",name="serper",node="analyzer_collector",status="ok"} 2'
+        in text
+    )
+    assert 'result="hit"} 2' in text
+    lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+    assert len(lines) == 2 and json.loads(lines[0])["cache"] == "hit"
+
+
+async def test_llm_and_search_calls_are_recorded(tmp_path: Path) -> None:
+    context = Context(
+        model="acme/fake", search_cache_path=str(tmp_path / "cache.sqlite")
+    )
+    INSTRUMENTATION.clear()
+    with offline(FakeChatModel(output_tokens=20), fake_search_provider()):
+        await invoke_model(
+            [("system", "x"), ("user", "hello")], context, node="draft_writer", step=2
+        )
+
+    async def fetch() -> dict[str, Any]:
+        return {"organic": []}
+
+    for _ in range(2):
+        await cached_search("serper", "python history", fetch, context)
+
+    summary = INSTRUMENTATION.summary("default")
+    assert summary["steps"][2]["output_tokens"] == 20
+    assert summary["nodes"]["draft_writer"]["llm_calls"] == 1
+    assert summary["total"]["search_calls"] == 2
+    assert summary["total"]["search_cache_miss"] == 1
+    assert summary["total"]["search_cache_hit"] == 1
+
+
+async def test_queue_time_is_taken_once_across_spawned_tasks() -> None:
+    set_queue_time(25.0)
+    # Primary and hedge tasks both copy the context; only the first taker gets the wait.
+    taken = await asyncio.gather(
+        asyncio.create_task(_take()), asyncio.create_task(_take())
+    )
+    assert sorted(taken) == [0.0, 25.0]
+    assert take_queue_time() == 0.0
+
+
+async def _take() -> float:
+    return take_queue_time()
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+
+from writer_agent.context import Context
+from writer_agent.llm_cache import LLMCache, cache_key, get_llm_cache
+
+
+def test_cache_key_depends_on_model_settings_and_messages() -> None:
+    messages = [{"role": "user", "content": "hi"}]
+    key = cache_key("openai/gpt-4o", {}, messages)
+    assert key == cache_key("openai/gpt-4o", {}, [("user", "hi")])
+    assert key != cache_key("openai/gpt-4o-mini", {}, messages)
+    assert key != cache_key("openai/gpt-4o", {"temperature": 0}, messages)
+    assert key != cache_key("openai/gpt-4o", {}, [("user", "hello")])
+
+
+def test_cache_roundtrip_and_size_eviction(tmp_path: Path) -> None:
+    cache = LLMCache(str(tmp_path / "llm.sqlite"), max_bytes=2000)
+    cache.put("a", "plan_writer", AIMessage(content="x" * 600))
+    cache.put("b", "plan_writer", AIMessage(content="y" * 600))
+    assert cache.get("a").content == "x" * 600
+    cache.put("c", "plan_writer", AIMessage(content="z" * 600))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["bytes"] <= 2000
+    cache.close()
+
+
+def test_cache_is_enabled_per_node(tmp_path: Path) -> None:
+    context = Context(
+        llm_cache_nodes="plan_writer", llm_cache_path=str(tmp_path / "c.sqlite")
+    )
+    assert get_llm_cache(context, "plan_writer") is not None
+    assert get_llm_cache(context, "draft_writer") is None
+    assert get_llm_cache(Context(llm_cache_nodes=""), "plan_writer") is None
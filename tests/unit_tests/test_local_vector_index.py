@@ -0,0 +1,86 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from writer_agent import local_vector_index  # noqa: E402
+from writer_agent.local_vector_index import LocalVectorIndex  # noqa: E402
+from writer_agent.vector_store import VectorRecord  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+
+def records(vectors: Any, start: int = 0) -> list[VectorRecord]:
+    return [
+        {
+            "id": f"c{start + i}",
+            "values": list(map(float, v)),
+            "metadata": {"n": start + i},
+        }
+        for i, v in enumerate(vectors)
+    ]
+
+
+async def test_exact_search_with_appends_updates_and_reopen(tmp_path: Path) -> None:
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(50, 8))
+    index = LocalVectorIndex(str(tmp_path))
+    await index.upsert(records(vectors[:30]))
+    await index.upsert(records(vectors[30:], start=30))
+    assert (await index.query(vectors[42], top_k=1))[0]["id"] == "c42"
+
+    await index.upsert(
+        [{"id": "c42", "values": list(-vectors[42]), "metadata": {"n": "flipped"}}]
+    )
+    reopened = LocalVectorIndex(str(tmp_path))
+    assert reopened.count == 50
+    top = reopened.search(-vectors[42], top_k=3)
+    assert top[0]["id"] == "c42" and top[0]["metadata"] == {"n": "flipped"}
+    assert top[0]["score"] >= top[1]["score"] >= top[2]["score"]
+
+
+async def test_ivf_search_finds_near_duplicates(tmp_path: Path) -> None:
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(2000, 16))
+    index = LocalVectorIndex(str(tmp_path), mode="ivf", nlist=16, nprobe=4)
+    await index.upsert(records(vectors))
+    index.build_ivf()
+    await index.upsert(records(rng.normal(size=(10, 16)), start=2000))
+
+    hits = sum(
+        index.search(vectors[i] + 0.01, top_k=1)[0]["id"] == f"c{i}" for i in range(50)
+    )
+    assert hits >= 45
+    assert index.search(index._matrix()[2005], top_k=1)[0]["id"] == "c2005"
+
+
+async def test_reopen_drops_rows_past_the_manifest(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(6, 8))
+    index = LocalVectorIndex(str(tmp_path))
+    await index.upsert(records(vectors[:4]))
+    # A crash after the vector append but before the manifest write.
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(np.ones((3, 8), dtype=np.float32).tobytes())
+
+    reopened = LocalVectorIndex(str(tmp_path))
+    await reopened.upsert(records(vectors[4:], start=4))
+    assert reopened.count == 6
+    top = reopened.search(vectors[5], top_k=1)[0]
+    assert top["id"] == "c5" and top["score"] > 0.99
+
+
+async def test_metadata_log_is_compacted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(local_vector_index, "_COMPACT_MIN_DEAD", 0)
+    vectors = np.random.default_rng(4).normal(size=(5, 8))
+    index = LocalVectorIndex(str(tmp_path))
+    for _ in range(3):
+        await index.upsert(records(vectors))
+
+    assert len((tmp_path / "metadata.jsonl").read_text().splitlines()) == 5
+    top = LocalVectorIndex(str(tmp_path)).search(vectors[2], top_k=1)[0]
+    assert top["id"] == "c2" and top["metadata"] == {"n": 2}
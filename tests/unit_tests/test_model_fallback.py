@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+
+from writer_agent import model_registry
+from writer_agent.context import Context
+from writer_agent.fakes import FakeChatModel
+from writer_agent.instrumentation import INSTRUMENTATION
+from writer_agent.llm import invoke_model
+from writer_agent.model_fallback import (
+    Claim,
+    LatencyTracker,
+    hedged_call,
+    model_chain,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_model_chain_uses_node_or_default_backups() -> None:
+    context = Context(model_fallbacks="draft_writer=b/1|a/main,*=c/1")
+    assert model_chain("a/main", "draft_writer", context) == ["a/main", "b/1"]
+    assert model_chain("a/main", "critic_agent", context) == ["a/main", "c/1"]
+    assert model_chain("a/main", "x", Context()) == ["a/main"]
+
+
+def test_latency_percentile_needs_enough_samples() -> None:
+    tracker = LatencyTracker()
+    for ms in range(1, 11):
+        tracker.record("k", ms / 1000)
+    assert tracker.percentile("k", 90, min_samples=10) == 0.009
+    assert tracker.percentile("k", 90, min_samples=20) is None
+
+
+async def test_slow_primary_is_hedged_and_cancelled() -> None:
+    cancelled = []
+
+    async def attempt(name: str, claim: Claim) -> str:
+        try:
+            await asyncio.sleep(1.0 if name == "slow" else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return name
+
+    start = time.perf_counter()
+    served, result, hedges = await hedged_call(
+        ["slow", "fast"], attempt, lambda _: 0.05
+    )
+    assert (served, result, hedges) == ("fast", "fast", 1)
+    assert time.perf_counter() - start < 0.5
+    await asyncio.sleep(0)
+    assert cancelled == ["slow"]
+
+
+async def test_errors_fall_through_the_chain() -> None:
+    async def attempt(name: str, claim: Claim) -> str:
+        if name != "c":
+            raise RuntimeError(name)
+        return name
+
+    assert (await hedged_call(["a", "b", "c"], attempt, lambda _: None))[0] == "c"
+    with pytest.raises(RuntimeError, match="b"):
+        await hedged_call(["a", "b"], attempt, lambda _: None)
+
+
+async def test_streamed_call_is_served_by_the_faster_backup(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    models = {
+        "acme/slow": FakeChatModel(latency=1.0),
+        "acme/fast": FakeChatModel(output_tokens=5),
+    }
+
+    def load(name: str, **kwargs: Any) -> BaseChatModel:
+        return models[name]
+
+    monkeypatch.setattr(model_registry.MODEL_REGISTRY, "loader", load)
+    model_registry.MODEL_REGISTRY.clear()
+    INSTRUMENTATION.clear()
+    log = tmp_path / "spans.jsonl"
+    context = Context(
+        model="acme/slow",
+        model_fallbacks="*=acme/fast",
+        llm_hedge_delay=0.05,
+        metrics_sinks="json",
+        metrics_log_path=str(log),
+    )
+
+    response = await invoke_model(
+        [("system", "x"), ("user", "hi")], context, node="draft_writer", stream=True
+    )
+    assert response.response_metadata["served_model"] == "acme/fast"
+    summary = INSTRUMENTATION.summary("default")
+    assert list(summary["models"]) == ["acme/fast"]
+    assert summary["total"]["hedges"] == 1
+    span = json.loads(log.read_text().splitlines()[-1])
+    assert span["name"] == span["model"] == "acme/fast"
+    model_registry.MODEL_REGISTRY.clear()
@@ -0,0 +1,43 @@
+from typing import Any
+
+from writer_agent.model_registry import ModelRegistry
+
+
+def recording_registry(
+    **kwargs: Any,
+) -> tuple[ModelRegistry, list[tuple[str, dict[str, Any]]]]:
+    built: list[tuple[str, dict[str, Any]]] = []
+
+    def fake_load(name: str, **settings: Any) -> Any:
+        built.append((name, settings))
+        return object()
+
+    return ModelRegistry(loader=fake_load, **kwargs), built
+
+
+def test_registry_reuses_models() -> None:
+    registry, built = recording_registry()
+    first = registry.get("openai/gpt-4o")
+    assert registry.get("openai/gpt-4o") is first
+    assert registry.get("openai/gpt-4o", temperature=0) is not first
+    assert len(built) == 2
+    assert registry.stats() == {"hits": 1, "misses": 2, "evictions": 0, "size": 2}
+
+
+def test_registry_evicts_idle_and_lru_entries() -> None:
+    registry, _ = recording_registry(idle_ttl=0.0, max_entries=1)
+    registry.get("openai/gpt-4o")
+    registry.get("openai/gpt-4o-mini")
+    assert registry.stats()["size"] == 1
+    assert registry.stats()["evictions"] >= 1
+
+
+def test_use_loader_swaps_and_restores_the_loader() -> None:
+    registry, built = recording_registry()
+    original = registry.loader
+    fake: Any = object()
+    with registry.use_loader(lambda name, **settings: fake):
+        assert registry.get("openai/gpt-4o") is fake
+    assert registry.loader is original
+    assert registry.get("openai/gpt-4o") is not fake
+    assert registry.stats()["size"] == 1 and len(built) == 1
@@ -0,0 +1,84 @@
+from typing import Any
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+
+from writer_agent import model_registry
+from writer_agent.context import Context
+from writer_agent.fakes import FakeChatModel
+from writer_agent.instrumentation import INSTRUMENTATION
+from writer_agent.llm import invoke_model
+from writer_agent.model_tiers import node_model, parse_node_settings
+
+pytestmark = pytest.mark.anyio
+
+
+def test_defaults_put_routing_and_critique_on_the_fast_tier() -> None:
+    context = Context(model="anthropic/claude-3-5-sonnet-latest")
+    assert node_model("orchestrator", context) == (
+        "anthropic/claude-3-5-haiku-latest",
+        {"max_tokens": 5, "temperature": 0},
+    )
+    assert node_model("critic_agent", context)[0] == "anthropic/claude-3-5-haiku-latest"
+    assert node_model("draft_writer", context) == (
+        "anthropic/claude-3-5-sonnet-latest",
+        {},
+    )
+
+
+def test_empty_assignments_keep_every_node_on_the_main_model() -> None:
+    context = Context(
+        model="anthropic/claude-3-5-sonnet-latest", node_models="", node_settings=""
+    )
+    for node in ("orchestrator", "analyzer_collector", "critic_agent", "draft_writer"):
+        assert node_model(node, context) == ("anthropic/claude-3-5-sonnet-latest", {})
+
+
+def test_explicit_assignments_and_settings() -> None:
+    context = Context(
+        model="openai/gpt-4.1",
+        fast_model="openai/gpt-4.1-mini",
+        node_models="critic_agent=main,draft_writer=fast,final_drafter=acme/big",
+        node_settings="final_drafter.max_tokens=4000,final_drafter.temperature=0.3",
+    )
+    assert node_model("critic_agent", context) == ("openai/gpt-4.1", {})
+    assert node_model("draft_writer", context)[0] == "openai/gpt-4.1-mini"
+    assert node_model("final_drafter", context) == (
+        "acme/big",
+        {"max_tokens": 4000, "temperature": 0.3},
+    )
+    assert parse_node_settings("a.flag=true,b.name=x") == {
+        "a": {"flag": True},
+        "b": {"name": "x"},
+    }
+
+
+async def test_node_model_and_settings_reach_the_client_and_spans(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    built: list[tuple[str, dict[str, Any]]] = []
+
+    def load(name: str, **kwargs: Any) -> BaseChatModel:
+        built.append((name, kwargs))
+        return FakeChatModel()
+
+    monkeypatch.setattr(model_registry.MODEL_REGISTRY, "loader", load)
+    model_registry.MODEL_REGISTRY.clear()
+    INSTRUMENTATION.clear()
+    context = Context(model="openai/gpt-4.1")
+
+    await invoke_model(
+        [("system", "orchestrator"), ("user", "hi")], context, node="orchestrator"
+    )
+    await invoke_model([("system", "x"), ("user", "hi")], context, node="draft_writer")
+    assert built == [
+        ("openai/gpt-4o-mini", {"max_tokens": 5, "temperature": 0}),
+        ("openai/gpt-4.1", {}),
+    ]
+    nodes = INSTRUMENTATION.summary("default")["nodes"]
+    assert set(INSTRUMENTATION.summary("default")["models"]) == {
+        "openai/gpt-4o-mini",
+        "openai/gpt-4.1",
+    }
+    assert nodes["orchestrator"]["cost_usd"] < nodes["draft_writer"]["cost_usd"]
+    model_registry.MODEL_REGISTRY.clear()
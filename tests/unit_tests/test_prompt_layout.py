@@ -0,0 +1,33 @@
+import pytest
+
+from writer_agent.benchmark import run_scenario
+from writer_agent.prompt_layout import CACHE_CONTROL, for_provider, layout_prompt
+
+pytestmark = pytest.mark.anyio
+
+
+def test_layout_puts_stable_parts_first_with_breakpoints() -> None:
+    system, user = layout_prompt("Instructions", "Plan and research", "Step 3")
+    assert system["content"][0]["cache_control"] == CACHE_CONTROL
+    assert [b["text"] for b in user["content"]] == ["Plan and research", "Step 3"]
+    assert user["content"][0]["cache_control"] == CACHE_CONTROL
+    assert "cache_control" not in user["content"][1]
+
+    _, user = layout_prompt("Instructions", "", "Step 3")
+    assert [b["text"] for b in user["content"]] == ["Step 3"]
+
+
+def test_for_provider_keeps_breakpoints_only_for_anthropic() -> None:
+    messages = layout_prompt("Instructions", "Plan", "Step 1")
+    assert for_provider(messages, "anthropic/claude-3-5-sonnet-latest") == messages
+
+    flat = for_provider([*messages, ("user", "extra")], "openai/gpt-4o")
+    assert flat[0] == {"role": "system", "content": "Instructions"}
+    assert flat[1] == {"role": "user", "content": "Plan\n\nStep 1"}
+    assert flat[2] == ("user", "extra")
+
+
+async def test_step_drafts_share_a_cached_prefix() -> None:
+    result = await run_scenario(6, output_tokens=100)
+    drafted = result["prompt_tokens_by_node"]["draft_writer"]
+    assert result["cached_prompt_tokens_by_node"]["draft_writer"] > drafted / 2
@@ -0,0 +1,136 @@
+import asyncio
+from typing import Any
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from writer_agent import model_registry
+from writer_agent.context import Context
+from writer_agent.instrumentation import INSTRUMENTATION
+from writer_agent.llm import invoke_model
+from writer_agent.rate_limiter import (
+    GOVERNOR,
+    RateLimiter,
+    parse_rate_limits,
+    priority_for,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_parse_limits_and_priorities() -> None:
+    assert parse_rate_limits("openai=500:200000,acme/x=60::4") == {
+        "openai": (500.0, 200000.0, 0),
+        "acme/x": (60.0, 0.0, 4),
+    }
+    context = Context(llm_priorities="draft_writer=0")
+    assert priority_for("basic_llm_response", context) < priority_for(
+        "plan_writer", context
+    )
+    assert priority_for("draft_writer", context) == 0
+
+
+async def test_higher_priority_waiters_are_served_first() -> None:
+    limiter = RateLimiter(max_concurrency=1)
+    await limiter.acquire(10, priority=2)
+    order: list[str] = []
+
+    async def call(name: str, priority: int) -> None:
+        await limiter.acquire(10, priority)
+        order.append(name)
+        limiter.release(10, 10)
+
+    batch = asyncio.create_task(call("batch", 2))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(call("interactive", 0))
+    await asyncio.sleep(0)
+    limiter.release(10, 10)
+    await asyncio.gather(batch, interactive)
+    assert order == ["interactive", "batch"]
+
+
+async def test_token_bucket_paces_calls_and_headers_clamp_it() -> None:
+    limiter = RateLimiter(tpm=6000)  # 100 tokens/s, 1000 token burst
+    assert await limiter.acquire(1000) < 0.05
+    limiter.release(1000, 1000)
+    waited = await limiter.acquire(20)
+    assert 0.1 < waited < 0.5
+    limiter.release(20, 20, {"x-ratelimit-remaining-tokens": "5"})
+    assert limiter.tokens.level <= 5
+
+
+async def test_rate_limit_pauses_and_halves_rate() -> None:
+    limiter = RateLimiter(rpm=600)
+    delay = limiter.on_rate_limited({"retry-after-ms": "150"}, attempt=0)
+    assert delay == 0.15
+    assert limiter.rate_scale == 0.5
+    assert await limiter.acquire(1) >= 0.1
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FlakyModel(BaseChatModel):
+    failures: int = 1
+
+    @property
+    def _llm_type(self) -> str:
+        return "flaky"
+
+    def _generate(
+        self, messages: Any, stop: Any = None, run_manager: Any = None, **kwargs: Any
+    ) -> ChatResult:
+        if self.failures:
+            self.failures -= 1
+            raise RateLimitError("slow down")
+        message = AIMessage(
+            content="ok", response_metadata={"headers": {"set-cookie": "secret"}}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+async def test_invoke_model_retries_rate_limited_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings: list[dict[str, Any]] = []
+    model = FlakyModel()
+
+    def load(name: str, **kwargs: Any) -> BaseChatModel:
+        settings.append(kwargs)
+        return model
+
+    monkeypatch.setattr(model_registry.MODEL_REGISTRY, "loader", load)
+    model_registry.MODEL_REGISTRY.clear()
+    INSTRUMENTATION.clear()
+    context = Context(
+        model="acme/flaky", rate_limits="acme=6000:0", rate_limit_max_retries=2
+    )
+
+    response = await invoke_model([("user", "hi")], context, node="orchestrator")
+    assert response.content == "ok"
+    assert settings == [{"max_tokens": 5, "temperature": 0, "max_retries": 0}]
+    assert INSTRUMENTATION.summary("default")["total"]["retries"] == 1
+    assert GOVERNOR.stats()["acme"]["rate_limited"] == 1
+    model_registry.MODEL_REGISTRY.clear()
+
+
+async def test_response_headers_only_reach_the_limiter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings: list[dict[str, Any]] = []
+
+    def load(name: str, **kwargs: Any) -> BaseChatModel:
+        settings.append(kwargs)
+        return FlakyModel(failures=0)
+
+    monkeypatch.setattr(model_registry.MODEL_REGISTRY, "loader", load)
+    model_registry.MODEL_REGISTRY.clear()
+    context = Context(model="openai/gpt-4o", rate_limits="openai=6000:0")
+
+    response = await invoke_model([("user", "hi")], context, node="orchestrator")
+    assert settings[0]["include_response_headers"] is True
+    assert "headers" not in response.response_metadata
+    model_registry.MODEL_REGISTRY.clear()
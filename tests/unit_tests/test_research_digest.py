@@ -0,0 +1,56 @@
+from writer_agent.research_digest import digest_results, extract_sources
+
+SERPER = {
+    "searchParameters": {"q": "python"},
+    "knowledgeGraph": {"title": "Python", "description": "x" * 2000},
+    "organic": [
+        {
+            "title": "Python.org",
+            "link": "https://python.org",
+            "snippet": "The official site.",
+        },
+        {
+            "title": "Wiki",
+            "link": "https://en.wikipedia.org/wiki/Python",
+            "snippet": "A language.",
+        },
+    ],
+    "relatedSearches": [{"query": "python snake"}],
+}
+TAVILY = {
+    "query": "python",
+    "results": [
+        {
+            "title": "Python.org",
+            "url": "https://python.org",
+            "content": "Duplicate source.",
+        },
+        {
+            "title": "Docs",
+            "url": "https://docs.python.org",
+            "content": "Documentation.",
+        },
+    ],
+}
+
+
+def test_extract_sources_drops_noise() -> None:
+    sources = extract_sources(SERPER)
+    assert [s["url"] for s in sources] == [
+        "https://python.org",
+        "https://en.wikipedia.org/wiki/Python",
+    ]
+    assert extract_sources({"error": "boom"}) == []
+
+
+def test_digest_dedupes_and_respects_budget() -> None:
+    blocks = digest_results(
+        ["python", "python docs"], [SERPER, TAVILY], token_budget=1000
+    )
+    text = "\n".join(blocks)
+    assert text.count("https://python.org") == 1
+    assert "https://docs.python.org" in text
+    assert "knowledgeGraph" not in text and "xxxx" not in text
+
+    tight = digest_results(["python", "python docs"], [SERPER, TAVILY], token_budget=30)
+    assert len("\n".join(tight)) // 4 <= 30
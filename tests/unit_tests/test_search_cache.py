@@ -0,0 +1,99 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from writer_agent.search_cache import MAX_TRACKED_RUNS, SearchCache, normalize_query
+
+pytestmark = pytest.mark.anyio
+
+
+def test_normalize_query_ignores_case_order_and_stopwords() -> None:
+    assert normalize_query("The History of  Python!") == normalize_query(
+        "python history"
+    )
+
+
+async def test_fetch_hits_and_serves_stale_while_revalidating(tmp_path: Path) -> None:
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    calls: list[int] = []
+
+    async def fetch() -> dict[str, Any]:
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert await cache.fetch("serper", "Python", fetch, ttl=60, stale_ttl=60) == {
+        "n": 1
+    }
+    assert await cache.fetch("serper", "python ", fetch, ttl=60, stale_ttl=60) == {
+        "n": 1
+    }
+    assert len(calls) == 1
+
+    # Expired but within the stale window: served immediately, refreshed in background.
+    assert await cache.fetch("serper", "python", fetch, ttl=0, stale_ttl=60) == {"n": 1}
+    await asyncio.sleep(0.01)
+    assert len(calls) == 2
+    assert await cache.fetch("serper", "python", fetch, ttl=60, stale_ttl=60) == {
+        "n": 2
+    }
+
+    assert cache.stats() == {"hits": 2, "stale_hits": 1, "misses": 1, "hit_rate": 0.75}
+    cache.close()
+
+
+async def test_failed_background_refresh_keeps_the_stale_entry(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    cache.put("tavily", "python", {"n": 1})
+
+    async def fail() -> dict[str, Any]:
+        raise RuntimeError("HTTP 502")
+
+    assert await cache.fetch("tavily", "python", fail, ttl=0, stale_ttl=60) == {"n": 1}
+    await asyncio.sleep(0.01)
+    assert not cache._refreshing
+    assert "Background refresh of a stale tavily result failed" in caplog.text
+    assert cache.get("tavily", "python", ttl=0, stale_ttl=60) == ({"n": 1}, "stale")
+    cache.close()
+
+
+def test_put_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put("serper", "a", {"q": "a"})
+    cache.put("serper", "b", {"q": "b"})
+    cache.get("serper", "a", ttl=60, stale_ttl=0)
+    cache.put("serper", "c", {"q": "c"})
+    assert cache.get("serper", "b", ttl=60, stale_ttl=0)[1] == "miss"
+    assert cache.get("serper", "a", ttl=60, stale_ttl=0)[1] == "fresh"
+    cache.close()
+
+
+async def test_request_params_are_part_of_the_key(tmp_path: Path) -> None:
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+
+    def fetch_n(n: int) -> Any:
+        async def fetch() -> dict[str, Any]:
+            return {"results": list(range(n))}
+
+        return fetch
+
+    short = await cache.fetch(
+        "tavily", "python", fetch_n(3), ttl=60, stale_ttl=0, params={"max_results": 3}
+    )
+    long = await cache.fetch(
+        "tavily", "python", fetch_n(10), ttl=60, stale_ttl=0, params={"max_results": 10}
+    )
+    assert len(short["results"]) == 3 and len(long["results"]) == 10
+    cache.close()
+
+
+def test_run_stats_are_bounded(tmp_path: Path) -> None:
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    for i in range(MAX_TRACKED_RUNS + 10):
+        cache._run_counts(f"run-{i}")["misses"] += 1
+    assert len(cache.run_stats) == MAX_TRACKED_RUNS
+    assert cache.stats("run-0")["misses"] == 0
+    cache.close()
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+import pytest
+
+from writer_agent.search_executor import SearchFn, hedged_search, run_searches
+
+pytestmark = pytest.mark.anyio
+
+
+def provider(name: str, delay: float, ok: bool = True) -> SearchFn:
+    async def run(query: str) -> Optional[dict[str, Any]]:
+        await asyncio.sleep(delay)
+        if not ok:
+            return {"error": f"{name} failed"}
+        return {"provider": name, "query": query}
+
+    return run
+
+
+async def test_hedge_wins_when_primary_is_slow() -> None:
+    result = await hedged_search(
+        "q",
+        [provider("slow", 1.0), provider("fast", 0.01)],
+        hedge_delay=0.05,
+        timeout=2,
+    )
+    assert result == {"provider": "fast", "query": "q"}
+
+
+async def test_failure_falls_through_without_waiting_for_hedge() -> None:
+    start = time.perf_counter()
+    result = await hedged_search(
+        "q",
+        [provider("bad", 0.0, ok=False), provider("good", 0.0)],
+        hedge_delay=5,
+        timeout=2,
+    )
+    assert result["provider"] == "good"
+    assert time.perf_counter() - start < 1
+
+
+async def test_queries_run_concurrently_with_timeout() -> None:
+    start = time.perf_counter()
+    results = await run_searches(
+        ["a", "b", "c"], [provider("p", 0.1)], concurrency=3, hedge_delay=1, timeout=2
+    )
+    assert [r["query"] for r in results] == ["a", "b", "c"]
+    assert time.perf_counter() - start < 0.25
+
+    timed_out = await run_searches(
+        ["a"], [provider("p", 1.0)], concurrency=1, hedge_delay=1, timeout=0.05
+    )
+    assert timed_out == [None]
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from writer_agent.speculation import SpeculativeDrafts, speculation_key
+
+pytestmark = pytest.mark.anyio
+
+
+async def work(value: str, delay: float = 0.0) -> str:
+    await asyncio.sleep(delay)
+    return value
+
+
+async def test_speculation_is_used_only_when_assumptions_match() -> None:
+    store = SpeculativeDrafts()
+    key = speculation_key("t1", 1, ["step one"])
+    store.start(key, work("draft two"))
+    store.start(key, work("duplicate"))  # already running: ignored
+
+    assert await store.take(speculation_key("t1", 1, ["step one (revised)"])) is None
+    assert await store.take(key) == "draft two"
+    assert await store.take(key) is None
+    assert store.stats() == {"started": 1, "used": 1, "discarded": 0, "pending": 0}
+
+
+async def test_discard_cancels_pending_work_for_thread() -> None:
+    store = SpeculativeDrafts()
+    store.start(speculation_key("t1", 1, []), work("a", delay=10))
+    store.start(speculation_key("t2", 1, []), work("b"))
+    store.discard("t1")
+    assert store.stats()["discarded"] == 1
+    assert await store.take(speculation_key("t2", 1, [])) == "b"
@@ -0,0 +1,37 @@
+import writer_agent
+from writer_agent.benchmark import compare, measure_startup, startup_violations
+from writer_agent.content_workflow_graph import get_graph
+
+# Generous enough for slow CI machines; an eager graph import takes over a second.
+PACKAGE_IMPORT_BUDGET_S = 0.3
+
+
+def test_package_import_defers_heavy_dependencies() -> None:
+    result = measure_startup("writer_agent", runs=1)
+    assert result["loaded"] == []
+    assert result["import_s"] < PACKAGE_IMPORT_BUDGET_S
+
+
+def test_graph_import_defers_providers_and_optional_backends() -> None:
+    result = measure_startup("writer_agent.content_workflow_graph", runs=1)
+    assert result["loaded"] == []
+    assert startup_violations({"startup": [result]}) == []
+
+
+def test_graph_is_compiled_once_on_first_access() -> None:
+    assert get_graph() is get_graph()
+    assert writer_agent.graph is get_graph()
+
+
+def test_compare_flags_startup_regressions() -> None:
+    baseline = {
+        "startup": [{"module": "writer_agent", "import_s": 0.01, "compile_s": 1.0}]
+    }
+    current = {
+        "startup": [{"module": "writer_agent", "import_s": 0.5, "compile_s": 1.0}]
+    }
+    regressions = compare(current, baseline, threshold=0.1)
+    assert len(regressions) == 1 and "import_s" in regressions[0]
+    assert startup_violations(
+        {"startup": [{"module": "writer_agent", "loaded": ["numpy"]}]}
+    ) == ["import writer_agent loads numpy"]
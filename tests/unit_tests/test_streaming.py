@@ -0,0 +1,52 @@
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import START, StateGraph
+from typing_extensions import TypedDict
+
+from writer_agent.streaming import stream_response
+
+pytestmark = pytest.mark.anyio
+
+
+class S(TypedDict):
+    text: str
+
+
+async def test_stream_response_emits_deltas_and_returns_full_message() -> None:
+    model = GenericFakeChatModel(
+        messages=iter([AIMessage(content="hello streaming world")])
+    )
+
+    async def node(state: S) -> dict[str, Any]:
+        message = await stream_response(
+            model, [("user", "hi")], node="draft_writer", step=2
+        )
+        assert (
+            message.response_metadata["ttft_ms"]
+            <= message.response_metadata["total_ms"]
+        )
+        return {"text": message.content}
+
+    builder = StateGraph(S)
+    builder.add_node("node", node)
+    builder.add_edge(START, "node")
+    graph = builder.compile()
+
+    events: list[Any] = [
+        e async for e in graph.astream({"text": ""}, stream_mode=["custom", "values"])
+    ]
+    custom = [data for mode, data in events if mode == "custom"]
+    assert "".join(e.get("delta", "") for e in custom) == "hello streaming world"
+    assert len(custom) > 2
+    assert all(e["node"] == "draft_writer" and e["step"] == 2 for e in custom)
+    assert custom[-1]["done"] is True
+    assert events[-1][1]["text"] == "hello streaming world"
+
+
+async def test_stream_response_outside_graph_run() -> None:
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="plain call")]))
+    message = await stream_response(model, [("user", "hi")], node="final_drafter")
+    assert message.content == "plain call"
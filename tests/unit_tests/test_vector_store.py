@@ -0,0 +1,46 @@
+import pytest
+
+from writer_agent.context import Context
+from writer_agent.vector_store import (
+    VECTOR_BACKENDS,
+    InMemoryVectorStore,
+    chunk_article,
+    get_embeddings,
+    get_vector_store,
+    save_article,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_chunk_ids_are_stable_per_article() -> None:
+    first = chunk_article("Title", ["STEP 1: A", "STEP 2: B"], ["alpha", "beta"])
+    second = chunk_article("Title", ["STEP 1: A", "STEP 2: B"], ["alpha", "beta"])
+    assert [c[0] for c in first] == [c[0] for c in second]
+    assert first[1][2]["step_title"] == "STEP 2: B"
+
+
+async def test_save_article_upserts_all_sections_in_one_call() -> None:
+    pytest.importorskip("numpy")  # fake embeddings need it
+    context = Context(
+        vector_backend="memory", embedding_model="fake/16", vector_index_name="t1"
+    )
+    sections = [f"section {i}" for i in range(12)]
+    assert await save_article("Guide", [], sections, context) == 12
+
+    store = get_vector_store(context)
+    assert store is get_vector_store(context)
+    assert isinstance(store, InMemoryVectorStore) and store.upsert_calls == 1
+
+    vector = get_embeddings(context).embed_query("section 3")
+    assert (await store.query(vector, top_k=1))[0]["metadata"]["text"] == "section 3"
+
+
+def test_unavailable_store_is_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    context = Context(vector_backend="pinecone", vector_index_name="t-missing")
+    monkeypatch.delenv("PINECONE_API_KEY", raising=False)
+    assert get_vector_store(context) is None
+
+    store = InMemoryVectorStore()
+    monkeypatch.setitem(VECTOR_BACKENDS, "pinecone", lambda context: store)
+    assert get_vector_store(context) is store